@@ -3,13 +3,18 @@ from setuptools import setup, find_packages
 setup(
     name="vaccine-bias-remorse",
     version="0.1.0",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    # The source folder is installed as ``vaccine_bias_remorse``
+    package_dir={"vaccine_bias_remorse": "src"},
+    packages=["vaccine_bias_remorse"] + [
+        f"vaccine_bias_remorse.{package}" for package in find_packages(where="src")
+    ],
     install_requires=[
         "pandas>=1.3.0",
         "numpy>=1.20.0",
     ],
     extras_require={
+        "zstd": ["zstandard>=0.15"],
+        "parquet": ["pyarrow>=7.0"],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -17,6 +22,11 @@ setup(
             "flake8>=3.9",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "vaccine-bias-remorse=vaccine_bias_remorse.cli:main",
+        ],
+    },
     python_requires=">=3.8",
     author="Ashutosh Kumar",
     author_email="ak1825@rit.edu",
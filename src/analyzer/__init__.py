@@ -1 +1,47 @@
-# This file can be empty, it just marks the directory as a Python package
+"""
+Vaccine bias remorse analyzers.
+
+The public classes are loaded on first attribute access (PEP 562), so
+importing the package does not import pandas, NumPy or any analyzer
+module until one of them is used.
+"""
+import importlib
+from typing import List
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'VaccineBiasRemorseAnalyzer': 'bias_remorse',
+    'CommentAnalyzer': 'comment_analyzer',
+    'BatchCommentAnalyzer': 'batch_analyzer',
+    'StatisticalAnalyzer': 'statistical_analyzer',
+    'ReportGenerator': 'report_generator',
+    'ColumnarReportGenerator': 'columnar_report',
+    'ReportState': 'report_state',
+    'ResultCache': 'result_cache',
+    'TimeIndex': 'time_index',
+    'HitMatrix': 'cooccurrence',
+    'MatchSpans': 'match_spans',
+    'PatternProfile': 'pattern_profile',
+    'StratifiedReservoir': 'sampling',
+    'JsonlCaseWriter': 'case_writer',
+    'iter_case_records': 'case_writer',
+    'export_report': 'report_export',
+    'load_report': 'report_export',
+    'read_results_dataset': 'results_dataset',
+    'remorse_rate_intervals': 'intervals'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
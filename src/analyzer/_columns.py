@@ -0,0 +1,113 @@
+"""
+Column helpers shared by the columnar report builders and analyzers.
+
+They turn columns of the per-comment results table into integer group codes
+and typed per-group arrays, so report sections can be computed with
+``np.bincount`` and stable sorts instead of per-row Python loops.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .time_index import TimeIndex
+
+# Placeholder that lets missing values take part in factorization as a group key
+MISSING = '\x00missing'
+
+
+def factorize(values: np.ndarray) -> Tuple[np.ndarray, List[Any]]:
+    """Factorize values keeping missing values as a ``None`` group"""
+    values = np.where(pd.isna(values), MISSING, values)
+    codes, uniques = pd.factorize(values)
+    return codes, [None if value == MISSING else value for value in uniques]
+
+
+def truthy(values: pd.Series) -> np.ndarray:
+    """Mask of values that are neither missing nor empty"""
+    array = values.to_numpy(dtype=object)
+    return ~pd.isna(array) & (array != '')
+
+
+def numeric_column(results: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a numeric column with missing values as 0"""
+    if column not in results.columns:
+        return np.zeros(len(results))
+    return pd.to_numeric(results[column], errors='coerce').fillna(0).to_numpy()
+
+
+def grouped_arrays(codes: np.ndarray, values: np.ndarray, n_groups: int) -> List[np.ndarray]:
+    """Split ``values`` into per-group arrays, keeping row order within each group"""
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.cumsum(np.bincount(codes, minlength=n_groups))[:-1]
+    return np.split(np.asarray(values)[order], boundaries)
+
+
+def arrays_by_key(keys, values) -> Dict[object, np.ndarray]:
+    """Split ``values`` into one typed array per key, in first-appearance order of the keys
+
+    Rows with a missing key are dropped.
+    """
+    codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+    present = codes >= 0
+    if not len(uniques):
+        return {}
+    groups = grouped_arrays(codes[present], np.asarray(values)[present], len(uniques))
+    return dict(zip(uniques.tolist(), groups))
+
+
+class ColumnGroups:
+    """Numeric columns and lazily factorized group keys of a results table"""
+
+    def __init__(self, results: pd.DataFrame, time_index: Optional[TimeIndex] = None):
+        self.results = results
+        self.time_index = time_index
+        self.n = len(results)
+        self.confidence = numeric_column(results, 'confidence_score')
+        self.engagement = numeric_column(results, 'engagement_score')
+        self.has_edit = numeric_column(results, 'has_edit').astype(bool)
+        self.has_catalyst = truthy(results['catalyst']) if 'catalyst' in results.columns else np.zeros(self.n, dtype=bool)
+        self.has_political_lean = (
+            truthy(results['political_lean']) if 'political_lean' in results.columns
+            else np.zeros(self.n, dtype=bool)
+        )
+        self._keys: Dict[str, Tuple[np.ndarray, List[Any]]] = {}
+
+    def key(self, column: str, mask: np.ndarray = None) -> Tuple[np.ndarray, List[Any]]:
+        """
+        Return ``(codes, uniques)`` for ``column``, in first-appearance order
+
+        With ``mask``, only the selected rows are factorized.
+        """
+        if mask is not None:
+            return factorize(self._values(column)[mask])
+        if column not in self._keys:
+            self._keys[column] = factorize(self._values(column))
+        return self._keys[column]
+
+    def _values(self, column: str) -> np.ndarray:
+        if column == 'month':
+            if self.time_index is None:
+                self.time_index = TimeIndex(self.results['timestamp'])
+            return self.time_index.labels('month')
+        if column not in self.results.columns:
+            return np.full(self.n, 'unknown', dtype=object)
+        return self.results[column].to_numpy(dtype=object)
+
+
+def nested_counts(groups: ColumnGroups, outer: str, inner: str, mask: np.ndarray = None) -> Dict:
+    """Count rows per ``outer`` → ``inner`` key pair, preserving first-appearance order"""
+    outer_codes, outer_keys = groups.key(outer)
+    inner_codes, inner_keys = groups.key(inner)
+    if mask is not None:
+        outer_codes, inner_codes = outer_codes[mask], inner_codes[mask]
+
+    pairs = outer_codes.astype(np.int64) * max(len(inner_keys), 1) + inner_codes
+    pair_codes, pair_keys = pd.factorize(pairs)
+    counts = np.bincount(pair_codes, minlength=len(pair_keys))
+
+    nested: Dict = {}
+    for pair, count in zip(pair_keys.tolist(), counts.tolist()):
+        outer_code, inner_code = divmod(pair, max(len(inner_keys), 1))
+        nested.setdefault(outer_keys[outer_code], {})[inner_keys[inner_code]] = count
+    return nested
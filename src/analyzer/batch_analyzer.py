@@ -0,0 +1,328 @@
+import re
+import time
+from typing import Any, Dict, Iterable, Optional, Pattern
+
+import numpy as np
+import pandas as pd
+
+from .match_spans import MatchSpanRecorder
+from .pattern_order import AdaptivePatternOrder
+from .pattern_profile import PatternProfile
+from .patterns import (
+    REMORSE_PATTERNS, POLITICAL_PATTERNS, PATTERN_REGISTRY, REMORSE_TYPE_PATTERNS, compile_patterns
+)
+
+# Column order of the per-comment results table
+RESULT_COLUMNS = [
+    'comment_id',
+    'has_remorse',
+    'remorse_type',
+    'previous_stance',
+    'catalyst',
+    'political_lean',
+    'confidence_score',
+    'timestamp',
+    'channel',
+    'engagement_score',
+    'has_edit'
+]
+
+
+class BatchCommentAnalyzer:
+    """
+    Column-wise comment analysis with cascaded masked pattern evaluation.
+
+    Produces the same per-comment results as the row-by-row analyzer, but
+    evaluates the admission patterns first and runs the secondary categories
+    (previous anti-vax stance, catalyst, current pro-vax stance, political
+    lean and remorse type) only on the rows that passed, so the cost of the
+    secondary categories scales with the number of candidates rather than
+    the corpus size.
+
+    The admission mask is an ``any`` check, so its patterns are evaluated in
+    the order learned by ``pattern_order``; counted and first-match
+    categories keep their definition order and results never depend on it.
+    """
+
+    def __init__(
+        self,
+        pattern_order: Optional[AdaptivePatternOrder] = None,
+        pattern_profile: Optional[PatternProfile] = None
+    ):
+        """
+        Parameters:
+        pattern_order (AdaptivePatternOrder, optional): Statistics used to order
+            commutative checks; a fresh in-memory instance by default
+        pattern_profile (PatternProfile, optional): Receives the cost, hits and
+            decided comments of every pattern evaluation; can also be set
+            (or reset to None) on the instance between batches
+        """
+        self.pattern_order = pattern_order if pattern_order is not None else AdaptivePatternOrder()
+        self.pattern_profile = pattern_profile
+        self.remorse_patterns = compile_patterns(REMORSE_PATTERNS)
+        self.political_patterns = compile_patterns(POLITICAL_PATTERNS)
+        self.remorse_type_patterns = [
+            (remorse_type, re.compile(pattern, re.IGNORECASE))
+            for remorse_type, pattern in REMORSE_TYPE_PATTERNS
+        ]
+        self.category_patterns = {**self.remorse_patterns, **self.political_patterns}
+        self.pattern_ids: Dict[str, list] = {}
+        for pattern_id, (category, _) in enumerate(PATTERN_REGISTRY):
+            self.pattern_ids.setdefault(category, []).append(pattern_id)
+
+    def analyze_batch(
+        self,
+        texts: Iterable[str],
+        spans: Optional[MatchSpanRecorder] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Analyze a batch of (cleaned) comment texts
+
+        Parameters:
+        texts: Iterable of comment strings; missing values are treated as empty
+        spans (MatchSpanRecorder, optional): Receives the match span of every
+            pattern that matched a remorse candidate, with rows indexed by
+            position in ``texts``
+
+        Returns:
+        Dict mapping result fields to arrays aligned with ``texts``
+        """
+        texts = _as_text_array(texts)
+        n = len(texts)
+        if self.pattern_profile is not None:
+            self.pattern_profile.add_comments(n)
+
+        results = {
+            'has_remorse': np.zeros(n, dtype=bool),
+            'remorse_type': np.full(n, None, dtype=object),
+            'previous_stance': np.full(n, None, dtype=object),
+            'catalyst': np.full(n, None, dtype=object),
+            'political_lean': np.full(n, None, dtype=object),
+            'confidence_score': np.zeros(n, dtype=np.int32)
+        }
+
+        # Stage 1: admission mask over the whole batch
+        candidates = np.flatnonzero(self._any_match('admission', texts))
+        if not candidates.size:
+            return results
+
+        # Stage 2: secondary categories on the gathered candidates only
+        candidate_texts = texts[candidates]
+        # Admission was decided in stage 1; the recount only adds cost and hits to the profile
+        admission_matches = self._count_matches('admission', candidate_texts, candidates, spans, decides=False)
+        anti_vax_matches = self._count_matches('previous_anti_vax', candidate_texts, candidates, spans)
+        catalysts = self._first_match('catalyst', candidate_texts, candidates, spans)
+        pro_vax_matches = self._count_matches('current_pro_vax', candidate_texts, candidates, spans)
+        conservative_matches = self._count_matches('conservative', candidate_texts, candidates, spans)
+        progressive_matches = self._count_matches('progressive', candidate_texts, candidates, spans)
+
+        confidence = admission_matches + anti_vax_matches + pro_vax_matches
+        confidence += np.not_equal(catalysts, None).astype(np.int32)
+
+        political_lean = np.full(len(candidates), None, dtype=object)
+        political_lean[conservative_matches > progressive_matches] = 'conservative'
+        political_lean[progressive_matches > conservative_matches] = 'progressive'
+
+        # Scatter back into batch-aligned arrays
+        results['has_remorse'][candidates] = True
+        results['confidence_score'][candidates] = confidence
+        results['previous_stance'][candidates[anti_vax_matches > 0]] = 'anti_vax'
+        results['catalyst'][candidates] = catalysts
+        results['political_lean'][candidates] = political_lean
+        results['remorse_type'][candidates] = self._classify_remorse_types(candidate_texts)
+
+        return results
+
+    def analyze_texts(
+        self,
+        texts: Iterable[str],
+        comment_id: Optional[Iterable] = None,
+        published_at: Optional[Iterable] = None,
+        channel: Optional[Iterable] = None,
+        engagement_score: Optional[Iterable] = None,
+        has_edit: Optional[Iterable] = None,
+        spans: Optional[MatchSpanRecorder] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Analyze comment texts with optional parallel metadata arrays
+
+        Parameters:
+        texts: Iterable of comment strings
+        comment_id, published_at, channel, engagement_score, has_edit:
+            Optional iterables aligned with ``texts``; missing metadata is
+            filled with None, ``'unknown'``, 0 and False respectively
+        spans (MatchSpanRecorder, optional): Receives match spans
+
+        Returns:
+        Dict mapping every ``RESULT_COLUMNS`` field to an array aligned with ``texts``
+        """
+        texts = _as_text_array(texts)
+        n = len(texts)
+        results = self.analyze_batch(texts, spans)
+
+        columns = {
+            'comment_id': _metadata_array(comment_id, n, None, 'comment_id'),
+            **results,
+            'timestamp': _metadata_array(published_at, n, None, 'published_at'),
+            'channel': _metadata_array(channel, n, 'unknown', 'channel'),
+            'engagement_score': _metadata_array(engagement_score, n, 0, 'engagement_score'),
+            'has_edit': _metadata_array(has_edit, n, False, 'has_edit')
+        }
+        return {field: columns[field] for field in RESULT_COLUMNS}
+
+    def analyze_frame(
+        self,
+        df: pd.DataFrame,
+        text_column: str = 'cleaned_text',
+        spans: Optional[MatchSpanRecorder] = None
+    ) -> pd.DataFrame:
+        """
+        Analyze every comment of an analysis-ready DataFrame
+
+        Parameters:
+        df (pd.DataFrame): Comments with ``commentId``, ``publishedAt`` and ``channel``
+            columns; ``engagement_score`` and ``has_edited`` are optional
+        text_column (str): Column holding the comment text
+        spans (MatchSpanRecorder, optional): Receives match spans, with rows
+            indexed by position in ``df``
+
+        Returns:
+        pd.DataFrame: One row per comment with the ``RESULT_COLUMNS`` fields
+        """
+        columns = self.analyze_texts(
+            df[text_column].to_numpy(dtype=object),
+            comment_id=df['commentId'].to_numpy(),
+            channel=df['channel'].to_numpy(),
+            engagement_score=df['engagement_score'].to_numpy() if 'engagement_score' in df.columns else None,
+            has_edit=df['has_edited'].to_numpy() if 'has_edited' in df.columns else None,
+            spans=spans
+        )
+        table = pd.DataFrame({
+            # Keep optional string fields as object columns so missing values stay None
+            field: pd.Series(values, dtype=object) if values.dtype == object else values
+            for field, values in columns.items()
+        })
+        # Keep the original (possibly timezone-aware) datetime dtype
+        table['timestamp'] = df['publishedAt'].reset_index(drop=True)
+        return table
+
+    def _any_match(self, category: str, texts: np.ndarray) -> np.ndarray:
+        """
+        Mask of texts matched by any pattern of ``category``
+
+        Each pattern only scans the texts no earlier pattern matched, in the
+        order learned by ``pattern_order``.
+        """
+        patterns = self.category_patterns[category]
+        mask = np.zeros(len(texts), dtype=bool)
+        remaining = np.arange(len(texts))
+        for i in self.pattern_order.order(category, [pattern.pattern for pattern in patterns]):
+            if not remaining.size:
+                break
+            started = time.perf_counter()
+            hit = _match_mask(patterns[i], texts[remaining])
+            seconds = time.perf_counter() - started
+            hits = int(hit.sum())
+            self.pattern_order.record(category, patterns[i].pattern, len(remaining), hits, seconds)
+            self._profile(category, patterns[i].pattern, len(remaining), seconds, hits, hits)
+            mask[remaining[hit]] = True
+            remaining = remaining[~hit]
+        return mask
+
+    def _count_matches(
+        self,
+        category: str,
+        texts: np.ndarray,
+        rows: np.ndarray,
+        spans: Optional[MatchSpanRecorder] = None,
+        decides: bool = True
+    ) -> np.ndarray:
+        """
+        Count, per text, how many patterns of ``category`` match
+
+        With ``decides``, the first pattern matching a text is credited with
+        making it positive in the pattern profile.
+        """
+        counts = np.zeros(len(texts), dtype=np.int32)
+        for pattern, pattern_id in zip(self.category_patterns[category], self.pattern_ids[category]):
+            started = time.perf_counter()
+            if spans is None:
+                hit = _match_mask(pattern, texts)
+            else:
+                search = pattern.search
+                matches = [search(text) for text in texts]
+                hit = np.fromiter((match is not None for match in matches), dtype=bool, count=len(matches))
+                spans.add(rows[hit], pattern_id, [match for match in matches if match is not None])
+            if self.pattern_profile is not None:
+                positives = int((hit & (counts == 0)).sum()) if decides else 0
+                self._profile(category, pattern.pattern, len(texts), time.perf_counter() - started,
+                              int(hit.sum()), positives)
+            counts += hit
+        return counts
+
+    def _first_match(
+        self,
+        category: str,
+        texts: np.ndarray,
+        rows: np.ndarray,
+        spans: Optional[MatchSpanRecorder] = None
+    ) -> np.ndarray:
+        """Return, per text, the matched text of the first pattern of ``category`` that matches"""
+        found = np.full(len(texts), None, dtype=object)
+        remaining = np.arange(len(texts))
+        for pattern, pattern_id in zip(self.category_patterns[category], self.pattern_ids[category]):
+            if not remaining.size:
+                break
+            started = time.perf_counter()
+            search = pattern.search
+            matches = [search(text) for text in texts[remaining]]
+            hit = np.fromiter((match is not None for match in matches), dtype=bool, count=len(matches))
+            hits = [match for match in matches if match is not None]
+            self._profile(category, pattern.pattern, len(remaining), time.perf_counter() - started,
+                          len(hits), len(hits))
+            found[remaining[hit]] = [match.group() for match in hits]
+            if spans is not None:
+                spans.add(rows[remaining[hit]], pattern_id, hits)
+            remaining = remaining[~hit]
+        return found
+
+    def _classify_remorse_types(self, texts: np.ndarray) -> np.ndarray:
+        """Classify remorse type per text; patterns are tried in order"""
+        types = np.full(len(texts), 'general_remorse', dtype=object)
+        remaining = np.arange(len(texts))
+        for remorse_type, pattern in self.remorse_type_patterns:
+            if not remaining.size:
+                break
+            started = time.perf_counter()
+            hit = _match_mask(pattern, texts[remaining])
+            hits = int(hit.sum())
+            self._profile('remorse_type', pattern.pattern, len(remaining), time.perf_counter() - started, hits, hits)
+            types[remaining[hit]] = remorse_type
+            remaining = remaining[~hit]
+        return types
+
+    def _profile(self, category: str, pattern: str, calls: int, seconds: float, hits: int, positives: int):
+        """Record one pattern evaluation in the pattern profile, if profiling"""
+        if self.pattern_profile is not None:
+            self.pattern_profile.record(category, pattern, calls, seconds, hits, positives)
+
+
+def _as_text_array(texts: Iterable[str]) -> np.ndarray:
+    """Convert ``texts`` to an object array of strings"""
+    return np.array([text if isinstance(text, str) else '' for text in texts], dtype=object)
+
+
+def _match_mask(pattern: Pattern, texts: np.ndarray) -> np.ndarray:
+    """Boolean mask of the texts ``pattern`` matches"""
+    search = pattern.search
+    return np.fromiter((search(text) is not None for text in texts), dtype=bool, count=len(texts))
+
+
+def _metadata_array(values: Optional[Iterable], n: int, default: Any, name: str) -> np.ndarray:
+    """Return ``values`` as an array of length ``n``, or ``default`` repeated if missing"""
+    if values is None:
+        return np.full(n, default, dtype=object if default is None or isinstance(default, str) else None)
+    values = values if isinstance(values, np.ndarray) else np.asarray(list(values))
+    if len(values) != n:
+        raise ValueError(f"{name} has {len(values)} values, expected {n}")
+    return values
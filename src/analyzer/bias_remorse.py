@@ -1,71 +1,262 @@
-from .patterns import REMORSE_PATTERNS, POLITICAL_PATTERNS
 from .comment_analyzer import CommentAnalyzer
-from .statistical_analyzer import StatisticalAnalyzer
-from .report_generator import ReportGenerator
+from .match_spans import MatchSpanRecorder
+from .pattern_order import AdaptivePatternOrder
+from .time_index import TimeIndex
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List
-import re
+from functools import cached_property
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 from pathlib import Path
 
 class VaccineBiasRemorseAnalyzer:
-    def __init__(self):
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+    def __init__(
+        self,
+        pattern_order_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        samples_path: Optional[str] = None,
+        samples_compression: Optional[str] = 'gzip',
+        samples_max_bytes: Optional[int] = 64 << 20,
+        results_dataset: Optional[str] = None,
+        samples_per_stratum: Optional[int] = None,
+        samples_seed: Optional[int] = None,
+        results_dir: Optional[str] = 'results'
+    ):
+        """
+        Parameters:
+        pattern_order_path (str, optional): JSON file persisting the learned
+            pattern evaluation order between runs
+        cache_dir (str, optional): Directory of the result cache; results are
+            not cached when omitted
+        samples_path (str, optional): Base path of the JSON Lines remorse
+            sample output (see ``JsonlCaseWriter``); no samples are written when omitted
+        samples_compression (str, optional): None, ``'gzip'`` or ``'zstd'``
+        samples_max_bytes (int, optional): Size at which sample files are rotated
+        results_dataset (str, optional): Root of the partitioned Parquet
+            dataset receiving every analyzed comment's results (see
+            ``results_dataset``); requires pyarrow
+        samples_per_stratum (int, optional): Write a reservoir sample of at
+            most this many cases per channel × remorse type × month instead
+            of every case (see ``sampling.StratifiedReservoir``)
+        samples_seed (int, optional): Seed of the stratified sample
+        results_dir (str, optional): Directory receiving the formatted
+            results, match spans and report export of every analysis;
+            nothing is written there when None
+        """
+        # Handlers are configured once by the entry point (utils.logging_config.setup_logging)
         self.logger = logging.getLogger(__name__)
         
         # Initialize components
-        self.comment_analyzer = CommentAnalyzer()
-        self.statistical_analyzer = StatisticalAnalyzer()
-        self.report_generator = ReportGenerator()
-        
-        # Import and compile patterns
-        self.remorse_patterns = REMORSE_PATTERNS
-        self.political_patterns = POLITICAL_PATTERNS
-        self._compile_patterns()
-
-    def _compile_patterns(self):
-        """Compile regex patterns for efficient matching"""
-        for category, patterns in self.remorse_patterns.items():
-            self.remorse_patterns[category] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
-        
-        for leaning, patterns in self.political_patterns.items():
-            self.political_patterns[leaning] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        self.pattern_order = AdaptivePatternOrder(pattern_order_path)
+        self.comment_analyzer = CommentAnalyzer(self.pattern_order)
+        self.batch_analyzer = self.comment_analyzer.batch_analyzer
+        self.result_cache = None
+        if cache_dir:
+            # Hashes analyzer sources; imported only when caching is on
+            from .result_cache import ResultCache
+            self.result_cache = ResultCache(cache_dir)
+        self.samples_path = samples_path
+        self.samples_compression = samples_compression
+        self.samples_max_bytes = samples_max_bytes
+        self.results_dataset = results_dataset
+        self.samples_per_stratum = samples_per_stratum
+        self.samples_seed = samples_seed
+        self.results_dir = results_dir
+        self.sample_reservoir = None
+        if results_dataset:
+            from .report_export import require_parquet
+            require_parquet('The results dataset')
+        self.match_spans = None
+        self.results_table = None
+        self.time_index = None
+        self.started_at = None
+
+    @cached_property
+    def statistical_analyzer(self) -> 'StatisticalAnalyzer':
+        """Statistical analysis of the cases, created on first use"""
+        from .statistical_analyzer import StatisticalAnalyzer
+        return StatisticalAnalyzer()
 
-    def analyze_dataset(self, df: pd.DataFrame) -> Dict:
-        """Analyze dataset and generate formatted report"""
+    @cached_property
+    def report_generator(self) -> 'ColumnarReportGenerator':
+        """Report backend over the columnar results table, created on first use"""
+        from .columnar_report import ColumnarReportGenerator
+        return ColumnarReportGenerator()
+
+    def analyze_dataset(self, df: pd.DataFrame, sections: Optional[List[str]] = None) -> Dict:
+        """
+        Analyze dataset and generate formatted report
+
+        Parameters:
+        df (pd.DataFrame): Analysis-ready comments
+        sections (List[str], optional): Report sections to compute (see
+            ``report_generator.REPORT_SECTIONS``); all sections by default
+        """
         self.logger.info("Starting dataset analysis...")
+        self.started_at = datetime.now()
         
-        results = []
-        for _, row in df.iterrows():
-            analysis = self.comment_analyzer.analyze_comment(row, self.remorse_patterns['admission'])
-            if analysis['has_remorse']:
-                results.append(analysis)
+        # Reuse the results of an identical earlier run (same data, patterns and code)
+        cache_key = self.result_cache.results_key(df) if self.result_cache else None
+        cached = self.result_cache.load(cache_key) if cache_key else None
+        if cached is not None:
+            self.logger.info("Using cached analysis results")
+            results_table, self.match_spans = cached['results'], cached['match_spans']
+        else:
+            # Record match spans instead of copying comment text into sample dumps
+            spans = MatchSpanRecorder()
+            results_table = self.batch_analyzer.analyze_frame(df, spans=spans)
+            self.match_spans = spans.to_spans()
+            if self.pattern_order.path:
+                self.pattern_order.save()
+            if cache_key:
+                self.result_cache.store(cache_key, {'results': results_table, 'match_spans': self.match_spans})
+        self.results_table = results_table
+        self.time_index = TimeIndex.from_frame(df)
+        if self.results_dataset:
+            # Also on cache hits: the cache key does not cover the dataset root
+            from .results_dataset import write_results_dataset
+            written = write_results_dataset(results_table, self.results_dataset, self.time_index)
+            self.logger.info(f"Wrote per-comment results to {len(written)} partition(s) of {self.results_dataset}")
+        if self.results_dir:
+            self._save_match_spans()
+        if self.samples_path:
+            self._save_case_samples(df)
         
-        # Generate report using ReportGenerator
-        report = self.report_generator.generate_analysis_report(results, df)
+        # Generate report from the columnar results table
+        report_key = self.result_cache.report_key(cache_key, sections) if cache_key else None
+        report = self.result_cache.load(report_key) if report_key else None
+        if report is None:
+            report = self.report_generator.generate_analysis_report(
+                results_table, df, self.time_index, sections=sections
+            )
+            if report_key:
+                self.result_cache.store(report_key, report)
         
         # Format and save results
-        self._save_formatted_results(report)
+        if self.results_dir:
+            self._save_formatted_results(report)
+            self._export_report(report)
         
         return report
 
+    def remorse_rate_series(self, resolution: str = 'week', window: int = 4) -> pd.DataFrame:
+        """
+        Remorse rate over time for the last analyzed dataset
+
+        Parameters:
+        resolution (str): Bucket size, ``'day'``, ``'week'`` or ``'month'``
+        window (int): Number of buckets in the trailing rolling window
+
+        Returns:
+        DataFrame indexed by bucket start (see ``TimeIndex.rolling_rate``)
+        """
+        if self.time_index is None:
+            raise ValueError("No analyzed dataset available. Call analyze_dataset() first.")
+        return self.time_index.rolling_rate(self.results_table['has_remorse'], resolution, window)
+
+    def remorse_rate_intervals(self, by=('channel',), method: str = 'wilson', **kwargs) -> pd.DataFrame:
+        """
+        Remorse rates with confidence intervals for the last analyzed dataset
+
+        Parameters:
+        by: Group columns, e.g. ``('channel', 'month')``
+        method (str): ``'wilson'`` or ``'bootstrap'``
+        **kwargs: confidence, n_resamples and seed (see ``intervals.remorse_rate_intervals``)
+        """
+        if self.results_table is None:
+            raise ValueError("No analyzed dataset available. Call analyze_dataset() first.")
+        from .intervals import remorse_rate_intervals
+        return remorse_rate_intervals(self.results_table, by, method, time_index=self.time_index, **kwargs)
+
+    def cooccurrence(self, kinds=None, remorse_only: bool = True) -> pd.DataFrame:
+        """
+        Pairwise co-occurrence of patterns, categories, political lean, channel
+        and remorse type in the last analyzed dataset
+
+        Parameters:
+        kinds: Feature kinds to include (all of ``cooccurrence.FEATURE_KINDS`` by default)
+        remorse_only (bool): Count only comments with remorse
+
+        Returns:
+        Square DataFrame of comment counts indexed by (kind, feature)
+        """
+        if self.results_table is None:
+            raise ValueError("No analyzed dataset available. Call analyze_dataset() first.")
+        from .cooccurrence import FEATURE_KINDS, HitMatrix
+        results = self.results_table
+        spans = self.match_spans
+        if remorse_only:
+            rows = np.flatnonzero(results['has_remorse'].to_numpy(dtype=bool))
+            results = results.iloc[rows].reset_index(drop=True)
+            spans = spans.for_rows(rows)
+            spans.rows = np.searchsorted(rows, spans.rows)
+        return HitMatrix.from_results(results, spans, FEATURE_KINDS if kinds is None else kinds).cooccurrence()
+
+    def _save_match_spans(self):
+        """Save match spans of the last analysis; rows index the analyzed DataFrame"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        spans_file = Path(self.results_dir) / f'match_spans_{timestamp}.npz'
+
+        Path(self.results_dir).mkdir(parents=True, exist_ok=True)
+        self.match_spans.save(spans_file)
+        self.logger.info(f"Saved {len(self.match_spans)} match spans to {spans_file}")
+
+    def _save_case_samples(self, df: pd.DataFrame):
+        """Stream the remorse cases of the last analysis (or a stratified sample of them) to JSON Lines"""
+        # Output-only modules are imported when first needed to keep the analyzer import light
+        from .case_writer import JsonlCaseWriter, iter_case_batch
+        from .sampling import StratifiedReservoir
+        if self.samples_per_stratum:
+            self.sample_reservoir = StratifiedReservoir(self.samples_per_stratum, self.samples_seed).update(
+                self.results_table, df['cleaned_text'], self.match_spans, self.time_index
+            )
+            records = self.sample_reservoir.iter_records()
+        else:
+            records = iter_case_batch(self.results_table, df['cleaned_text'], self.match_spans)
+        writer = JsonlCaseWriter(self.samples_path, self.samples_compression, self.samples_max_bytes)
+        with writer:
+            writer.write_many(records)
+        self.logger.info(f"Saved {writer.records_written} remorse samples to {len(writer.paths)} file(s) at {self.samples_path}")
+
+    def _export_report(self, report: Dict):
+        """Export the full report as versioned JSON, plus Parquet tables when pyarrow is installed"""
+        from .report_export import export_report, parquet_available
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        written = export_report(
+            report, Path(self.results_dir) / f'report_{timestamp}', tables=parquet_available()
+        )
+        self.logger.info(f"Exported report to {written['report'].parent}")
+
     def _save_formatted_results(self, report: Dict):
         """Save formatted results to file"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        results_file = f'results/analysis_results_{timestamp}.txt'
-        
-        Path('results').mkdir(exist_ok=True)
+        results_file = save_formatted_results(report, self.results_dir, self.started_at)
+        self.logger.info(f"Saved formatted results to {results_file}")
+
+
+def save_formatted_results(report: Dict, results_dir: Union[str, Path], started_at: datetime) -> Path:
+    """
+    Write the key findings of a report to ``analysis_results_<timestamp>.txt``
+
+    Parameters:
+    report (Dict): Analysis report
+    results_dir (str or Path): Directory receiving the file
+    started_at (datetime): Start time of the analysis that produced the report
+
+    Returns:
+    Path: The file written
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results_file = Path(results_dir) / f'analysis_results_{timestamp}.txt'
+    
+    Path(results_dir).mkdir(parents=True, exist_ok=True)
+    
+    with open(results_file, 'w', encoding='utf-8') as f:
+        f.write("=== VACCINE BIAS REMORSE ANALYSIS ===\n")
+        f.write(f"Analysis started at: {started_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 50 + "\n")
         
-        with open(results_file, 'w', encoding='utf-8') as f:
-            f.write("=== VACCINE BIAS REMORSE ANALYSIS ===\n")
-            f.write(f"Analysis started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 50 + "\n")
-            
-            # Write findings sections
-            for finding in report['key_findings']:
-                f.write(f"{finding}\n")
\ No newline at end of file
+        # Write findings sections
+        for finding in report.get('key_findings', []):
+            f.write(f"{finding}\n")
+    return results_file
\ No newline at end of file
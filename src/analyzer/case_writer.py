@@ -0,0 +1,246 @@
+"""
+Streaming JSON Lines output of remorse cases.
+
+``JsonlCaseWriter`` appends one JSON record per case as cases are detected,
+buffering encoded lines and optionally compressing them with gzip or zstd
+(the latter needs the optional ``zstandard`` package). Output is split into
+numbered part files once a part exceeds ``max_bytes``, so neither the writer
+nor a reader ever holds the whole case list in memory. ``iter_case_records``
+reads the parts back one record at a time.
+"""
+import gzip
+import io
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .match_spans import MatchSpans
+
+# File suffix of each supported compression
+COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Per-case fields copied from the results table
+CASE_FIELDS = [
+    'comment_id',
+    'channel',
+    'timestamp',
+    'remorse_type',
+    'previous_stance',
+    'catalyst',
+    'political_lean',
+    'confidence_score',
+    'engagement_score',
+    'has_edit'
+]
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the 'zstandard' package") from e
+    return zstandard
+
+
+def json_default(value):
+    """Encode timestamps and numpy scalars found in result records"""
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonlCaseWriter:
+    """Buffered, optionally compressed and size-rotated JSON Lines writer"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        compression: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        buffer_size: int = 1 << 16
+    ):
+        """
+        Parameters:
+        path (str or Path): Base path, e.g. ``results/remorse_samples.jsonl``;
+            parts are written to ``remorse_samples.00000.jsonl[.gz|.zst]``, ...
+        compression (str, optional): None, ``'gzip'`` or ``'zstd'``
+        max_bytes (int, optional): Size of a part file on disk above which the
+            writer starts a new part; parts are not rotated when omitted.
+            Compressed parts may overshoot by the compressor's internal buffer.
+        buffer_size (int): Number of encoded bytes buffered before they are written
+
+        Parts left at ``path`` by an earlier writer are deleted, so readers of
+        the base path only see this writer's records.
+        """
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == 'zstd':
+            _zstandard()
+        self.path = Path(path)
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.paths: List[Path] = []
+        self.records_written = 0
+        self._raw: Optional[IO[bytes]] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        for stale in part_paths(self.path):
+            stale.unlink()
+
+    def __enter__(self) -> 'JsonlCaseWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record: Dict):
+        """Append one record"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=json_default)
+        encoded = line.encode('utf-8') + b'\n'
+        self._buffer.append(encoded)
+        self._buffered += len(encoded)
+        self.records_written += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict]):
+        """Append every record of an iterable"""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write the buffered records and rotate the part file if it is full"""
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open_part()
+        self._stream.write(b''.join(self._buffer))
+        self._buffer = []
+        self._buffered = 0
+        if self.max_bytes is not None and self._raw.tell() >= self.max_bytes:
+            self._close_part()
+
+    def close(self):
+        """Flush the remaining records and close the current part"""
+        self.flush()
+        self._close_part()
+
+    def _part_path(self, index: int) -> Path:
+        suffix = self.path.suffix or '.jsonl'
+        stem = self.path.name[:-len(self.path.suffix)] if self.path.suffix else self.path.name
+        return self.path.with_name(f'{stem}.{index:05d}{suffix}{COMPRESSION_SUFFIXES[self.compression]}')
+
+    def _open_part(self):
+        path = self._part_path(len(self.paths))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = open(path, 'wb')
+        if self.compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == 'zstd':
+            self._stream = _zstandard().ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self.paths.append(path)
+
+    def _close_part(self):
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+        self._stream = self._raw = None
+
+
+def _open_text(path: Path) -> IO[str]:
+    """Open a part file for reading, decompressing by suffix"""
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.suffix == '.zst':
+        raw = open(path, 'rb')
+        return io.TextIOWrapper(_zstandard().ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def part_paths(path: Union[str, Path]) -> List[Path]:
+    """Part files written by a ``JsonlCaseWriter`` with base ``path``, in order"""
+    path = Path(path)
+    suffix = path.suffix or '.jsonl'
+    stem = path.name[:-len(path.suffix)] if path.suffix else path.name
+    return sorted(path.parent.glob(f'{stem}.[0-9][0-9][0-9][0-9][0-9]{suffix}*'))
+
+
+def iter_case_records(paths: Union[str, Path, Sequence[Union[str, Path]]]) -> Iterator[Dict]:
+    """
+    Read records written by ``JsonlCaseWriter`` one at a time
+
+    Parameters:
+    paths: A part file, a list of part files, or the writer's base path
+        (which expands to all of its parts)
+
+    Yields:
+    Dict: One record per line
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths] if Path(paths).exists() else part_paths(paths)
+    for path in paths:
+        with _open_text(Path(path)) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_case_batch(
+    results: pd.DataFrame,
+    texts: Optional[Sequence[str]] = None,
+    spans: Optional[MatchSpans] = None,
+    context: int = 40
+) -> Iterator[Dict]:
+    """
+    Records of the remorse cases in a per-comment results table
+
+    Parameters:
+    results (pd.DataFrame): Results table as returned by ``analyze_frame``
+    texts: Comment texts aligned with ``results``; adds a ``text`` field
+    spans (MatchSpans, optional): Match spans of the same analysis (needs
+        ``texts``); adds the highlighted ``matches`` of each case
+    context (int): Characters of context kept around each match
+
+    Yields:
+    Dict with the ``CASE_FIELDS`` of each case, plus ``text`` and ``matches``
+    """
+    rows = np.flatnonzero(results['has_remorse'].to_numpy(dtype=bool))
+    if not len(rows):
+        return
+    fields = [field for field in CASE_FIELDS if field in results.columns]
+    cases = results.iloc[rows]
+    columns = [cases[field].to_numpy(dtype=object) for field in fields]
+
+    matches: Dict[int, List[Dict]] = {}
+    if spans is not None and texts is not None:
+        for snippet in spans.iter_snippets(texts, context=context, rows=rows):
+            matches.setdefault(snippet['row'], []).append({
+                'category': snippet['category'],
+                'match': snippet['match'],
+                'snippet': snippet['snippet']
+            })
+    texts = texts.to_numpy(dtype=object) if hasattr(texts, 'to_numpy') else texts
+
+    for i, row in enumerate(rows):
+        record = {field: column[i] for field, column in zip(fields, columns)}
+        if record.get('timestamp') is not None and pd.isna(record['timestamp']):
+            record['timestamp'] = None
+        if texts is not None:
+            record['text'] = texts[row]
+        if spans is not None and texts is not None:
+            record['matches'] = matches.get(int(row), [])
+        yield record
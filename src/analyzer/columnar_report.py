@@ -0,0 +1,191 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ._columns import ColumnGroups, grouped_arrays, nested_counts
+from .report_generator import REPORT_SECTIONS, LazyReport, ReportGenerator, engagement_summaries, score_histogram
+from .time_index import TimeIndex
+
+
+class ColumnarReportGenerator(ReportGenerator):
+    """
+    ReportGenerator backend over the columnar per-comment results table.
+
+    Every section is computed from integer group codes with ``np.bincount``
+    and stable sorts instead of per-case Python loops, and produces the same
+    report dict (keys, values and first-appearance ordering) as
+    ``ReportGenerator`` does for the equivalent list of case dicts.
+    """
+
+    def generate_analysis_report(
+        self,
+        results: pd.DataFrame,
+        full_df,
+        time_index: Optional[TimeIndex] = None,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """
+        Generate comprehensive analysis report
+
+        Parameters:
+        results (pd.DataFrame): Results table as returned by
+            ``BatchCommentAnalyzer.analyze_frame``; rows without remorse are ignored
+        full_df (pd.DataFrame): The analyzed comments (for per-channel totals)
+        time_index (TimeIndex, optional): Index of the results' timestamps,
+            aligned with the rows of ``results``; built from the ``timestamp``
+            column when omitted
+        sections: Names of the sections to compute (see ``REPORT_SECTIONS``);
+            all sections by default
+        """
+        if 'has_remorse' in results.columns:
+            remorse = results['has_remorse'].to_numpy(dtype=bool)
+            results = results[remorse]
+            if time_index is not None:
+                time_index = time_index.take(remorse)
+        if results.empty:
+            return {"error": "No bias remorse cases detected"}
+
+        return self.lazy_report(results.reset_index(drop=True), full_df, time_index).materialize(sections)
+
+    def lazy_report(self, results: pd.DataFrame, full_df, time_index: Optional[TimeIndex] = None) -> LazyReport:
+        """
+        Return a report that computes each section only when it is accessed
+
+        ``results`` must contain only remorse cases; group keys are factorized
+        once and shared by the sections that need them.
+        """
+        return LazyReport(self._section_providers(results, full_df, time_index))
+
+    def _section_providers(self, results: pd.DataFrame, full_df, time_index: Optional[TimeIndex] = None) -> Dict:
+        """Provider of every report section, in ``REPORT_SECTIONS`` order"""
+        groups = ColumnGroups(results, time_index)
+        return {
+            'summary': lambda report: {
+                'total_comments_analyzed': len(full_df),
+                'remorse_cases': len(results),
+                'remorse_rate': (len(results) / len(full_df)) * 100
+            },
+            'channel_analysis': lambda report: self._get_channel_analysis(groups, full_df),
+            'temporal_analysis': lambda report: self._get_temporal_distribution(groups),
+            'remorse_types': lambda report: self._get_remorse_types(groups),
+            'catalysts': lambda report: self._get_catalyst_analysis(groups),
+            'political_distribution': lambda report: self._get_political_distribution(groups),
+            'engagement_metrics': lambda report: self._get_engagement_metrics(groups),
+            'edit_patterns': lambda report: self._get_edit_patterns(groups),
+            'key_findings': self._extract_key_findings
+        }
+
+    def _compile_report(self, results: pd.DataFrame, full_df, time_index: Optional[TimeIndex] = None) -> Dict:
+        """Compile all analysis components into a report"""
+        return self.lazy_report(results, full_df, time_index).materialize(REPORT_SECTIONS[:-1])
+
+    def _get_channel_analysis(self, groups: ColumnGroups, full_df) -> Dict:
+        """Analyze patterns by channel"""
+        codes, channels = groups.key('channel')
+        counts = np.bincount(codes, minlength=len(channels))
+        confidence = np.bincount(codes, weights=groups.confidence, minlength=len(channels))
+        channel_totals = full_df['channel'].value_counts().to_dict()
+
+        channel_stats = {}
+        for channel, count, confidence_sum in zip(channels, counts.tolist(), confidence.tolist()):
+            total = channel_totals.get(channel, 0)
+            channel_stats[channel] = {
+                'remorse_count': count,
+                'total_comments': total,
+                'remorse_rate': (count / total * 100) if total > 0 else 0,
+                'avg_confidence': confidence_sum / count
+            }
+        return channel_stats
+
+    def _get_temporal_distribution(self, groups: ColumnGroups) -> Dict:
+        """Analyze temporal distribution of cases"""
+        month_codes, months = groups.key('month')
+        counts = np.bincount(month_codes, minlength=len(months))
+        types = nested_counts(groups, 'month', 'remorse_type')
+        catalysts = nested_counts(groups, 'month', 'catalyst', groups.has_catalyst)
+
+        return {
+            month: {
+                'count': count,
+                'types': types.get(month, {}),
+                'catalysts': catalysts.get(month, {})
+            }
+            for month, count in zip(months, counts.tolist())
+        }
+
+    def _get_remorse_types(self, groups: ColumnGroups) -> Dict:
+        """Analyze remorse types"""
+        codes, remorse_types = groups.key('remorse_type')
+        counts = np.bincount(codes, minlength=len(remorse_types))
+        confidence = np.bincount(codes, weights=groups.confidence, minlength=len(remorse_types))
+        catalysts = nested_counts(groups, 'remorse_type', 'catalyst', groups.has_catalyst)
+        political = nested_counts(groups, 'remorse_type', 'political_lean', groups.has_political_lean)
+
+        details = {}
+        for remorse_type, count, confidence_sum in zip(remorse_types, counts.tolist(), confidence.tolist()):
+            details[remorse_type] = {
+                'count': count,
+                'avg_confidence': confidence_sum / count,
+                'catalysts': catalysts.get(remorse_type, {}),
+                'political_distribution': political.get(remorse_type, {})
+            }
+
+        return {
+            'distribution': dict(zip(remorse_types, counts.tolist())),
+            'details': details
+        }
+
+    def _get_catalyst_analysis(self, groups: ColumnGroups) -> Dict:
+        """Analyze catalysts"""
+        mask = groups.has_catalyst
+        codes, catalysts = groups.key('catalyst', mask)
+        counts = np.bincount(codes, minlength=len(catalysts))
+        remorse_types = nested_counts(groups, 'catalyst', 'remorse_type', mask)
+        confidence = np.bincount(codes, weights=groups.confidence[mask], minlength=len(catalysts))
+        scores = grouped_arrays(codes, groups.confidence[mask], len(catalysts))
+
+        return {
+            catalyst: {
+                'count': count,
+                'remorse_types': remorse_types[catalyst],
+                'avg_confidence': confidence_sum / count,
+                'confidence_scores': score_histogram(catalyst_scores)
+            }
+            for catalyst, count, confidence_sum, catalyst_scores in zip(
+                catalysts, counts.tolist(), confidence.tolist(), scores
+            )
+        }
+
+    def _get_political_distribution(self, groups: ColumnGroups) -> Dict:
+        """Analyze political distribution"""
+        codes, leanings = groups.key('political_lean')
+        counts = np.bincount(codes, minlength=len(leanings))
+
+        return {
+            'overall': dict(zip(leanings, counts.tolist())),
+            'by_channel': nested_counts(groups, 'channel', 'political_lean')
+        }
+
+    def _get_engagement_metrics(self, groups: ColumnGroups) -> Dict:
+        """Analyze engagement metrics"""
+        type_codes, remorse_types = groups.key('remorse_type')
+        channel_codes, channels = groups.key('channel')
+
+        return {
+            'avg_engagement': float(groups.engagement.sum()) / groups.n,
+            'by_type': engagement_summaries(
+                dict(zip(remorse_types, grouped_arrays(type_codes, groups.engagement, len(remorse_types))))
+            ),
+            'by_channel': engagement_summaries(
+                dict(zip(channels, grouped_arrays(channel_codes, groups.engagement, len(channels))))
+            )
+        }
+
+    def _get_edit_patterns(self, groups: ColumnGroups) -> Dict:
+        """Analyze edit patterns"""
+        return {
+            'edit_rate': int(groups.has_edit.sum()) / groups.n,
+            'by_type': {},
+            'by_channel': {}
+        }
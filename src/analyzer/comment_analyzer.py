@@ -1,10 +1,51 @@
 import re
-from typing import Dict
+from typing import Dict, Iterable, Optional
+import numpy as np
 import pandas as pd
 import logging
+from .batch_analyzer import BatchCommentAnalyzer
+from .match_spans import MatchSpanRecorder
+from .pattern_order import AdaptivePatternOrder
+
+logger = logging.getLogger(__name__)
 
 class CommentAnalyzer:
     """Handles individual comment analysis"""
+
+    def __init__(self, pattern_order: Optional[AdaptivePatternOrder] = None):
+        self.batch_analyzer = BatchCommentAnalyzer(pattern_order)
+
+    def analyze_texts(
+        self,
+        texts: Iterable[str],
+        comment_id: Optional[Iterable] = None,
+        published_at: Optional[Iterable] = None,
+        channel: Optional[Iterable] = None,
+        engagement_score: Optional[Iterable] = None,
+        has_edit: Optional[Iterable] = None,
+        spans: Optional[MatchSpanRecorder] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Analyze a batch of comment texts without building pandas rows
+
+        Parameters:
+        texts: Iterable or array of (cleaned) comment strings
+        comment_id, published_at, channel, engagement_score, has_edit:
+            Optional metadata iterables aligned with ``texts``
+        spans (MatchSpanRecorder, optional): Receives pattern match spans
+
+        Returns:
+        Dict of columnar results: one array per result field, aligned with ``texts``
+        """
+        return self.batch_analyzer.analyze_texts(
+            texts,
+            comment_id=comment_id,
+            published_at=published_at,
+            channel=channel,
+            engagement_score=engagement_score,
+            has_edit=has_edit,
+            spans=spans
+        )
     
     def analyze_comment(self, comment_row, remorse_patterns):
         """
@@ -41,7 +82,8 @@ class CommentAnalyzer:
         try:
             result['sentiment_score'] = self.sentiment_analyzer.polarity_scores(comment_text)['compound']
         except Exception as e:
-            logging.warning(f"Error calculating sentiment: {str(e)}")
+            # Raised for every row when sentiment is unavailable; rate limited by the log setup
+            logger.warning("Error calculating sentiment: %s", e, extra={'rate_limit_key': 'sentiment'})
             result['sentiment_score'] = 0.0
         
         # Count edits
@@ -0,0 +1,125 @@
+"""
+Co-occurrence tables from a sparse per-comment hit matrix.
+
+``HitMatrix`` holds a boolean comments × features matrix in coordinate
+form, with features such as individual patterns, pattern categories,
+political lean, channel and remorse type. Co-occurrence counts are the
+matrix product ``A.T @ B``, computed by joining the nonzero entries of both
+matrices on their row, so the cost is proportional to the number of feature
+pairs that actually co-occur rather than to comments × features².
+"""
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._columns import factorize
+from .match_spans import MatchSpans
+from .patterns import PATTERN_REGISTRY
+
+# Feature kinds built by ``HitMatrix.from_results``
+FEATURE_KINDS = ('pattern', 'category', 'political_lean', 'channel', 'remorse_type')
+
+
+class HitMatrix:
+    """Sparse boolean comments × features matrix"""
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, n_rows: int, labels: Sequence[Tuple[str, Any]]):
+        """
+        Parameters:
+        rows, cols (np.ndarray): Coordinates of the nonzero entries (duplicates are merged)
+        n_rows (int): Number of comments
+        labels: ``(kind, value)`` label of every feature column
+        """
+        self.n_rows = n_rows
+        self.labels = pd.MultiIndex.from_tuples(list(labels), names=['kind', 'feature'])
+        keys = np.unique(np.asarray(rows, dtype=np.int64) * len(self.labels) + np.asarray(cols, dtype=np.int64))
+        self.rows, self.cols = np.divmod(keys, max(len(self.labels), 1))
+
+    @classmethod
+    def from_results(
+        cls,
+        results: pd.DataFrame,
+        spans: Optional[MatchSpans] = None,
+        kinds: Iterable[str] = FEATURE_KINDS
+    ) -> 'HitMatrix':
+        """
+        Build the hit matrix of a per-comment results table
+
+        Parameters:
+        results (pd.DataFrame): Results table as returned by ``analyze_frame``
+        spans (MatchSpans, optional): Match spans of the same analysis; needed
+            for the ``'pattern'`` and ``'category'`` features. Only the first
+            matching catalyst pattern of a comment is recorded.
+        kinds: Feature kinds to include (see ``FEATURE_KINDS``)
+        """
+        kinds = list(kinds)
+        parts = []
+        if spans is not None and 'pattern' in kinds:
+            labels = [('pattern', f'{category}:{pattern}') for category, pattern in PATTERN_REGISTRY]
+            parts.append((spans.rows, spans.pattern_ids.astype(np.int64), labels))
+        if spans is not None and 'category' in kinds:
+            categories = list(dict.fromkeys(category for category, _ in PATTERN_REGISTRY))
+            category_of = np.array([categories.index(category) for category, _ in PATTERN_REGISTRY])
+            parts.append((spans.rows, category_of[spans.pattern_ids], [('category', c) for c in categories]))
+        for kind in ('political_lean', 'channel', 'remorse_type'):
+            if kind in kinds and kind in results.columns:
+                codes, uniques = factorize(results[kind].to_numpy(dtype=object))
+                present = np.array([value is not None for value in uniques], dtype=bool)
+                hit = present[codes] if len(uniques) else np.zeros(len(codes), dtype=bool)
+                parts.append((np.flatnonzero(hit), codes[hit], [(kind, value) for value in uniques]))
+
+        rows, cols, labels = [], [], []
+        for part_rows, part_cols, part_labels in parts:
+            rows.append(np.asarray(part_rows, dtype=np.int64))
+            cols.append(np.asarray(part_cols, dtype=np.int64) + len(labels))
+            labels.extend(part_labels)
+        if not rows:
+            return cls(np.empty(0), np.empty(0), len(results), [])
+        return cls(np.concatenate(rows), np.concatenate(cols), len(results), labels)
+
+    def select(self, kinds: Iterable[str]) -> 'HitMatrix':
+        """Return the matrix restricted to features of the given kinds"""
+        keep = np.flatnonzero(self.labels.get_level_values('kind').isin(list(kinds)))
+        remap = np.full(len(self.labels), -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        mask = remap[self.cols] >= 0
+        return HitMatrix(self.rows[mask], remap[self.cols[mask]], self.n_rows, list(self.labels[keep]))
+
+    def counts(self) -> pd.Series:
+        """Number of comments with each feature"""
+        return pd.Series(np.bincount(self.cols, minlength=len(self.labels)), index=self.labels)
+
+    def cooccurrence(self, other: Optional['HitMatrix'] = None) -> pd.DataFrame:
+        """
+        Pairwise co-occurrence counts ``self.T @ other`` (``self.T @ self`` by default)
+
+        Returns:
+        DataFrame indexed by this matrix's features, with ``other``'s features as columns
+        """
+        other = self if other is None else other
+        if other.n_rows != self.n_rows:
+            raise ValueError("Hit matrices cover different numbers of comments")
+        product = _sparse_product(self.rows, self.cols, len(self.labels), other.rows, other.cols, len(other.labels))
+        return pd.DataFrame(product, index=self.labels, columns=other.labels)
+
+
+def _sparse_product(
+    a_rows: np.ndarray, a_cols: np.ndarray, n_a: int,
+    b_rows: np.ndarray, b_cols: np.ndarray, n_b: int
+) -> np.ndarray:
+    """Dense ``n_a × n_b`` result of ``A.T @ B`` for 0/1 matrices given in coordinate form"""
+    order = np.argsort(b_rows, kind='stable')
+    b_rows, b_cols = b_rows[order], b_cols[order]
+    n_rows = int(max(a_rows.max(initial=-1), b_rows.max(initial=-1))) + 1
+    b_degree = np.bincount(b_rows, minlength=n_rows)
+    b_start = np.concatenate([[0], np.cumsum(b_degree)[:-1]])
+
+    # Pair every entry of A with each entry of B in the same row
+    repeats = b_degree[a_rows]
+    pair_a_cols = np.repeat(a_cols, repeats)
+    offsets = np.arange(int(repeats.sum())) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    pair_b_cols = b_cols[np.repeat(b_start[a_rows], repeats) + offsets]
+
+    counts = np.bincount(pair_a_cols * n_b + pair_b_cols, minlength=n_a * n_b)
+    return counts.reshape(n_a, n_b)
@@ -0,0 +1,179 @@
+"""
+Confidence intervals for remorse rates and group means.
+
+Intervals are computed for all groups at once:
+
+- ``wilson_interval``: Wilson score interval for binomial proportions,
+  closed form and well behaved for small groups and rates near 0 or 1.
+- ``bootstrap_rate_interval``: percentile bootstrap of a rate. Resampling a
+  0/1 indicator of ``n`` comments with ``k`` cases yields a
+  Binomial(n, k / n) case count, so each resample is one binomial draw per
+  group instead of ``n`` index draws.
+- ``bootstrap_mean_interval``: percentile bootstrap of group means of
+  arbitrary values (e.g. engagement), resampling row indices within each
+  group for many resamples per vectorized step.
+
+``remorse_rate_intervals`` applies them to a per-comment results table
+grouped by channel, month or any other column.
+"""
+from statistics import NormalDist
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._columns import factorize
+from .time_index import TimeIndex
+
+# Upper bound on the number of random draws held in memory at once
+_MAX_DRAWS = 1 << 24
+
+
+def _z_score(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes, totals, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilson score interval of ``successes / totals``, elementwise
+
+    Returns:
+    (low, high) arrays; NaN where ``totals`` is 0
+    """
+    successes = np.asarray(successes, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    z2 = _z_score(confidence) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = successes / totals
+        denominator = 1 + z2 / totals
+        center = (p + z2 / (2 * totals)) / denominator
+        margin = np.sqrt(p * (1 - p) / totals + z2 / (4 * totals ** 2)) * np.sqrt(z2) / denominator
+    return np.clip(center - margin, 0, 1), np.clip(center + margin, 0, 1)
+
+
+def bootstrap_rate_interval(
+    successes,
+    totals,
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile bootstrap interval of ``successes / totals``, elementwise
+
+    Returns:
+    (low, high) arrays; NaN where ``totals`` is 0
+    """
+    successes = np.asarray(successes, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    safe_totals = np.maximum(totals, 1)
+    draws = rng.binomial(safe_totals, successes / safe_totals, size=(n_resamples, len(totals))) / safe_totals
+    low, high = np.quantile(draws, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+    empty = totals == 0
+    return np.where(empty, np.nan, low), np.where(empty, np.nan, high)
+
+
+def bootstrap_mean_interval(
+    values: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile bootstrap interval of the mean of ``values`` within each group
+
+    Parameters:
+    values (np.ndarray): Per-row values
+    codes (np.ndarray): Per-row group code in ``[0, n_groups)``; negative codes are ignored
+    n_groups (int): Number of groups
+
+    Returns:
+    (low, high) arrays of length ``n_groups``; NaN for empty groups
+    """
+    keep = np.asarray(codes) >= 0
+    codes = np.asarray(codes)[keep]
+    values = np.asarray(values, dtype=float)[keep]
+    order = np.argsort(codes, kind='stable')
+    codes, values = codes[order], values[order]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    rng = np.random.default_rng(seed)
+    means = np.empty((n_resamples, n_groups))
+    batch = max(1, _MAX_DRAWS // max(len(values), 1))
+    for first in range(0, n_resamples, batch):
+        count = min(batch, n_resamples - first)
+        # Resample each row's slot from its own group
+        picks = starts[codes] + (rng.random((count, len(values))) * sizes[codes]).astype(np.int64)
+        flat_groups = (np.arange(count)[:, None] * n_groups + codes).ravel()
+        sums = np.bincount(flat_groups, weights=values[picks].ravel(), minlength=count * n_groups)
+        with np.errstate(invalid='ignore'):
+            means[first:first + count] = sums.reshape(count, n_groups) / sizes
+    low, high = np.quantile(means, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+    return low, high
+
+
+def remorse_rate_intervals(
+    results: pd.DataFrame,
+    by: Sequence[str] = ('channel',),
+    method: str = 'wilson',
+    confidence: float = 0.95,
+    n_resamples: int = 2000,
+    seed: Optional[int] = None,
+    time_index: Optional[TimeIndex] = None
+) -> pd.DataFrame:
+    """
+    Remorse rate with a confidence interval for every group of comments
+
+    Parameters:
+    results (pd.DataFrame): Per-comment results table (all comments, not only remorse cases)
+    by: Columns to group by; ``'month'``, ``'week'`` and ``'day'`` are
+        derived from the ``timestamp`` column
+    method (str): ``'wilson'`` or ``'bootstrap'``
+    time_index (TimeIndex, optional): Index of the results' timestamps
+
+    Returns:
+    DataFrame with the group columns, comments, remorse_cases, remorse_rate,
+    ci_low and ci_high (rates in %), in first-appearance order of the groups
+    """
+    if method not in ('wilson', 'bootstrap'):
+        raise ValueError(f"Unknown interval method: {method}")
+
+    keys = {}
+    combined = np.zeros(len(results), dtype=np.int64)
+    for column in by:
+        if column in ('day', 'week', 'month'):
+            if time_index is None:
+                time_index = TimeIndex(results['timestamp'])
+            values = time_index.labels(column)
+        else:
+            values = results[column].to_numpy(dtype=object)
+        codes, uniques = factorize(values)
+        keys[column] = (codes, uniques)
+        combined = combined * max(len(uniques), 1) + codes
+
+    group_codes, _ = pd.factorize(combined)
+    n_groups = int(group_codes.max()) + 1 if len(group_codes) else 0
+    flags = results['has_remorse'].to_numpy(dtype=bool)
+    totals = np.bincount(group_codes, minlength=n_groups)
+    cases = np.bincount(group_codes, weights=flags, minlength=n_groups).astype(np.int64)
+
+    if method == 'wilson':
+        low, high = wilson_interval(cases, totals, confidence)
+    else:
+        low, high = bootstrap_rate_interval(cases, totals, confidence, n_resamples, seed)
+
+    first_rows = np.unique(group_codes, return_index=True)[1]
+    table = pd.DataFrame({
+        column: pd.Series(np.array(uniques, dtype=object)[codes[first_rows]], dtype=object)
+        for column, (codes, uniques) in keys.items()
+    })
+    table['comments'] = totals
+    table['remorse_cases'] = cases
+    table['remorse_rate'] = cases / totals * 100
+    table['ci_low'] = low * 100
+    table['ci_high'] = high * 100
+    return table
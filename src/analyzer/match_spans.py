@@ -0,0 +1,153 @@
+"""
+Compact pattern match records.
+
+Instead of copying comment text into sample dumps, analysis records one
+``(row, pattern_id, start, end)`` tuple per pattern match in flat integer
+arrays. Highlighted snippets are reconstructed on demand from the analyzed
+corpus, so explainability costs 20 bytes per match (an int64 row plus
+int32 pattern ID, start and end) and no text duplication.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .patterns import PATTERN_REGISTRY
+
+
+class MatchSpanRecorder:
+    """Accumulates match spans while a batch is analyzed"""
+
+    def __init__(self):
+        self._rows: List[np.ndarray] = []
+        self._pattern_ids: List[np.ndarray] = []
+        self._starts: List[np.ndarray] = []
+        self._ends: List[np.ndarray] = []
+
+    def add(self, rows: np.ndarray, pattern_id: int, matches: Sequence):
+        """
+        Record the matches of one pattern
+
+        Parameters:
+        rows (np.ndarray): Corpus row index of each match
+        pattern_id (int): Index of the pattern in ``PATTERN_REGISTRY``
+        matches: ``re.Match`` objects aligned with ``rows``
+        """
+        if not len(rows):
+            return
+        self._rows.append(np.asarray(rows, dtype=np.int64))
+        self._pattern_ids.append(np.full(len(rows), pattern_id, dtype=np.int32))
+        self._starts.append(np.fromiter((match.start() for match in matches), dtype=np.int32, count=len(rows)))
+        self._ends.append(np.fromiter((match.end() for match in matches), dtype=np.int32, count=len(rows)))
+
+    def to_spans(self, row_offset: int = 0) -> 'MatchSpans':
+        """Return the recorded spans sorted by row, shifting rows by ``row_offset``"""
+        if not self._rows:
+            return MatchSpans.empty()
+        spans = MatchSpans(
+            np.concatenate(self._rows) + row_offset,
+            np.concatenate(self._pattern_ids),
+            np.concatenate(self._starts),
+            np.concatenate(self._ends)
+        )
+        return spans.sorted()
+
+
+class MatchSpans:
+    """Flat arrays of pattern match spans with a snippet reader"""
+
+    def __init__(self, rows: np.ndarray, pattern_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.pattern_ids = np.asarray(pattern_ids, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+
+    @classmethod
+    def empty(cls) -> 'MatchSpans':
+        return cls(np.empty(0), np.empty(0), np.empty(0), np.empty(0))
+
+    @classmethod
+    def concat(cls, parts: Sequence['MatchSpans']) -> 'MatchSpans':
+        """Concatenate spans whose rows already refer to the same corpus"""
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([part.rows for part in parts]),
+            np.concatenate([part.pattern_ids for part in parts]),
+            np.concatenate([part.starts for part in parts]),
+            np.concatenate([part.ends for part in parts])
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def sorted(self) -> 'MatchSpans':
+        """Return the spans ordered by row, then start offset"""
+        order = np.lexsort((self.starts, self.rows))
+        return MatchSpans(self.rows[order], self.pattern_ids[order], self.starts[order], self.ends[order])
+
+    def for_rows(self, rows: Union[int, Sequence[int]]) -> 'MatchSpans':
+        """Return the spans of the given corpus rows"""
+        mask = np.isin(self.rows, np.atleast_1d(rows))
+        return MatchSpans(self.rows[mask], self.pattern_ids[mask], self.starts[mask], self.ends[mask])
+
+    def for_category(self, category: str) -> 'MatchSpans':
+        """Return the spans of patterns in ``category`` (e.g. ``'catalyst'``)"""
+        ids = [i for i, (pattern_category, _) in enumerate(PATTERN_REGISTRY) if pattern_category == category]
+        mask = np.isin(self.pattern_ids, ids)
+        return MatchSpans(self.rows[mask], self.pattern_ids[mask], self.starts[mask], self.ends[mask])
+
+    def save(self, path: Union[str, Path]):
+        """Save the span arrays to a compressed ``.npz`` file"""
+        np.savez_compressed(
+            path,
+            rows=self.rows,
+            pattern_ids=self.pattern_ids,
+            starts=self.starts,
+            ends=self.ends
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'MatchSpans':
+        """Load spans written by ``save``"""
+        with np.load(path) as data:
+            return cls(data['rows'], data['pattern_ids'], data['starts'], data['ends'])
+
+    def iter_snippets(
+        self,
+        texts: Sequence[str],
+        context: int = 40,
+        highlight: tuple = ('[', ']'),
+        rows: Optional[Sequence[int]] = None
+    ) -> Iterator[Dict]:
+        """
+        Reconstruct highlighted snippets from the analyzed corpus
+
+        Parameters:
+        texts: Comment texts the spans were recorded on, indexed by position
+        context (int): Number of characters kept on each side of the match
+        highlight (tuple): Markers placed around the matched text
+        rows: Restrict the output to these corpus rows
+
+        Yields:
+        Dict with row, pattern_id, category, pattern, match and snippet
+        """
+        spans = self if rows is None else self.for_rows(rows)
+        texts = texts.to_numpy() if hasattr(texts, 'to_numpy') else texts
+        for row, pattern_id, start, end in zip(spans.rows, spans.pattern_ids, spans.starts, spans.ends):
+            text = texts[row]
+            left = max(0, start - context)
+            right = min(len(text), end + context)
+            category, pattern = PATTERN_REGISTRY[pattern_id]
+            yield {
+                'row': int(row),
+                'pattern_id': int(pattern_id),
+                'category': category,
+                'pattern': pattern,
+                'match': text[start:end],
+                'snippet': (
+                    ('...' if left > 0 else '')
+                    + text[left:start] + highlight[0] + text[start:end] + highlight[1] + text[end:right]
+                    + ('...' if right < len(text) else '')
+                )
+            }
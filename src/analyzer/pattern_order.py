@@ -0,0 +1,114 @@
+"""
+Adaptive evaluation order for commutative pattern checks.
+
+For an ``any``-style check that stops at the first matching pattern, the
+expected cost is minimised by evaluating patterns in ascending order of
+``cost per evaluation / hit probability``. ``AdaptivePatternOrder`` tracks
+both quantities per pattern at runtime and can persist them between runs.
+Categories whose result depends on which pattern matches first (catalyst
+extraction, remorse type classification) are never reordered.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Categories where the first matching pattern determines the result
+ORDER_SENSITIVE_CATEGORIES = {'catalyst', 'remorse_type'}
+
+
+class AdaptivePatternOrder:
+    """Per-pattern hit-rate and cost statistics with a learned evaluation order"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, min_calls: int = 1000):
+        """
+        Parameters:
+        path (str or Path, optional): JSON file the statistics are loaded from
+            (if it exists) and saved to
+        min_calls (int): Evaluations a pattern needs before its statistics are
+            trusted; patterns with fewer keep their definition order
+        """
+        self.path = Path(path) if path else None
+        self.min_calls = min_calls
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        if self.path and self.path.exists():
+            self.load(self.path)
+
+    def record(self, category: str, pattern: str, calls: int, hits: int, seconds: float):
+        """Add the outcome of evaluating ``pattern`` on ``calls`` texts"""
+        stats = self.stats.setdefault(category, {}).setdefault(
+            pattern, {'calls': 0, 'hits': 0, 'seconds': 0.0}
+        )
+        stats['calls'] += calls
+        stats['hits'] += hits
+        stats['seconds'] += seconds
+
+    def merge(self, other: 'AdaptivePatternOrder') -> 'AdaptivePatternOrder':
+        """Add the statistics of another instance (e.g. of a worker process)"""
+        for category, patterns in other.stats.items():
+            for pattern, stats in patterns.items():
+                self.record(category, pattern, stats['calls'], stats['hits'], stats['seconds'])
+        return self
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Copy of the current statistics, for ``since``"""
+        return {category: {pattern: dict(stats) for pattern, stats in patterns.items()}
+                for category, patterns in self.stats.items()}
+
+    def since(self, snapshot: Dict[str, Dict[str, Dict[str, float]]]) -> 'AdaptivePatternOrder':
+        """Statistics recorded after ``snapshot`` was taken, as a new instance"""
+        recorded = AdaptivePatternOrder(min_calls=self.min_calls)
+        for category, patterns in self.stats.items():
+            for pattern, stats in patterns.items():
+                before = snapshot.get(category, {}).get(pattern, {})
+                calls = stats['calls'] - before.get('calls', 0)
+                if calls:
+                    recorded.record(
+                        category, pattern, calls,
+                        stats['hits'] - before.get('hits', 0), stats['seconds'] - before.get('seconds', 0.0)
+                    )
+        return recorded
+
+    def order(self, category: str, patterns: List[str]) -> List[int]:
+        """
+        Return the indices of ``patterns`` in the order they should be evaluated
+
+        Patterns with enough observations are sorted by expected cost per
+        decision; order-sensitive categories always keep definition order.
+        """
+        indices = list(range(len(patterns)))
+        if category in ORDER_SENSITIVE_CATEGORIES:
+            return indices
+
+        category_stats = self.stats.get(category, {})
+        trusted = [i for i in indices if category_stats.get(patterns[i], {}).get('calls', 0) >= self.min_calls]
+        if len(trusted) < 2:
+            return indices
+
+        def expected_cost(i: int) -> float:
+            stats = category_stats[patterns[i]]
+            cost = stats['seconds'] / stats['calls']
+            # Laplace smoothing keeps never-matching patterns finite but last
+            hit_rate = (stats['hits'] + 1) / (stats['calls'] + 2)
+            return cost / hit_rate
+
+        # Reorder only the slots held by trusted patterns
+        reordered = iter(sorted(trusted, key=expected_cost))
+        trusted_slots = set(trusted)
+        return [next(reordered) if i in trusted_slots else i for i in indices]
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """Save the statistics as JSON"""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No path given for saving pattern statistics")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'categories': self.stats}, f, indent=2)
+
+    def load(self, path: Union[str, Path]):
+        """Merge statistics saved by ``save`` into this instance"""
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        for category, patterns in saved.get('categories', {}).items():
+            for pattern, stats in patterns.items():
+                self.record(category, pattern, stats['calls'], stats['hits'], stats['seconds'])
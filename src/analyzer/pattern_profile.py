@@ -0,0 +1,118 @@
+"""
+Per-pattern cost and hit-rate profiling.
+
+``PatternProfile`` collects, for every compiled pattern the batch analyzer
+evaluates, the number of evaluations (``calls``), the evaluations that
+matched (``hits``), the time spent and the comments the pattern made
+positive. A comment is made positive by the pattern that matches it first
+in its category's evaluation: the admission check (in the order learned by
+``pattern_order``), the previous/current stance counts and political lean
+counts (in definition order), catalyst extraction and remorse type
+classification. Recounts of patterns whose category was already decided
+(the admission count on the candidates) add calls, hits and time but no
+positives.
+
+The ranked table (``table``) shows where pattern time goes and how much
+each rule contributes, so expensive rules that rarely decide anything
+stand out.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# Sort keys of ``to_records`` and ``table``
+RANK_KEYS = ('seconds', 'calls', 'hits', 'positives', 'hit_rate', 'positive_share', 'seconds_per_call')
+
+
+class PatternProfile:
+    """Mergeable per-pattern evaluation statistics"""
+
+    def __init__(self):
+        # Comments analyzed, denominator of the positive share
+        self.comments = 0
+        # (category, pattern) -> counters
+        self.stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def add_comments(self, n: int):
+        """Count ``n`` analyzed comments"""
+        self.comments += n
+
+    def record(self, category: str, pattern: str, calls: int, seconds: float, hits: int = 0, positives: int = 0):
+        """Add the outcome of evaluating ``pattern`` on ``calls`` texts"""
+        stats = self.stats.setdefault(
+            (category, pattern), {'calls': 0, 'hits': 0, 'positives': 0, 'seconds': 0.0}
+        )
+        stats['calls'] += calls
+        stats['hits'] += hits
+        stats['positives'] += positives
+        stats['seconds'] += seconds
+
+    def merge(self, other: 'PatternProfile') -> 'PatternProfile':
+        """Add the statistics of another profile (e.g. of another chunk)"""
+        self.comments += other.comments
+        for (category, pattern), stats in other.stats.items():
+            self.record(category, pattern, **stats)
+        return self
+
+    def to_records(self, sort: str = 'seconds') -> List[Dict]:
+        """
+        One record per pattern, ranked by ``sort`` (descending)
+
+        Parameters:
+        sort (str): One of ``RANK_KEYS``
+
+        Returns:
+        List of dicts with the category, pattern, raw counters, the hit rate
+        per evaluation, the share of comments made positive, the share of
+        the total pattern time and the seconds per evaluation
+        """
+        if sort not in RANK_KEYS:
+            raise ValueError(f"Unknown sort key {sort!r}; expected one of {RANK_KEYS}")
+        total_seconds = sum(stats['seconds'] for stats in self.stats.values())
+        records = []
+        for (category, pattern), stats in self.stats.items():
+            records.append({
+                'category': category,
+                'pattern': pattern,
+                **stats,
+                'hit_rate': stats['hits'] / stats['calls'] if stats['calls'] else 0.0,
+                'positive_share': stats['positives'] / self.comments if self.comments else 0.0,
+                'time_share': stats['seconds'] / total_seconds if total_seconds > 0 else 0.0,
+                'seconds_per_call': stats['seconds'] / stats['calls'] if stats['calls'] else 0.0
+            })
+        records.sort(key=lambda record: record[sort], reverse=True)
+        for rank, record in enumerate(records, 1):
+            record['rank'] = rank
+        return records
+
+    def table(self, sort: str = 'seconds', limit: Optional[int] = None, width: int = 44) -> str:
+        """
+        Fixed-width ranked table of the patterns
+
+        Parameters:
+        sort (str): Ranking key, one of ``RANK_KEYS``
+        limit (int, optional): Show only the first ``limit`` patterns
+        width (int): Patterns longer than this are truncated
+        """
+        lines = [
+            f"{'#':>3}  {'category':<18}{'pattern':<{width}}{'calls':>11}{'hits':>9}{'hit %':>8}"
+            f"{'pos %':>8}{'seconds':>10}{'time %':>8}{'us/call':>9}"
+        ]
+        for record in self.to_records(sort)[:limit]:
+            pattern = record['pattern']
+            if len(pattern) > width - 1:
+                pattern = pattern[:width - 4] + '...'
+            lines.append(
+                f"{record['rank']:>3}  {record['category']:<18}{pattern:<{width}}{record['calls']:>11,}"
+                f"{record['hits']:>9,}{record['hit_rate']:>8.1%}{record['positive_share']:>8.1%}"
+                f"{record['seconds']:>10.3f}{record['time_share']:>8.1%}{record['seconds_per_call'] * 1e6:>9.2f}"
+            )
+        lines.append(f"{self.comments:,} comments analyzed")
+        return '\n'.join(lines)
+
+    def save(self, path: Union[str, Path], sort: str = 'seconds'):
+        """Save the ranked records as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'comments': self.comments, 'patterns': self.to_records(sort)}, f, indent=2)
@@ -1,6 +1,7 @@
 """
 Predefined patterns for vaccine bias remorse analysis
 """
+import re
 
 REMORSE_PATTERNS = {
     'admission': [
@@ -76,4 +77,28 @@ POLITICAL_PATTERNS = {
         r'responsibility',
         r'msnbc'
     ]
-}
\ No newline at end of file
+}
+
+# Stable integer pattern IDs: position in this list of (category, pattern)
+PATTERN_REGISTRY = [
+    (category, pattern)
+    for pattern_groups in (REMORSE_PATTERNS, POLITICAL_PATTERNS)
+    for category, patterns in pattern_groups.items()
+    for pattern in patterns
+]
+
+
+# Remorse type classification, evaluated in order (first match wins)
+REMORSE_TYPE_PATTERNS = [
+    ('personal_experience', r'family|friend|loved one|personal'),
+    ('scientific_evidence', r'research|evidence|studies|data|science'),
+    ('medical_authority', r'doctor|medical|healthcare|professional')
+]
+
+
+def compile_patterns(pattern_groups):
+    """Return a copy of ``pattern_groups`` with every pattern compiled case-insensitively"""
+    return {
+        group: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for group, patterns in pattern_groups.items()
+    }
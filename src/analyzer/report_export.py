@@ -0,0 +1,191 @@
+"""
+Structured export of analysis reports.
+
+``export_report`` writes the full report dict to a directory as compact,
+versioned JSON (``report.json``) and, when a Parquet engine such as pyarrow
+is installed, its tabular sections as typed Parquet tables (channels,
+months, remorse types and catalysts). ``load_report`` and
+``load_report_tables`` read them back without parsing the text summary.
+
+Dicts with non-string keys (e.g. the ``None`` political lean) are encoded as
+``{"__pairs__": [[key, value], ...]}`` so keys keep their type; tuple keys
+(e.g. ``(category, pattern)``) are written as lists and restored as tuples.
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .case_writer import json_default
+
+REPORT_SCHEMA_VERSION = 1
+
+REPORT_FILE = 'report.json'
+
+_PAIRS = '__pairs__'
+
+
+def parquet_available() -> bool:
+    """Whether pandas can write Parquet (pyarrow or fastparquet installed)"""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def require_parquet(feature: str = 'Parquet export'):
+    """Raise ImportError naming ``feature`` if no Parquet engine is installed"""
+    if not parquet_available():
+        raise ImportError(f"{feature} requires the 'pyarrow' package")
+
+
+def _encode(node):
+    """Make a report JSON-safe, keeping non-string dict keys"""
+    if isinstance(node, Mapping):
+        if all(isinstance(key, str) for key in node):
+            return {key: _encode(value) for key, value in node.items()}
+        return {_PAIRS: [[key, _encode(value)] for key, value in node.items()]}
+    if isinstance(node, (list, tuple)):
+        return [_encode(value) for value in node]
+    if isinstance(node, pd.DataFrame):
+        return _encode(node.to_dict('list'))
+    return node
+
+
+def _decode_object(pairs: List):
+    """``object_pairs_hook`` restoring dicts encoded by ``_encode``"""
+    if len(pairs) == 1 and pairs[0][0] == _PAIRS:
+        return {_decode_key(key): value for key, value in pairs[0][1]}
+    return dict(pairs)
+
+
+def _decode_key(key):
+    """Dict keys cannot be lists, so encoded tuple keys are restored as tuples"""
+    if isinstance(key, list):
+        return tuple(_decode_key(item) for item in key)
+    return key
+
+
+def report_tables(report: Mapping) -> Dict[str, pd.DataFrame]:
+    """
+    Tabular views of the report sections present in ``report``
+
+    Returns:
+    Dict mapping table name to a long-format DataFrame:
+    channels, months, month_types, month_catalysts, remorse_types,
+    type_catalysts, catalysts and catalyst_types
+    """
+    tables = {}
+    if 'channel_analysis' in report:
+        tables['channels'] = _records_frame(report['channel_analysis'], 'channel', [
+            'remorse_count', 'total_comments', 'remorse_rate', 'avg_confidence'
+        ])
+    if 'temporal_analysis' in report:
+        months = report['temporal_analysis']
+        tables['months'] = _records_frame(months, 'month', ['count'])
+        tables['month_types'] = _nested_frame(months, 'types', 'month', 'remorse_type')
+        tables['month_catalysts'] = _nested_frame(months, 'catalysts', 'month', 'catalyst')
+    if 'remorse_types' in report:
+        details = report['remorse_types'].get('details', {})
+        tables['remorse_types'] = _records_frame(details, 'remorse_type', ['count', 'avg_confidence'])
+        tables['type_catalysts'] = _nested_frame(details, 'catalysts', 'remorse_type', 'catalyst')
+    if 'catalysts' in report:
+        catalysts = report['catalysts']
+        tables['catalysts'] = _records_frame(catalysts, 'catalyst', ['count', 'avg_confidence'])
+        tables['catalyst_types'] = _nested_frame(catalysts, 'remorse_types', 'catalyst', 'remorse_type')
+    return tables
+
+
+def _records_frame(section: Mapping, key_name: str, fields: List[str]) -> pd.DataFrame:
+    """One row per key of ``section`` with the given numeric fields"""
+    table = pd.DataFrame({key_name: pd.Series(list(section), dtype=object)})
+    for field in fields:
+        values = [stats.get(field) for stats in section.values()]
+        counted = field in ('count', 'remorse_count', 'total_comments')
+        table[field] = np.asarray(values, dtype=np.int64 if counted else float)
+    return table
+
+
+def _nested_frame(section: Mapping, field: str, outer_name: str, inner_name: str) -> pd.DataFrame:
+    """Long-format ``(outer, inner, count)`` table of a nested count field"""
+    outer, inner, counts = [], [], []
+    for outer_key, stats in section.items():
+        for inner_key, count in stats.get(field, {}).items():
+            outer.append(outer_key)
+            inner.append(inner_key)
+            counts.append(count)
+    return pd.DataFrame({
+        outer_name: pd.Series(outer, dtype=object),
+        inner_name: pd.Series(inner, dtype=object),
+        'count': np.asarray(counts, dtype=np.int64)
+    })
+
+
+def export_report(
+    report: Mapping,
+    out_dir: Union[str, Path],
+    tables: bool = True,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Path]:
+    """
+    Write a report as versioned JSON plus Parquet tables
+
+    Parameters:
+    report (Mapping): Report as returned by ``generate_analysis_report``
+        (a ``LazyReport`` exports only its computed sections)
+    out_dir (str or Path): Directory receiving ``report.json`` and ``<table>.parquet``
+    tables (bool): Also write the ``report_tables`` as Parquet; requires
+        pyarrow or fastparquet
+    metadata (Dict, optional): Extra JSON-serializable run information
+
+    Returns:
+    Dict mapping ``'report'`` and each table name to the written file
+    """
+    if tables:
+        require_parquet()
+    if hasattr(report, 'computed'):
+        report = report.materialize(report.computed())
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = {'report': out_dir / REPORT_FILE}
+    with open(written['report'], 'w', encoding='utf-8') as f:
+        json.dump({
+            'schema_version': REPORT_SCHEMA_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'metadata': _encode(metadata or {}),
+            'sections': _encode(dict(report))
+        }, f, ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+    if tables:
+        for name, table in report_tables(report).items():
+            written[name] = out_dir / f'{name}.parquet'
+            table.to_parquet(written[name], index=False)
+    return written
+
+
+def load_report(out_dir: Union[str, Path]) -> Dict:
+    """
+    Load a report written by ``export_report``
+
+    Returns:
+    Dict with schema_version, created_at, metadata and the report ``sections``
+    """
+    with open(Path(out_dir) / REPORT_FILE, 'r', encoding='utf-8') as f:
+        saved = json.load(f, object_pairs_hook=_decode_object)
+    if saved.get('schema_version') != REPORT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported report schema version: {saved.get('schema_version')}")
+    return saved
+
+
+def load_report_tables(out_dir: Union[str, Path], names: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Load the Parquet tables written by ``export_report`` (all by default)"""
+    out_dir = Path(out_dir)
+    paths = sorted(out_dir.glob('*.parquet')) if names is None else [out_dir / f'{name}.parquet' for name in names]
+    return {path.stem: pd.read_parquet(path) for path in paths}
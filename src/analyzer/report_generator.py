@@ -1,36 +1,108 @@
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
 from collections import defaultdict
 
+import numpy as np
+
+from .sketches import QuantileSketch
+
+# Report sections in output order
+REPORT_SECTIONS = [
+    'summary',
+    'channel_analysis',
+    'temporal_analysis',
+    'remorse_types',
+    'catalysts',
+    'political_distribution',
+    'engagement_metrics',
+    'edit_patterns',
+    'key_findings'
+]
+
+class LazyReport(Mapping):
+    """
+    Report whose sections are computed on first access and memoised
+
+    Each provider receives the report itself, so sections that depend on
+    other sections (e.g. ``key_findings`` on ``summary``) compute them on demand.
+    """
+    
+    def __init__(self, providers: Dict[str, Callable[['LazyReport'], Any]]):
+        self._providers = providers
+        self._sections: Dict[str, Any] = {}
+    
+    def __getitem__(self, section: str) -> Any:
+        if section not in self._sections:
+            if section not in self._providers:
+                raise KeyError(section)
+            self._sections[section] = self._providers[section](self)
+        return self._sections[section]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._providers)
+    
+    def __len__(self) -> int:
+        return len(self._providers)
+    
+    def computed(self) -> List[str]:
+        """Names of the sections computed so far"""
+        return list(self._sections)
+    
+    def materialize(self, sections: Optional[Iterable[str]] = None) -> Dict:
+        """Compute the requested sections (all by default) and return them as a dict"""
+        sections = list(self._providers) if sections is None else list(sections)
+        unknown = [section for section in sections if section not in self._providers]
+        if unknown:
+            raise ValueError(f"Unknown report sections: {unknown}")
+        return {section: self[section] for section in sections}
+
 class ReportGenerator:
     """Handles generation of analysis reports"""
     
-    def generate_analysis_report(self, results: List[Dict], full_df) -> Dict:
-        """Generate comprehensive analysis report"""
+    def generate_analysis_report(
+        self,
+        results: List[Dict],
+        full_df,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """
+        Generate comprehensive analysis report
+        
+        Parameters:
+        results (List[Dict]): Remorse cases
+        full_df (pd.DataFrame): The analyzed comments (for per-channel totals)
+        sections: Names of the sections to compute (see ``REPORT_SECTIONS``);
+            all sections by default
+        """
         if not results:
             return {"error": "No bias remorse cases detected"}
         
-        report = self._compile_report(results, full_df)
-        report['key_findings'] = self._extract_key_findings(report)
-        
-        return report
+        return self.lazy_report(results, full_df).materialize(sections)
 
-    def _compile_report(self, results: List[Dict], full_df) -> Dict:
-        """Compile all analysis components into a report"""
-        report = {
-            'summary': {
+    def lazy_report(self, results: List[Dict], full_df) -> LazyReport:
+        """Return a report that computes each section only when it is accessed"""
+        return LazyReport(self._section_providers(results, full_df))
+
+    def _section_providers(self, results: List[Dict], full_df) -> Dict[str, Callable[[LazyReport], Any]]:
+        """Provider of every report section, in ``REPORT_SECTIONS`` order"""
+        return {
+            'summary': lambda report: {
                 'total_comments_analyzed': len(full_df),
                 'remorse_cases': len(results),
                 'remorse_rate': (len(results) / len(full_df)) * 100
             },
-            'channel_analysis': self._get_channel_analysis(results, full_df),
-            'temporal_analysis': self._get_temporal_distribution(results),
-            'remorse_types': self._get_remorse_types(results),
-            'catalysts': self._get_catalyst_analysis(results),
-            'political_distribution': self._get_political_distribution(results),
-            'engagement_metrics': self._get_engagement_metrics(results),
-            'edit_patterns': self._get_edit_patterns(results)
+            'channel_analysis': lambda report: self._get_channel_analysis(results, full_df),
+            'temporal_analysis': lambda report: self._get_temporal_distribution(results),
+            'remorse_types': lambda report: self._get_remorse_types(results),
+            'catalysts': lambda report: self._get_catalyst_analysis(results),
+            'political_distribution': lambda report: self._get_political_distribution(results),
+            'engagement_metrics': lambda report: self._get_engagement_metrics(results),
+            'edit_patterns': lambda report: self._get_edit_patterns(results),
+            'key_findings': self._extract_key_findings
         }
-        return report
+
+    def _compile_report(self, results: List[Dict], full_df) -> Dict:
+        """Compile all analysis components into a report"""
+        return self.lazy_report(results, full_df).materialize(REPORT_SECTIONS[:-1])
 
     def _extract_key_findings(self, report: Dict) -> List[str]:
         """Extract detailed insights from the analysis"""
@@ -127,19 +199,28 @@ class ReportGenerator:
         }
 
     def _get_catalyst_analysis(self, results: List[Dict]) -> Dict:
-        """Analyze catalysts"""
+        """
+        Analyze catalysts
+
+        Returns:
+        Dict of catalyst -> count, remorse_types, avg_confidence and
+        confidence_scores, a ``{score: cases}`` histogram in score order
+        """
         catalysts = defaultdict(lambda: {
             'count': 0,
-            'remorse_types': defaultdict(int),
-            'confidence_scores': []
+            'remorse_types': defaultdict(int)
         })
+        scores = defaultdict(list)
         
         for case in results:
             if case.get('catalyst'):
                 catalysts[case['catalyst']]['count'] += 1
                 catalysts[case['catalyst']]['remorse_types'][case.get('remorse_type', 'unknown')] += 1
-                catalysts[case['catalyst']]['confidence_scores'].append(case.get('confidence_score', 0))
+                scores[case['catalyst']].append(case.get('confidence_score', 0))
         
+        for catalyst, stats in catalysts.items():
+            stats['avg_confidence'] = sum(scores[catalyst]) / stats['count']
+            stats['confidence_scores'] = score_histogram(scores[catalyst])
         return dict(catalysts)
 
     def _get_political_distribution(self, results: List[Dict]) -> Dict:
@@ -158,18 +239,19 @@ class ReportGenerator:
         }
 
     def _get_engagement_metrics(self, results: List[Dict]) -> Dict:
-        """Analyze engagement metrics"""
-        engagement = {
-            'avg_engagement': sum(case.get('engagement_score', 0) for case in results) / len(results),
-            'by_type': defaultdict(list),
-            'by_channel': defaultdict(list)
-        }
+        """Analyze engagement metrics (per-group count, mean and percentiles)"""
+        by_type = defaultdict(list)
+        by_channel = defaultdict(list)
         
         for case in results:
-            engagement['by_type'][case.get('remorse_type', 'unknown')].append(case.get('engagement_score', 0))
-            engagement['by_channel'][case.get('channel', 'unknown')].append(case.get('engagement_score', 0))
+            by_type[case.get('remorse_type', 'unknown')].append(case.get('engagement_score', 0))
+            by_channel[case.get('channel', 'unknown')].append(case.get('engagement_score', 0))
         
-        return engagement
+        return {
+            'avg_engagement': sum(case.get('engagement_score', 0) for case in results) / len(results),
+            'by_type': engagement_summaries(by_type),
+            'by_channel': engagement_summaries(by_channel)
+        }
 
     def _get_edit_patterns(self, results: List[Dict]) -> Dict:
         """Analyze edit patterns"""
@@ -177,4 +259,23 @@ class ReportGenerator:
             'edit_rate': sum(1 for case in results if case.get('has_edit', False)) / len(results),
             'by_type': defaultdict(lambda: {'edited': 0, 'total': 0}),
             'by_channel': defaultdict(lambda: {'edited': 0, 'total': 0})
-        }
\ No newline at end of file
+        }
+
+
+def score_histogram(scores: Iterable[float]) -> Dict[float, int]:
+    """``{score: count}`` of ``scores`` in ascending score order, integral scores as ints"""
+    values, counts = np.unique(np.asarray(list(scores), dtype=float), return_counts=True)
+    return {
+        int(value) if value.is_integer() else value: count
+        for value, count in zip(values.tolist(), counts.tolist())
+    }
+
+
+def engagement_summaries(groups: Mapping[Any, Iterable[float]]) -> Dict[Any, Dict[str, float]]:
+    """
+    Summarize per-group engagement scores with a ``QuantileSketch`` each
+
+    Returns:
+    Dict of group -> ``QuantileSketch.summary()`` (count, mean, p50, p90, p99)
+    """
+    return {key: QuantileSketch().update(values).summary() for key, values in groups.items()}
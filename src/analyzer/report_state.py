@@ -0,0 +1,379 @@
+"""
+Mergeable partial aggregates for chunked and incremental reporting.
+
+``ReportState`` holds only counts, sums, per-group tallies and sketches, so
+its size is O(groups) rather than O(cases). States built from different chunks,
+workers or days are combined with ``merge`` (associative and commutative),
+saved to disk as JSON and turned into the ``ReportGenerator`` report format
+by ``finalize``.
+
+Alongside the exact tallies, each state carries fixed-memory sketches
+(see ``sketches``) for engagement quantiles, distinct comments, videos and
+commenters, and the most frequent catalysts and matched phrases; these are
+reported by ``sketch_summary``. The per-type and per-channel engagement
+percentiles of the finalized report come from the engagement sketches, and
+catalyst confidence scores are reported as ``{score: cases}`` histograms, so
+finalizing is O(groups) as well.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ._columns import ColumnGroups, grouped_arrays, nested_counts
+from .match_spans import MatchSpans
+from .report_generator import ReportGenerator
+from .sketches import DistinctCountSketch, HeavyHitterSketch, QuantileSketch
+
+STATE_VERSION = 3
+
+# Identity columns feeding the distinct-count sketches, in order of preference
+_DISTINCT_COLUMNS = {
+    'unique_comments': ['commentId'],
+    'unique_videos': ['videoId', 'source_file'],
+    'unique_commenters': ['authorChannelId', 'authorDisplayName']
+}
+
+# Top-level tallies; every leaf is a number and every inner node a dict
+_TALLIES = [
+    'totals',                 # total_comments, remorse_cases, engagement_sum, edit_count
+    'channel_totals',         # channel -> analyzed comments
+    'channels',               # channel -> remorse_count, confidence_sum
+    'months',                 # month -> count, types{}, catalysts{}
+    'types',                  # type -> count, confidence_sum, catalysts{}, political_distribution{}
+    'catalysts',              # catalyst -> count, remorse_types{}, confidence_scores{score: n}
+    'political',              # lean -> count
+    'political_by_channel'    # channel -> lean -> count
+]
+
+
+class ReportState:
+    """Associative partial aggregates of an analysis report"""
+
+    def __init__(self):
+        self.tallies: Dict[str, Dict] = {name: {} for name in _TALLIES}
+        self.sketches = _new_sketches()
+
+    @property
+    def total_comments(self) -> int:
+        return self.tallies['totals'].get('total_comments', 0)
+
+    @property
+    def remorse_cases(self) -> int:
+        return self.tallies['totals'].get('remorse_cases', 0)
+
+    def update(
+        self,
+        results: pd.DataFrame,
+        full_df: pd.DataFrame,
+        spans: Optional[MatchSpans] = None
+    ) -> 'ReportState':
+        """
+        Add one chunk of analysis results
+
+        Parameters:
+        results (pd.DataFrame): Results table of the chunk; rows without remorse are ignored
+        full_df (pd.DataFrame): The analyzed comments of the chunk (for per-channel totals)
+        spans (MatchSpans, optional): Match spans of the chunk, with rows indexing
+            ``full_df``; feeds the matched-phrase heavy hitters
+        """
+        chunk = ReportState()
+        chunk._add(chunk.tallies['totals'], 'total_comments', len(full_df))
+        for channel, count in full_df['channel'].value_counts(sort=False).items():
+            chunk._add(chunk.tallies['channel_totals'], channel, int(count))
+
+        for sketch_name, columns in _DISTINCT_COLUMNS.items():
+            column = next((column for column in columns if column in full_df.columns), None)
+            if column is not None:
+                chunk.sketches[sketch_name].update(full_df[column])
+
+        if spans is not None and len(spans):
+            texts = full_df['cleaned_text'].to_numpy(dtype=object)
+            chunk.sketches['top_phrases'].update(
+                texts[row][start:end] for row, start, end in zip(spans.rows, spans.starts, spans.ends)
+            )
+
+        if 'has_remorse' in results.columns:
+            results = results[results['has_remorse'].to_numpy(dtype=bool)]
+        if not results.empty:
+            chunk._add_cases(ColumnGroups(results.reset_index(drop=True)))
+
+        return self.merge(chunk)
+
+    def merge(self, other: 'ReportState') -> 'ReportState':
+        """Add the tallies of ``other`` into this state and return it"""
+        for name in _TALLIES:
+            _merge_counts(self.tallies[name], other.tallies[name])
+        for name, sketch in other.sketches.items():
+            if isinstance(sketch, dict):
+                for key, group_sketch in sketch.items():
+                    if key in self.sketches[name]:
+                        self.sketches[name][key].merge(group_sketch)
+                    else:
+                        self.sketches[name][key] = QuantileSketch.from_dict(group_sketch.to_dict())
+            else:
+                self.sketches[name].merge(sketch)
+        return self
+
+    def sketch_summary(self, quantiles: Sequence[float] = (0.5, 0.9, 0.99), top: int = 10) -> Dict:
+        """
+        Approximate statistics from the fixed-memory sketches
+
+        Returns:
+        Dict with engagement quantiles (overall, by type, by channel),
+        distinct-count estimates and the top catalysts and matched phrases,
+        each with its error bound
+        """
+        sk = self.sketches
+        return {
+            'engagement_quantiles': {
+                'relative_error': sk['engagement'].relative_accuracy,
+                'overall': sk['engagement'].quantiles(quantiles),
+                'by_type': {key: sketch.quantiles(quantiles) for key, sketch in sk['engagement_by_type'].items()},
+                'by_channel': {
+                    key: sketch.quantiles(quantiles) for key, sketch in sk['engagement_by_channel'].items()
+                }
+            },
+            'distinct_counts': {
+                'relative_error': sk['unique_comments'].relative_error,
+                **{name: sk[name].estimate() for name in _DISTINCT_COLUMNS}
+            },
+            'top_catalysts': {
+                'items': sk['top_catalysts'].top(top),
+                'max_undercount': sk['top_catalysts'].error_bound()
+            },
+            'top_phrases': {
+                'items': sk['top_phrases'].top(top),
+                'max_undercount': sk['top_phrases'].error_bound()
+            }
+        }
+
+    def finalize(self) -> Dict:
+        """Build the report in the ``ReportGenerator`` format"""
+        if not self.remorse_cases:
+            return {"error": "No bias remorse cases detected"}
+
+        t = self.tallies
+        cases = self.remorse_cases
+        report = {
+            'summary': {
+                'total_comments_analyzed': self.total_comments,
+                'remorse_cases': cases,
+                'remorse_rate': (cases / self.total_comments) * 100
+            },
+            'channel_analysis': {},
+            'temporal_analysis': {
+                month: {
+                    'count': stats['count'],
+                    'types': dict(stats.get('types', {})),
+                    'catalysts': dict(stats.get('catalysts', {}))
+                }
+                for month, stats in t['months'].items()
+            },
+            'remorse_types': {
+                'distribution': {rtype: stats['count'] for rtype, stats in t['types'].items()},
+                'details': {
+                    rtype: {
+                        'count': stats['count'],
+                        'avg_confidence': stats['confidence_sum'] / stats['count'],
+                        'catalysts': dict(stats.get('catalysts', {})),
+                        'political_distribution': dict(stats.get('political_distribution', {}))
+                    }
+                    for rtype, stats in t['types'].items()
+                }
+            },
+            'catalysts': {
+                catalyst: {
+                    'count': stats['count'],
+                    'remorse_types': dict(stats.get('remorse_types', {})),
+                    'avg_confidence': _histogram_sum(stats.get('confidence_scores', {})) / stats['count'],
+                    'confidence_scores': dict(sorted(stats.get('confidence_scores', {}).items()))
+                }
+                for catalyst, stats in t['catalysts'].items()
+            },
+            'political_distribution': {
+                'overall': dict(t['political']),
+                'by_channel': {channel: dict(leans) for channel, leans in t['political_by_channel'].items()}
+            },
+            'engagement_metrics': {
+                'avg_engagement': t['totals'].get('engagement_sum', 0) / cases,
+                'by_type': {rtype: sketch.summary() for rtype, sketch in self.sketches['engagement_by_type'].items()},
+                'by_channel': {
+                    channel: sketch.summary() for channel, sketch in self.sketches['engagement_by_channel'].items()
+                }
+            },
+            'edit_patterns': {
+                'edit_rate': t['totals'].get('edit_count', 0) / cases,
+                'by_type': {},
+                'by_channel': {}
+            }
+        }
+
+        for channel, stats in t['channels'].items():
+            total = t['channel_totals'].get(channel, 0)
+            report['channel_analysis'][channel] = {
+                'remorse_count': stats['remorse_count'],
+                'total_comments': total,
+                'remorse_rate': (stats['remorse_count'] / total * 100) if total > 0 else 0,
+                'avg_confidence': stats['confidence_sum'] / stats['remorse_count']
+            }
+
+        report['key_findings'] = ReportGenerator()._extract_key_findings(report)
+        return report
+
+    def save(self, path: Union[str, Path]):
+        """Serialize the state to a JSON file"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': STATE_VERSION,
+                'tallies': {name: _encode(self.tallies[name]) for name in _TALLIES},
+                'sketches': {
+                    name: (
+                        [[key, group_sketch.to_dict()] for key, group_sketch in sketch.items()]
+                        if isinstance(sketch, dict) else sketch.to_dict()
+                    )
+                    for name, sketch in self.sketches.items()
+                }
+            }, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ReportState':
+        """Load a state written by ``save``"""
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported report state version: {saved.get('version')}")
+        state = cls()
+        for name in _TALLIES:
+            state.tallies[name] = _decode(saved['tallies'].get(name, []))
+        for name, sketch in saved['sketches'].items():
+            if isinstance(state.sketches[name], dict):
+                state.sketches[name] = {key: QuantileSketch.from_dict(data) for key, data in sketch}
+            else:
+                state.sketches[name] = type(state.sketches[name]).from_dict(sketch)
+        return state
+
+    def _add_cases(self, groups: ColumnGroups):
+        """Tally the remorse cases of one chunk"""
+        t = self.tallies
+        self._add(t['totals'], 'remorse_cases', groups.n)
+        self._add(t['totals'], 'engagement_sum', groups.engagement.sum().item())
+        self._add(t['totals'], 'edit_count', int(groups.has_edit.sum()))
+
+        for column, tally, count_field in [
+            ('channel', 'channels', 'remorse_count'),
+            ('month', 'months', 'count'),
+            ('remorse_type', 'types', 'count'),
+            ('political_lean', 'political', None)
+        ]:
+            codes, keys = groups.key(column)
+            counts = np.bincount(codes, minlength=len(keys)).tolist()
+            confidence = np.bincount(codes, weights=groups.confidence, minlength=len(keys)).tolist()
+            for key, count, confidence_sum in zip(keys, counts, confidence):
+                if count_field is None:
+                    self._add(t[tally], key, count)
+                    continue
+                stats = t[tally].setdefault(key, {})
+                self._add(stats, count_field, count)
+                if tally in ('channels', 'types'):
+                    self._add(stats, 'confidence_sum', _as_number(confidence_sum))
+
+        mask = groups.has_catalyst
+        codes, catalysts = groups.key('catalyst', mask)
+        for catalyst, count in zip(catalysts, np.bincount(codes, minlength=len(catalysts)).tolist()):
+            self._add(t['catalysts'].setdefault(catalyst, {}), 'count', count)
+
+        nested = [
+            ('months', 'types', nested_counts(groups, 'month', 'remorse_type')),
+            ('months', 'catalysts', nested_counts(groups, 'month', 'catalyst', mask)),
+            ('types', 'catalysts', nested_counts(groups, 'remorse_type', 'catalyst', mask)),
+            ('types', 'political_distribution', nested_counts(
+                groups, 'remorse_type', 'political_lean', groups.has_political_lean
+            )),
+            ('catalysts', 'remorse_types', nested_counts(groups, 'catalyst', 'remorse_type', mask))
+        ]
+        for tally, field, counts in nested:
+            for outer, inner_counts in counts.items():
+                _merge_counts(t[tally].setdefault(outer, {}).setdefault(field, {}), inner_counts)
+
+        _merge_counts(t['political_by_channel'], nested_counts(groups, 'channel', 'political_lean'))
+        _merge_counts(t['catalysts'], {
+            catalyst: {'confidence_scores': scores}
+            for catalyst, scores in _value_histograms(groups, 'catalyst', groups.confidence, mask).items()
+        })
+
+        sk = self.sketches
+        sk['engagement'].update(groups.engagement)
+        for column, name in [('remorse_type', 'engagement_by_type'), ('channel', 'engagement_by_channel')]:
+            codes, keys = groups.key(column)
+            for key, values in zip(keys, grouped_arrays(codes, groups.engagement, len(keys))):
+                sk[name].setdefault(key, QuantileSketch()).update(values)
+        sk['top_catalysts'].update(groups.results['catalyst'].to_numpy(dtype=object)[mask])
+
+    @staticmethod
+    def _add(counter: Dict, key: Any, value):
+        counter[key] = counter.get(key, 0) + value
+
+
+def _new_sketches() -> Dict:
+    return {
+        'engagement': QuantileSketch(),
+        'engagement_by_type': {},
+        'engagement_by_channel': {},
+        'unique_comments': DistinctCountSketch(),
+        'unique_videos': DistinctCountSketch(),
+        'unique_commenters': DistinctCountSketch(),
+        'top_catalysts': HeavyHitterSketch(),
+        'top_phrases': HeavyHitterSketch()
+    }
+
+
+def _merge_counts(target: Dict, source: Dict):
+    """Recursively add the numeric leaves of ``source`` into ``target``"""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _merge_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def _value_histograms(groups: ColumnGroups, column: str, values: np.ndarray, mask: np.ndarray = None) -> Dict:
+    """Per-group ``{value: count}`` histograms of ``values``"""
+    codes, keys = groups.key(column, mask)
+    if mask is not None:
+        values = values[mask]
+    pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([codes, values]))
+    counts = np.bincount(pair_codes, minlength=len(pairs)).tolist()
+
+    histograms: Dict = {}
+    for (code, value), count in zip(pairs, counts):
+        histograms.setdefault(keys[code], {})[_as_number(value)] = count
+    return histograms
+
+
+def _histogram_sum(histogram: Dict) -> float:
+    """Sum of the values counted by a ``{value: count}`` histogram"""
+    return sum(value * count for value, count in histogram.items())
+
+
+def _as_number(value):
+    """Convert NumPy scalars (and integral floats) to plain ints or floats"""
+    value = value.item() if hasattr(value, 'item') else value
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def _encode(node):
+    """Encode nested tallies as ``[key, value]`` pairs so non-string keys survive JSON"""
+    if isinstance(node, dict):
+        return [[key, _encode(value)] for key, value in node.items()]
+    return node
+
+
+def _decode(node):
+    """Inverse of ``_encode``"""
+    if isinstance(node, list):
+        return {key: _decode(value) for key, value in node}
+    return node
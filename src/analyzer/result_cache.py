@@ -0,0 +1,169 @@
+"""
+On-disk cache of analysis results.
+
+Entries are keyed by a fingerprint of the analysis-ready data, the pattern
+definitions and the source of the code that produced them, so any change to
+the data, ``patterns.py`` or the analyzer invalidates them. Per-comment
+results and reports are cached under separate keys: a change to the report
+code only recomputes the report from the cached results table.
+
+Entries are pickles and the cache directory is trusted like any other local
+results folder. The least recently used entries are evicted once the cache
+exceeds ``max_bytes``.
+"""
+import hashlib
+import importlib.util
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterable, Optional, Union
+
+import pandas as pd
+
+# Analyzer modules whose source determines the per-comment results and the
+# report, by name: their files are hashed without importing them
+_ANALYZER_MODULES = ['batch_analyzer', 'patterns']
+_REPORT_MODULES = ['_columns', 'columnar_report', 'report_generator', 'sketches', 'time_index']
+# Modules a pickled ReportState is built from
+_STATE_MODULES = ['report_state', '_columns', 'columnar_report', 'report_generator', 'sketches', 'match_spans', 'time_index']
+
+
+class ResultCache:
+    """Size-bounded cache of results tables and reports"""
+
+    def __init__(self, cache_dir: Union[str, Path] = 'results/cache', max_bytes: int = 1 << 30):
+        """
+        Parameters:
+        cache_dir (str or Path): Directory holding the cache entries
+        max_bytes (int): Total size above which the least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def results_key(self, df: pd.DataFrame) -> str:
+        """Key of the per-comment results of ``df``"""
+        return _digest('results', fingerprint_frame(df), pattern_version(), _source_version(_ANALYZER_MODULES))
+
+    def files_key(self, paths: Iterable[Union[str, Path]], modules: Iterable = ()) -> str:
+        """
+        Key of results computed from input files, identified by path, size and mtime
+
+        Parameters:
+        paths: Input files
+        modules: Modules (or analyzer module names) besides the analyzer whose
+            source determines the result (e.g. preprocessing and aggregation code)
+        """
+        return _digest(
+            'files', fingerprint_files(paths), pattern_version(), _source_version([*_ANALYZER_MODULES, *modules])
+        )
+
+    def state_key(self, paths: Iterable[Union[str, Path]], modules: Iterable = ()) -> str:
+        """
+        Key of a ``ReportState`` aggregated from input files
+
+        Covers the aggregation and sketch code the state is built from, so a
+        change to any of it never returns a stale or mis-shaped state.
+
+        Parameters:
+        paths: Input files
+        modules: Further modules whose source determines the state (e.g. preprocessing)
+        """
+        return self.files_key(paths, [*_STATE_MODULES, *modules])
+
+    def report_key(self, results_key: str, sections: Optional[Iterable[str]] = None) -> str:
+        """Key of the report (or of its ``sections``) built from the results cached under ``results_key``"""
+        return _digest('report', results_key, _source_version(_REPORT_MODULES), repr(sections and list(sections)))
+
+    def load(self, key: str) -> Optional[Any]:
+        """Return the cached value of ``key``, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        return value
+
+    def store(self, key: str, value: Any):
+        """Cache ``value`` under ``key`` and evict old entries if the cache is too large"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def clear(self):
+        """Remove all cache entries"""
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink(missing_ok=True)
+
+    def size(self) -> int:
+        """Total size of the cache entries in bytes"""
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*.pkl'))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.pkl'
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in ``max_bytes``"""
+        entries = sorted(
+            ((path.stat().st_mtime, path.stat().st_size, path) for path in self.cache_dir.glob('*.pkl')),
+            key=lambda entry: entry[0]
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame's columns, dtypes and values (the index is ignored)"""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_files(paths: Iterable[Union[str, Path]]) -> str:
+    """Cheap fingerprint of input files from their paths, sizes and modification times"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(path).resolve() for path in paths):
+        stat = path.stat()
+        digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()
+
+
+def pattern_version() -> str:
+    """Hash of the pattern definitions used for matching"""
+    from . import patterns
+    return _digest(repr(patterns.PATTERN_REGISTRY), repr(patterns.REMORSE_TYPE_PATTERNS))
+
+
+def _source_path(module: Union[str, ModuleType]) -> str:
+    """Source file of a module, or of an analyzer module given by name (found without importing it)"""
+    if isinstance(module, ModuleType):
+        return module.__file__
+    return importlib.util.find_spec(f'{__package__}.{module}').origin
+
+
+def _source_version(modules) -> str:
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(Path(_source_path(module)).read_bytes())
+    return digest.hexdigest()
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()[:32]
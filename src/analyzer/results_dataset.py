@@ -0,0 +1,172 @@
+"""
+Partitioned Parquet dataset of per-comment results.
+
+``write_results_dataset`` adds a results table to a Hive-style directory
+tree ``<root>/channel=<channel>/month=<YYYY-MM>/part-<id>.parquet``, one
+part file per partition and call, so chunks can be added without rewriting
+earlier files. The part ID is a fingerprint of the table's comment IDs:
+writing the same comments again (a re-run, or a cached analysis) replaces
+their part files instead of duplicating the rows. The partition columns live in the directory names
+only, as in Hive, which lets pyarrow, DuckDB or Spark read the tree directly.
+
+``read_results_dataset`` prunes on the directory names before opening any
+file: a query for one channel and quarter reads only those partitions.
+Writing and reading need a Parquet engine (pyarrow).
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from ._columns import factorize
+from .report_export import require_parquet
+from .time_index import TimeIndex
+
+# Per-comment fields stored in the part files
+DATASET_COLUMNS = [
+    'comment_id',
+    'has_remorse',
+    'has_edit',
+    'confidence_score',
+    'previous_stance',
+    'catalyst',
+    'political_lean',
+    'remorse_type',
+    'timestamp'
+]
+
+PARTITION_COLUMNS = ('channel', 'month')
+
+# Directory name of partitions without a value (Hive convention)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+def _partition_name(value) -> str:
+    return NULL_PARTITION if value is None else quote(str(value), safe='')
+
+
+def _partition_value(name: str) -> Optional[str]:
+    return None if name == NULL_PARTITION else unquote(name)
+
+
+def partition_rows(
+    results: pd.DataFrame,
+    time_index: Optional[TimeIndex] = None
+) -> Iterator[Tuple[Optional[str], Optional[str], np.ndarray]]:
+    """
+    Group the rows of a results table by (channel, month)
+
+    Yields:
+    (channel, month, rows) with the row positions of each partition
+    """
+    if time_index is None:
+        time_index = TimeIndex(results['timestamp'])
+    channel_codes, channels = factorize(results['channel'].to_numpy(dtype=object))
+    month_codes, months = factorize(time_index.labels('month'))
+
+    partition = channel_codes * max(len(months), 1) + month_codes
+    order = np.argsort(partition, kind='stable')
+    bounds = np.flatnonzero(np.diff(partition[order])) + 1
+    for rows in np.split(order, bounds) if len(order) else []:
+        yield channels[channel_codes[rows[0]]], months[month_codes[rows[0]]], rows
+
+
+def write_results_dataset(
+    results: pd.DataFrame,
+    root: Union[str, Path],
+    time_index: Optional[TimeIndex] = None
+) -> List[Path]:
+    """
+    Add a per-comment results table to the dataset at ``root``
+
+    Writing a table with the same comment IDs again overwrites its part
+    files, so repeated writes of the same data do not duplicate rows.
+
+    Parameters:
+    results (pd.DataFrame): Results table as returned by ``analyze_frame``
+    root (str or Path): Dataset root directory
+    time_index (TimeIndex, optional): Index of the results' timestamps
+
+    Returns:
+    List[Path]: The part files written, one per (channel, month) partition
+    """
+    require_parquet('The results dataset')
+    table = results[[column for column in DATASET_COLUMNS if column in results.columns]].reset_index(drop=True)
+    root = Path(root)
+    part_name = f'part-{_part_id(table)}.parquet'
+    written = []
+    for channel, month, rows in partition_rows(results, time_index):
+        directory = root / f'channel={_partition_name(channel)}' / f'month={_partition_name(month)}'
+        directory.mkdir(parents=True, exist_ok=True)
+        # Write aside and rename, so readers never see a half-replaced part
+        partial = directory / f'{part_name}.partial'
+        table.iloc[rows].to_parquet(partial, index=False)
+        os.replace(partial, directory / part_name)
+        written.append(directory / part_name)
+    return written
+
+
+def _part_id(table: pd.DataFrame) -> str:
+    """Fingerprint of the comments in a results table (of all its columns without comment IDs)"""
+    key = table['comment_id'] if 'comment_id' in table.columns else table
+    return hashlib.sha1(pd.util.hash_pandas_object(key, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def list_partitions(root: Union[str, Path]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """``(channel, month)`` of every partition in the dataset"""
+    return [
+        (_partition_value(channel_dir.name.split('=', 1)[1]), _partition_value(month_dir.name.split('=', 1)[1]))
+        for channel_dir in sorted(Path(root).glob('channel=*'))
+        for month_dir in sorted(channel_dir.glob('month=*'))
+    ]
+
+
+def _month_selected(month: Optional[str], months) -> bool:
+    """Whether a month partition matches a list of months or an inclusive ``(first, last)`` range"""
+    if months is None:
+        return True
+    if isinstance(months, tuple) and len(months) == 2:
+        return month is not None and months[0] <= month <= months[1]
+    return month in months
+
+
+def read_results_dataset(
+    root: Union[str, Path],
+    channels: Optional[Iterable[str]] = None,
+    months: Optional[Union[Sequence[str], Tuple[str, str]]] = None,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Read the per-comment results of the selected partitions
+
+    Parameters:
+    root (str or Path): Dataset root directory
+    channels: Channels to read (all by default)
+    months: Months to read, either a list of ``YYYY-MM`` labels or an
+        inclusive ``(first, last)`` range such as ``('2021-07', '2021-09')``
+    columns: Stored columns to read (all by default); the partition
+        columns are always included
+
+    Returns:
+    pd.DataFrame with the stored columns plus ``channel`` and ``month``
+    """
+    require_parquet('The results dataset')
+    channels = None if channels is None else set(channels)
+    frames = []
+    for channel, month in list_partitions(root):
+        if (channels is not None and channel not in channels) or not _month_selected(month, months):
+            continue
+        directory = Path(root) / f'channel={_partition_name(channel)}' / f'month={_partition_name(month)}'
+        for path in sorted(directory.glob('*.parquet')):
+            frame = pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+            frame['channel'] = pd.Series([channel] * len(frame), dtype=object)
+            frame['month'] = pd.Series([month] * len(frame), dtype=object)
+            frames.append(frame)
+    if not frames:
+        stored = list(columns) if columns is not None else DATASET_COLUMNS
+        return pd.DataFrame(columns=[*stored, *PARTITION_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,160 @@
+"""
+Stratified reservoir sampling of remorse cases.
+
+``StratifiedReservoir`` keeps at most ``k`` cases per stratum (by default
+channel × remorse type × month) while results stream past, so sample output
+is representative of every stratum and needs O(k × strata) memory however
+many cases are found.
+
+Sampling is bottom-k: every case gets a pseudo-random priority derived from
+a hash of its comment ID and the seed, and each stratum keeps the ``k``
+cases with the smallest priorities. That is a uniform sample without
+replacement, and because priorities do not depend on arrival order,
+reservoirs of different chunks or workers merge into exactly the sample a
+single pass would have drawn. Case records are only built for cases that
+enter a reservoir.
+"""
+import bisect
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._columns import factorize
+from .case_writer import iter_case_batch
+from .match_spans import MatchSpans
+from .time_index import TimeIndex
+
+STRATA = ('channel', 'remorse_type', 'month')
+
+Stratum = Tuple
+
+
+def case_priorities(comment_ids: Sequence, seed: int) -> np.ndarray:
+    """Priorities in [0, 1) hashed from comment IDs, reproducible for a given seed"""
+    ids = pd.Series(comment_ids, dtype=object).astype(str).to_numpy(dtype=object)
+    hash_key = f'{seed & 0xFFFFFFFFFFFFFFFF:016x}'[:16]
+    hashes = pd.util.hash_array(ids, hash_key=hash_key)
+    return (hashes >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class StratifiedReservoir:
+    """Fixed-size uniform sample of remorse cases per stratum"""
+
+    def __init__(self, k: int = 5, seed: Optional[int] = None, strata: Sequence[str] = STRATA):
+        """
+        Parameters:
+        k (int): Maximum number of cases kept per stratum
+        seed (int, optional): Seed of the case priorities; a random seed is
+            drawn when omitted. Reservoirs are only mergeable with the same seed.
+        strata: Results columns defining a stratum; ``'month'``, ``'week'``
+            and ``'day'`` are derived from the timestamps
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.seed = int(np.random.default_rng().integers(1 << 63)) if seed is None else seed
+        self.strata = tuple(strata)
+        self.seen: Dict[Stratum, int] = {}
+        # Per stratum: priorities in ascending order and the matching records
+        self._priorities: Dict[Stratum, List[float]] = {}
+        self._records: Dict[Stratum, List[Dict]] = {}
+
+    def update(
+        self,
+        results: pd.DataFrame,
+        texts: Optional[Sequence[str]] = None,
+        spans: Optional[MatchSpans] = None,
+        time_index: Optional[TimeIndex] = None
+    ) -> 'StratifiedReservoir':
+        """
+        Offer the remorse cases of a per-comment results table
+
+        Parameters:
+        results (pd.DataFrame): Results table as returned by ``analyze_frame``
+        texts, spans: Comment texts and match spans of the same analysis,
+            included in the sampled records (see ``case_writer.iter_case_batch``)
+        time_index (TimeIndex, optional): Index of the results' timestamps
+        """
+        rows = np.flatnonzero(results['has_remorse'].to_numpy(dtype=bool))
+        if not len(rows):
+            return self
+        strata = self._stratum_keys(results, rows, time_index)
+        codes, keys = factorize(strata)
+        priorities = case_priorities(results['comment_id'].to_numpy(dtype=object)[rows], self.seed)
+
+        # Only cases below their stratum's current k-th priority can enter the sample
+        keep = np.zeros(len(rows), dtype=bool)
+        for code, key in enumerate(keys):
+            members = np.flatnonzero(codes == code)
+            self.seen[key] = self.seen.get(key, 0) + len(members)
+            current = self._priorities.get(key, [])
+            threshold = current[-1] if len(current) >= self.k else np.inf
+            candidates = members[priorities[members] < threshold]
+            keep[candidates[np.argsort(priorities[candidates], kind='stable')[:self.k]]] = True
+
+        selected = rows[keep]
+        subset = results.iloc[selected].reset_index(drop=True)
+        subset_texts = None
+        if texts is not None:
+            texts = texts.to_numpy(dtype=object) if hasattr(texts, 'to_numpy') else np.asarray(texts, dtype=object)
+            subset_texts = texts[selected]
+        subset_spans = None
+        if spans is not None:
+            subset_spans = spans.for_rows(selected)
+            subset_spans.rows = np.searchsorted(selected, subset_spans.rows)
+        records = iter_case_batch(subset, subset_texts, subset_spans)
+        for position, record in zip(np.flatnonzero(keep), records):
+            self._offer(keys[codes[position]], float(priorities[position]), record)
+        return self
+
+    def merge(self, other: 'StratifiedReservoir') -> 'StratifiedReservoir':
+        """Combine with a reservoir of other cases drawn with the same ``k``, seed and strata"""
+        if (other.k, other.seed, other.strata) != (self.k, self.seed, self.strata):
+            raise ValueError("Cannot merge reservoirs with different k, seed or strata")
+        for key, seen in other.seen.items():
+            self.seen[key] = self.seen.get(key, 0) + seen
+        for key, priorities in other._priorities.items():
+            for priority, record in zip(priorities, other._records[key]):
+                self._offer(key, priority, record)
+        return self
+
+    def samples(self) -> Dict[Stratum, List[Dict]]:
+        """Sampled records of every stratum"""
+        return {key: list(records) for key, records in self._records.items()}
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Sampled records with their stratum fields and stratum size, strata in sorted order"""
+        for key in sorted(self._records, key=lambda key: tuple('' if value is None else str(value) for value in key)):
+            stratum = dict(zip(self.strata, key))
+            for record in self._records[key]:
+                yield {**record, 'stratum': stratum, 'stratum_cases': self.seen[key]}
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def _offer(self, key: Stratum, priority: float, record: Dict):
+        priorities = self._priorities.setdefault(key, [])
+        records = self._records.setdefault(key, [])
+        if len(priorities) >= self.k and priority >= priorities[-1]:
+            return
+        position = bisect.bisect_left(priorities, priority)
+        priorities.insert(position, priority)
+        records.insert(position, record)
+        if len(priorities) > self.k:
+            priorities.pop()
+            records.pop()
+
+    def _stratum_keys(self, results: pd.DataFrame, rows: np.ndarray, time_index: Optional[TimeIndex]) -> np.ndarray:
+        """Stratum tuple of every case row"""
+        columns = []
+        for column in self.strata:
+            if column in ('day', 'week', 'month'):
+                if time_index is None:
+                    time_index = TimeIndex(results['timestamp'])
+                columns.append(time_index.labels(column)[rows])
+            else:
+                columns.append(results[column].to_numpy(dtype=object)[rows])
+        keys = np.empty(len(rows), dtype=object)
+        keys[:] = list(zip(*columns))
+        return keys
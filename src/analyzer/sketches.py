@@ -0,0 +1,262 @@
+"""
+Fixed-memory streaming sketches for report statistics.
+
+All sketches are updated with arrays (one call per chunk), merged across
+shards with ``merge`` and serialized with ``to_dict``/``from_dict``.
+
+- ``QuantileSketch``: log-bucketed quantile sketch (DDSketch). Every
+  quantile estimate is within a relative error ``relative_accuracy`` of the
+  true value, as long as no more than ``max_buckets`` buckets are needed
+  (about 1,000 buckets cover 1 to 10^9 at 1% accuracy); beyond that the
+  lowest buckets are collapsed and only the upper quantiles keep the bound.
+- ``DistinctCountSketch``: HyperLogLog with ``2**precision`` one-byte
+  registers; relative standard error ``1.04 / sqrt(2**precision)``
+  (1.6% at the default precision of 12, i.e. 4 KiB).
+- ``HeavyHitterSketch``: Misra-Gries summary with ``k`` counters. Reported
+  counts never exceed the true counts and undercount by at most
+  ``error_bound()`` <= N / (k + 1); every item occurring more than
+  N / (k + 1) times is guaranteed to be kept.
+"""
+import base64
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch for non-negative values"""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: Iterable[float]) -> 'QuantileSketch':
+        """Add values; missing values are ignored"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+        if (values < 0).any():
+            raise ValueError("QuantileSketch only accepts non-negative values")
+
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > 0]
+        self.zero_count += int(values.size - positive.size)
+        indices, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self._collapse()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Add the contents of ``other`` (which must use the same accuracy)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._collapse()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the nearest-rank ``q``-quantile (0 <= q <= 1), i.e. the
+        ``ceil(q * count)``-th smallest value; NaN if the sketch is empty
+        """
+        if not self.count:
+            return math.nan
+        rank = max(math.ceil(q * self.count) - 1, 0)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[float, float]:
+        return {q: self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+    def summary(self, qs: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[str, float]:
+        """Count, mean and the ``qs`` quantiles, keyed ``p50``, ``p90``, ..."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            **{f'p{q * 100:g}': self.quantile(q) for q in qs}
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'buckets': [[index, count] for index, count in sorted(self.buckets.items())],
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.buckets = {int(index): count for index, count in data['buckets']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.sum = data['sum']
+        sketch.min = data['min'] if data['min'] is not None else math.inf
+        sketch.max = data['max'] if data['max'] is not None else -math.inf
+        return sketch
+
+    def _collapse(self):
+        """Fold the lowest buckets together once ``max_buckets`` is exceeded"""
+        if len(self.buckets) <= self.max_buckets:
+            return
+        indices = sorted(self.buckets)
+        excess = indices[:len(indices) - self.max_buckets + 1]
+        folded = sum(self.buckets.pop(index) for index in excess)
+        self.buckets[excess[-1]] = folded
+
+
+class DistinctCountSketch:
+    """HyperLogLog distinct-count sketch"""
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: Iterable) -> 'DistinctCountSketch':
+        """Add values (hashable scalars); missing values are ignored"""
+        values = pd.Series(values, dtype=object) if not isinstance(values, pd.Series) else values
+        values = values.dropna()
+        if values.empty:
+            return self
+        hashes = pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+        p = np.uint64(self.precision)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << p
+        rank = np.minimum(64 - _bit_length(rest) + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'DistinctCountSketch') -> 'DistinctCountSketch':
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge distinct-count sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values added"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(float)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_dict(self) -> Dict:
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DistinctCountSketch':
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class HeavyHitterSketch:
+    """Misra-Gries heavy-hitter summary with ``k`` counters"""
+
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.counters: Dict = {}
+        self.total = 0
+
+    def update(self, items: Iterable) -> 'HeavyHitterSketch':
+        """Add items; missing values are ignored"""
+        counts = pd.Series(items, dtype=object).dropna().value_counts(sort=False)
+        self.total += int(counts.sum())
+        for item, count in counts.items():
+            item = item.item() if hasattr(item, 'item') else item
+            self.counters[item] = self.counters.get(item, 0) + int(count)
+        self._reduce()
+        return self
+
+    def merge(self, other: 'HeavyHitterSketch') -> 'HeavyHitterSketch':
+        self.total += other.total
+        for item, count in other.counters.items():
+            self.counters[item] = self.counters.get(item, 0) + count
+        self._reduce()
+        return self
+
+    def top(self, n: int = 10) -> List[Tuple]:
+        """The ``n`` most frequent items with their (lower-bound) counts"""
+        return sorted(self.counters.items(), key=lambda item: (-item[1], str(item[0])))[:n]
+
+    def error_bound(self) -> float:
+        """Maximum undercount of any reported count"""
+        return (self.total - sum(self.counters.values())) / (self.k + 1)
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'total': self.total, 'counters': [[item, count] for item, count in self.counters.items()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HeavyHitterSketch':
+        sketch = cls(data['k'])
+        sketch.total = data['total']
+        sketch.counters = {item: count for item, count in data['counters']}
+        return sketch
+
+    def _reduce(self):
+        """Keep at most ``k`` counters by subtracting the (k+1)-th largest count"""
+        if len(self.counters) <= self.k:
+            return
+        threshold = sorted(self.counters.values(), reverse=True)[self.k]
+        self.counters = {item: count - threshold for item, count in self.counters.items() if count > threshold}
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``int.bit_length`` for uint64 arrays"""
+    values = values.copy()
+    bits = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >> np.uint64(shift)
+        has_high = high != 0
+        bits += shift * has_high
+        values = np.where(has_high, high, values)
+    return bits + (values != 0)
@@ -1,159 +1,243 @@
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import numpy as np
+import pandas as pd
+
+from ._columns import arrays_by_key, factorize, truthy
+from .cooccurrence import HitMatrix
+from .sketches import QuantileSketch
+from .time_index import TimeIndex
+
+# Columns of the per-case frame the statistics are computed from
+CASE_COLUMNS = [
+    'timestamp', 'channel', 'remorse_type', 'intensity', 'political_lean',
+    'catalyst_type', 'severity', 'engagement', 'has_edit', 'secondary_types'
+]
+
+Cases = Union[List[Dict], pd.DataFrame]
 
 class StatisticalAnalyzer:
-    """Handles statistical analysis of results"""
+    """
+    Handles statistical analysis of results
+
+    Results are given either as a list of case dicts or as a case frame with
+    the ``CASE_COLUMNS`` (see ``to_case_frame``). Per-group intensities are
+    returned as typed NumPy arrays, per-group engagement as fixed-memory
+    ``QuantileSketch``es and summaries as DataFrames.
+    """
     
-    def analyze_by_channel(self, results: List[Dict], full_df) -> Dict:
+    def analyze_by_channel(self, results: Cases, full_df=None) -> Dict:
         """Analyze remorse patterns by channel"""
-        channel_stats = defaultdict(lambda: {
-            'count': 0,
-            'avg_intensity': 0.0,
-            'remorse_types': defaultdict(int)
-        })
-        
-        for result in results:
-            channel = result.get('channel', 'unknown')
-            channel_stats[channel]['count'] += 1
-            channel_stats[channel]['avg_intensity'] += result.get('intensity', 0)
-            channel_stats[channel]['remorse_types'][result.get('remorse_type', 'unknown')] += 1
+        cases = to_case_frame(results)
+        by_channel = cases.groupby('channel', sort=False, dropna=False)['intensity'].agg(['count', 'mean'])
+        remorse_types = _nested_label_counts(cases['channel'], cases['remorse_type'])
         
-        # Calculate averages
-        for channel in channel_stats:
-            if channel_stats[channel]['count'] > 0:
-                channel_stats[channel]['avg_intensity'] /= channel_stats[channel]['count']
-        
-        return dict(channel_stats)
-
-    def analyze_temporal_patterns(self, results: List[Dict]) -> Dict:
-        """Analyze temporal patterns in remorse expressions"""
-        temporal_stats = {
-            'hourly_distribution': defaultdict(int),
-            'daily_distribution': defaultdict(int),
-            'monthly_distribution': defaultdict(int),
-            'intensity_over_time': []
+        return {
+            channel: {
+                'count': int(stats['count']),
+                'avg_intensity': float(stats['mean']),
+                'remorse_types': remorse_types[channel]
+            }
+            for channel, stats in by_channel.iterrows()
         }
+
+    def analyze_temporal_patterns(self, results: Cases, time_index: Optional[TimeIndex] = None) -> Dict:
+        """
+        Analyze temporal patterns in remorse expressions
+
+        Parameters:
+        results: Remorse cases
+        time_index (TimeIndex, optional): Index of the cases' timestamps,
+            aligned with ``results``; built once from them when omitted
+
+        Returns:
+        Dict with hourly, daily and monthly counts and ``intensity_over_time``,
+        a DataFrame of (timestamp, count, intensity) with the number of cases
+        and their mean intensity per day, in day order
+        """
+        cases = to_case_frame(results)
+        if time_index is None:
+            time_index = TimeIndex(cases['timestamp'])
         
-        for result in results:
-            timestamp = result.get('timestamp')
-            if timestamp:
-                temporal_stats['hourly_distribution'][timestamp.hour] += 1
-                temporal_stats['daily_distribution'][timestamp.strftime('%A')] += 1
-                temporal_stats['monthly_distribution'][timestamp.strftime('%B')] += 1
-                temporal_stats['intensity_over_time'].append({
-                    'timestamp': timestamp,
-                    'intensity': result.get('intensity', 0)
-                })
-        
-        # Sort intensity_over_time by timestamp
-        temporal_stats['intensity_over_time'].sort(key=lambda x: x['timestamp'])
+        daily = pd.DataFrame({
+            'day': time_index.codes('day')[time_index.valid],
+            'intensity': cases['intensity'].to_numpy(dtype=float)[time_index.valid]
+        }).groupby('day')['intensity'].agg(['count', 'mean'])
         
-        return dict(temporal_stats)
-
-    def analyze_remorse_types(self, results: List[Dict]) -> Dict:
-        """Analyze distribution of remorse types"""
-        remorse_stats = {
-            'type_distribution': defaultdict(int),
-            'type_intensity': defaultdict(list),
-            'co_occurrence': defaultdict(lambda: defaultdict(int))
+        return {
+            'hourly_distribution': _label_counts(time_index.labels('hour')),
+            'daily_distribution': _label_counts(time_index.labels('weekday')),
+            'monthly_distribution': _label_counts(time_index.labels('month_name')),
+            'intensity_over_time': pd.DataFrame({
+                'timestamp': time_index.bucket_starts('day', daily.index.to_numpy()),
+                'count': daily['count'].to_numpy(),
+                'intensity': daily['mean'].to_numpy()
+            })
         }
+
+    def analyze_remorse_types(self, results: Cases, hits: Optional[HitMatrix] = None) -> Dict:
+        """
+        Analyze distribution of remorse types
+
+        Parameters:
+        results: Remorse cases
+        hits (HitMatrix, optional): Hit matrix aligned with ``results``; the
+            co-occurrence of each remorse type with its features, keyed by
+            ``(kind, feature)``, fills ``co_occurrence``. Without it, the
+            cases' ``secondary_types`` lists are used.
+        """
+        cases = to_case_frame(results)
+        type_intensity = arrays_by_key(cases['remorse_type'], cases['intensity'])
         
-        for result in results:
-            remorse_type = result.get('remorse_type', 'unknown')
-            intensity = result.get('intensity', 0)
-            
-            # Update type distribution
-            remorse_stats['type_distribution'][remorse_type] += 1
-            
-            # Update intensity distribution
-            remorse_stats['type_intensity'][remorse_type].append(intensity)
-            
-            # Analyze co-occurring types if present
-            secondary_types = result.get('secondary_types', [])
-            for secondary_type in secondary_types:
-                remorse_stats['co_occurrence'][remorse_type][secondary_type] += 1
-        
-        # Calculate average intensities
-        avg_intensities = {}
-        for rtype, intensities in remorse_stats['type_intensity'].items():
-            avg_intensities[rtype] = np.mean(intensities) if intensities else 0
-        remorse_stats['average_intensities'] = avg_intensities
+        type_matrix = HitMatrix.from_results(cases, kinds=['remorse_type'])
+        other = hits if hits is not None else _secondary_type_matrix(cases)
+        co_occurrence = defaultdict(lambda: defaultdict(int))
+        table = type_matrix.cooccurrence(other)
+        for (_, remorse_type), counts in table.iterrows():
+            for (kind, feature), count in counts[counts > 0].items():
+                co_occurrence[remorse_type][feature if kind == 'secondary_type' else (kind, feature)] = int(count)
         
-        return dict(remorse_stats)
+        return {
+            'type_distribution': _label_counts(cases['remorse_type'].to_numpy(dtype=object)),
+            'type_intensity': type_intensity,
+            'co_occurrence': co_occurrence,
+            'average_intensities': {
+                remorse_type: float(values.mean()) if len(values) else 0
+                for remorse_type, values in type_intensity.items()
+            }
+        }
 
-    def analyze_patterns(self, results: List[Dict]) -> Dict:
+    def analyze_patterns(self, results: Cases) -> Dict:
         """Comprehensive pattern analysis"""
+        cases = to_case_frame(results)
         analysis = {
-            'temporal': self.analyze_temporal_patterns(results),
+            'temporal': self.analyze_temporal_patterns(cases),
             'channel': self.analyze_by_channel(results),
-            'political': self._analyze_political_distribution(results),
-            'catalysts': self._analyze_catalysts(results),
-            'engagement': self._analyze_engagement(results)
+            'political': self._analyze_political_distribution(cases),
+            'catalysts': self._analyze_catalysts(cases),
+            'engagement': self._analyze_engagement(cases)
         }
         return analysis
 
-    def _analyze_political_distribution(self, results: List[Dict]) -> Dict:
+    def _analyze_political_distribution(self, results: Cases) -> Dict:
         """Analyze political leanings and their correlation with remorse"""
-        political_stats = {
-            'distribution': defaultdict(int),
-            'engagement_by_leaning': defaultdict(list),
-            'catalyst_correlation': defaultdict(lambda: defaultdict(int))
-        }
+        cases = to_case_frame(results)
+        leaning = cases[truthy(cases['political_lean'])]
+        with_catalyst = leaning[truthy(leaning['catalyst_type'])]
         
-        for result in results:
-            lean = result.get('political_lean')
-            if lean:
-                political_stats['distribution'][lean] += 1
-                political_stats['engagement_by_leaning'][lean].append(
-                    result['engagement_metrics']['likes'] + result['engagement_metrics']['replies']
-                )
-                if result.get('catalyst_details'):
-                    political_stats['catalyst_correlation'][lean][result['catalyst_details']['type']] += 1
-        
-        return dict(political_stats)
+        return {
+            'distribution': _label_counts(leaning['political_lean'].to_numpy(dtype=object)),
+            'engagement_by_leaning': _grouped_sketches(leaning['political_lean'], leaning['engagement']),
+            'engagement_summary': _summary(leaning['political_lean'], leaning['engagement']),
+            'catalyst_correlation': _nested_label_counts(with_catalyst['political_lean'], with_catalyst['catalyst_type'])
+        }
 
-    def _analyze_catalysts(self, results: List[Dict]) -> Dict:
+    def _analyze_catalysts(self, results: Cases) -> Dict:
         """Analyze catalyst patterns and their impact"""
-        catalyst_stats = {
-            'types': defaultdict(int),
-            'severity_distribution': defaultdict(int),
-            'impact_on_engagement': defaultdict(list)
-        }
+        cases = to_case_frame(results)
+        catalysts = cases[truthy(cases['catalyst_type'])]
         
-        for result in results:
-            if details := result.get('catalyst_details'):
-                catalyst_stats['types'][details['type']] += 1
-                catalyst_stats['severity_distribution'][details['severity']] += 1
-                catalyst_stats['impact_on_engagement'][details['type']].append(
-                    result['engagement_metrics']['likes'] + result['engagement_metrics']['replies']
-                )
-        
-        return dict(catalyst_stats)
+        return {
+            'types': _label_counts(catalysts['catalyst_type'].to_numpy(dtype=object)),
+            'severity_distribution': _label_counts(catalysts['severity'].to_numpy(dtype=object)),
+            'impact_on_engagement': _grouped_sketches(catalysts['catalyst_type'], catalysts['engagement']),
+            'engagement_summary': _summary(catalysts['catalyst_type'], catalysts['engagement'])
+        }
 
-    def _analyze_engagement(self, results: List[Dict]) -> Dict:
+    def _analyze_engagement(self, results: Cases) -> Dict:
         """Analyze engagement patterns"""
-        engagement_stats = {
+        cases = to_case_frame(results)
+        typed = cases[truthy(cases['remorse_type'])]
+        hours = TimeIndex(cases['timestamp']).labels('hour')
+        dated = ~pd.isna(hours)
+        
+        return {
             'edit_patterns': {
-                'edited_count': sum(1 for r in results if r.get('has_edit')),
-                'total_count': len(results)
+                'edited_count': int(cases['has_edit'].sum()),
+                'total_count': len(cases)
             },
-            'engagement_by_remorse_type': defaultdict(list),
-            'temporal_engagement': defaultdict(list)
+            'engagement_by_remorse_type': _grouped_sketches(typed['remorse_type'], typed['engagement']),
+            'engagement_summary': _summary(typed['remorse_type'], typed['engagement']),
+            # Engagement grouped by hour of day
+            'temporal_engagement': _grouped_sketches(hours[dated], cases['engagement'].to_numpy()[dated])
         }
-        
-        for result in results:
-            remorse_type = result.get('remorse_type')
-            if remorse_type:
-                engagement_stats['engagement_by_remorse_type'][remorse_type].append(
-                    result['engagement_metrics']['likes'] + result['engagement_metrics']['replies']
-                )
-            
-            # Group engagement by time periods
-            if timestamp := result.get('timestamp'):
-                hour = timestamp.hour
-                engagement_stats['temporal_engagement'][hour].append(
-                    result['engagement_metrics']['likes'] + result['engagement_metrics']['replies']
-                )
-        
-        return dict(engagement_stats)
\ No newline at end of file
+
+
+def to_case_frame(results: Cases) -> pd.DataFrame:
+    """
+    Convert case dicts to the columnar case frame (frames are returned as is)
+
+    Engagement is likes plus replies from ``engagement_metrics`` (0 when
+    absent); catalyst type and severity come from ``catalyst_details``.
+    """
+    if isinstance(results, pd.DataFrame):
+        return results
+    
+    columns = {column: [] for column in CASE_COLUMNS}
+    for result in results:
+        details = result.get('catalyst_details') or {}
+        metrics = result.get('engagement_metrics') or {}
+        columns['timestamp'].append(result.get('timestamp'))
+        columns['channel'].append(result.get('channel', 'unknown'))
+        columns['remorse_type'].append(result.get('remorse_type', 'unknown'))
+        columns['intensity'].append(result.get('intensity', 0))
+        columns['political_lean'].append(result.get('political_lean'))
+        columns['catalyst_type'].append(details.get('type'))
+        columns['severity'].append(details.get('severity'))
+        columns['engagement'].append(metrics.get('likes', 0) + metrics.get('replies', 0))
+        columns['has_edit'].append(bool(result.get('has_edit')))
+        columns['secondary_types'].append(list(result.get('secondary_types') or []))
+    
+    return pd.DataFrame({
+        'timestamp': pd.Series(columns['timestamp']),
+        'channel': pd.Series(columns['channel'], dtype=object),
+        'remorse_type': pd.Series(columns['remorse_type'], dtype=object),
+        'intensity': np.array(columns['intensity'], dtype=float),
+        'political_lean': pd.Series(columns['political_lean'], dtype=object),
+        'catalyst_type': pd.Series(columns['catalyst_type'], dtype=object),
+        'severity': pd.Series(columns['severity'], dtype=object),
+        'engagement': np.array(columns['engagement'], dtype=np.int64),
+        'has_edit': np.array(columns['has_edit'], dtype=bool),
+        'secondary_types': pd.Series(columns['secondary_types'], dtype=object)
+    })
+
+
+def _secondary_type_matrix(cases: pd.DataFrame) -> HitMatrix:
+    """Hit matrix of the cases' ``secondary_types`` lists"""
+    if 'secondary_types' not in cases.columns:
+        return HitMatrix(np.empty(0), np.empty(0), len(cases), [])
+    secondary = cases['secondary_types'].reset_index(drop=True).explode().dropna()
+    codes, uniques = pd.factorize(secondary.to_numpy(dtype=object))
+    return HitMatrix(secondary.index.to_numpy(), codes, len(cases), [('secondary_type', value) for value in uniques])
+
+
+def _label_counts(labels: np.ndarray) -> Dict:
+    """Count labels in first-appearance order, skipping missing ones"""
+    labels = labels[~pd.isna(labels)]
+    codes, uniques = pd.factorize(labels)
+    return defaultdict(int, zip(uniques.tolist(), np.bincount(codes, minlength=len(uniques)).tolist()))
+
+
+def _nested_label_counts(outer: pd.Series, inner: pd.Series) -> Dict:
+    """Count ``outer`` -> ``inner`` label pairs in first-appearance order (missing labels kept as None)"""
+    outer_codes, outer_keys = factorize(outer.to_numpy(dtype=object))
+    inner_codes, inner_keys = factorize(inner.to_numpy(dtype=object))
+    width = max(len(inner_keys), 1)
+    pair_codes, pairs = pd.factorize(outer_codes.astype(np.int64) * width + inner_codes)
+    
+    counts = defaultdict(lambda: defaultdict(int))
+    for pair, count in zip(pairs.tolist(), np.bincount(pair_codes, minlength=len(pairs)).tolist()):
+        outer_code, inner_code = divmod(pair, width)
+        counts[outer_keys[outer_code]][inner_keys[inner_code]] = count
+    return counts
+
+
+def _grouped_sketches(keys, values) -> Dict[object, QuantileSketch]:
+    """One ``QuantileSketch`` of ``values`` per key, in first-appearance order of the keys"""
+    return {key: QuantileSketch().update(group) for key, group in arrays_by_key(keys, values).items()}
+
+
+def _summary(keys, values) -> pd.DataFrame:
+    """Count, mean, median, standard deviation, min and max of ``values`` per key"""
+    frame = pd.DataFrame({'key': np.asarray(keys, dtype=object), 'value': np.asarray(values, dtype=float)})
+    return frame.groupby('key', sort=False)['value'].agg(['count', 'mean', 'median', 'std', 'min', 'max'])
@@ -0,0 +1,166 @@
+"""
+Integer time-bucket index over comment timestamps.
+
+``TimeIndex`` converts a timestamp column once into nanoseconds since the
+epoch and derives day, week and month bucket codes (plus hour of day and
+weekday) with integer arithmetic. Temporal sections group on these codes and
+format only the distinct buckets, instead of calling ``strftime`` per case.
+Timezone-aware timestamps are bucketed by their local wall-clock time, as
+``Timestamp.strftime`` does.
+"""
+import calendar
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+RESOLUTIONS = ('day', 'week', 'month')
+
+# Bucket code of rows without a timestamp
+MISSING = np.iinfo(np.int64).min
+
+_NS_PER_HOUR = 3_600 * 10**9
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+# 1970-01-01 was a Thursday; weeks start on Monday (weekday 0)
+_EPOCH_WEEKDAY = 3
+
+
+class TimeIndex:
+    """Day, week and month bucket codes of a timestamp column"""
+
+    def __init__(self, timestamps: Sequence):
+        """
+        Parameters:
+        timestamps: Timestamps aligned with the rows of the indexed frame;
+            missing values are allowed
+        """
+        timestamps = pd.Series(timestamps).reset_index(drop=True)
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.Series(pd.to_datetime(timestamps.to_numpy(dtype=object)))
+        if getattr(timestamps.dt, 'tz', None) is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+
+        self.valid = timestamps.notna().to_numpy()
+        self.ns = np.where(self.valid, timestamps.to_numpy('datetime64[ns]').view(np.int64), MISSING)
+        self._codes: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = 'publishedAt') -> 'TimeIndex':
+        """Index the ``column`` timestamps of an analysis-ready frame"""
+        return cls(df[column])
+
+    def __len__(self) -> int:
+        return len(self.ns)
+
+    def take(self, rows) -> 'TimeIndex':
+        """Return the index of a subset of rows (positions or boolean mask)"""
+        subset = object.__new__(TimeIndex)
+        subset.valid = self.valid[rows]
+        subset.ns = self.ns[rows]
+        subset._codes = {unit: codes[rows] for unit, codes in self._codes.items()}
+        return subset
+
+    def codes(self, unit: str) -> np.ndarray:
+        """
+        Integer bucket code of every row, ``MISSING`` where there is no timestamp
+
+        Parameters:
+        unit (str): ``'day'``, ``'week'`` or ``'month'`` (buckets since the
+            epoch), ``'hour'`` (0-23) or ``'weekday'`` (Monday = 0)
+        """
+        if unit not in self._codes:
+            days = self.ns // _NS_PER_DAY
+            if unit == 'day':
+                codes = days
+            elif unit == 'week':
+                codes = (days + _EPOCH_WEEKDAY) // 7
+            elif unit == 'month':
+                codes = self.ns.astype('datetime64[ns]').astype('datetime64[M]').view(np.int64)
+            elif unit == 'hour':
+                codes = (self.ns // _NS_PER_HOUR) % 24
+            elif unit == 'weekday':
+                codes = (days + _EPOCH_WEEKDAY) % 7
+            else:
+                raise ValueError(f"Unknown time unit: {unit}")
+            self._codes[unit] = np.where(self.valid, codes, MISSING)
+        return self._codes[unit]
+
+    def labels(self, unit: str) -> np.ndarray:
+        """
+        Label of every row's bucket, ``None`` where there is no timestamp
+
+        Days and weeks are labelled ``YYYY-MM-DD`` (weeks by their Monday),
+        months ``YYYY-MM``, hours as integers, weekdays by name and
+        ``'month_name'`` by month name. Each distinct bucket is formatted once.
+        """
+        codes = self.codes('month' if unit == 'month_name' else unit)
+        labels = np.full(len(codes), None, dtype=object)
+        uniques, inverse = np.unique(codes[self.valid], return_inverse=True)
+        labels[self.valid] = self._format(unit, uniques)[inverse]
+        return labels
+
+    def bucket_starts(self, resolution: str, codes: np.ndarray) -> pd.DatetimeIndex:
+        """Start timestamps of the given day, week or month bucket codes"""
+        codes = np.asarray(codes, dtype=np.int64)
+        if resolution == 'day':
+            return pd.DatetimeIndex(codes.astype('datetime64[D]'))
+        if resolution == 'week':
+            return pd.DatetimeIndex((codes * 7 - _EPOCH_WEEKDAY).astype('datetime64[D]'))
+        if resolution == 'month':
+            return pd.DatetimeIndex(codes.astype('datetime64[M]').astype('datetime64[D]'))
+        raise ValueError(f"Unknown resolution: {resolution}")
+
+    def counts(self, resolution: str = 'month', mask: Optional[np.ndarray] = None) -> pd.Series:
+        """
+        Number of (masked) rows per bucket over the contiguous bucket range
+
+        Returns:
+        pd.Series indexed by bucket start, empty buckets included as 0
+        """
+        codes = self.codes(resolution)
+        selected = self.valid if mask is None else self.valid & np.asarray(mask, dtype=bool)
+        if not self.valid.any():
+            return pd.Series([], index=pd.DatetimeIndex([]), dtype=np.int64)
+        first, last = codes[self.valid].min(), codes[self.valid].max()
+        counts = np.bincount(codes[selected] - first, minlength=last - first + 1)
+        return pd.Series(counts, index=self.bucket_starts(resolution, np.arange(first, last + 1)))
+
+    def rolling_rate(self, flags: Sequence[bool], resolution: str = 'week', window: int = 4) -> pd.DataFrame:
+        """
+        Remorse rate per bucket and over a trailing window of buckets
+
+        Parameters:
+        flags: Per-row boolean (e.g. the ``has_remorse`` column)
+        resolution (str): Bucket size, ``'day'``, ``'week'`` or ``'month'``
+        window (int): Number of buckets in the trailing window
+
+        Returns:
+        DataFrame indexed by bucket start with comments, remorse_cases,
+        remorse_rate and rolling_rate (cases / comments in the window, in %)
+        """
+        comments = self.counts(resolution)
+        cases = self.counts(resolution, np.asarray(flags, dtype=bool))
+        window_comments = comments.rolling(window, min_periods=1).sum()
+        window_cases = cases.rolling(window, min_periods=1).sum()
+        return pd.DataFrame({
+            'comments': comments,
+            'remorse_cases': cases,
+            'remorse_rate': (cases / comments.where(comments > 0)) * 100,
+            'rolling_rate': (window_cases / window_comments.where(window_comments > 0)) * 100
+        })
+
+    @staticmethod
+    def _format(unit: str, codes: np.ndarray) -> np.ndarray:
+        if unit == 'day':
+            labels = np.datetime_as_string(codes.astype('datetime64[D]'))
+        elif unit == 'week':
+            labels = np.datetime_as_string((codes * 7 - _EPOCH_WEEKDAY).astype('datetime64[D]'))
+        elif unit == 'month':
+            labels = [f'{code // 12 + 1970:04d}-{code % 12 + 1:02d}' for code in codes.tolist()]
+        elif unit == 'month_name':
+            labels = [calendar.month_name[code % 12 + 1] for code in codes.tolist()]
+        elif unit == 'weekday':
+            labels = [calendar.day_name[code] for code in codes.tolist()]
+        else:
+            labels = codes.tolist()
+        return np.array(labels, dtype=object)
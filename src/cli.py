@@ -0,0 +1,208 @@
+"""
+Command line entry point (``vaccine-bias-remorse``).
+
+Runs the staged ``AnalysisPipeline`` end to end over the CSV files of the
+selected channels and writes the requested outputs, so throughput settings
+(workers, chunk size, memory budget) can be tuned per host without editing
+code.
+"""
+import argparse
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .utils.logging_config import setup_logging
+from .utils.profiling import StageProfiler, stage_table
+
+# The pipeline (and with it pandas) is imported in ``main`` so ``--help`` starts instantly
+
+DEFAULT_CHANNELS = ['CNN', 'FoxNews', 'MSNBC']
+
+# Same as ``pipeline.REPORT_FORMATS``, repeated to build the parser without importing the pipeline
+REPORT_FORMATS = ('state', 'json', 'parquet', 'text')
+
+# Outputs besides the report files
+EXTRA_FORMATS = ('samples', 'dataset')
+
+# Patterns listed in the printed pattern profile
+PATTERN_TABLE_ROWS = 25
+
+# Rough in-memory size of a parsed row relative to its CSV line length
+_ROW_MEMORY_FACTOR = 4
+
+_SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte size such as ``512M`` or ``2GB``"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', text, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {text}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='vaccine-bias-remorse',
+        description="Detect and report vaccine bias remorse in YouTube comment CSV files"
+    )
+    parser.add_argument('data_root', nargs='?', default='DSCI789_data',
+                        help="Folder holding one subfolder of CSV files per channel (default: DSCI789_data)")
+    parser.add_argument('--channels', nargs='+', default=DEFAULT_CHANNELS, metavar='CHANNEL',
+                        help="Channel subfolders to analyze (default: %(default)s); 'all' reads every CSV")
+    parser.add_argument('--output-dir', default='results',
+                        help="Directory receiving the outputs (default: results)")
+    parser.add_argument('--formats', nargs='+', default=['json', 'text'],
+                        choices=[*REPORT_FORMATS, *EXTRA_FORMATS], metavar='FORMAT',
+                        help="Outputs to write: report files (state, json, parquet, text), "
+                             "remorse case samples (samples) and the per-comment dataset (dataset); "
+                             "default: json text")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="Analysis processes; 0 analyzes in the main process (default: 2)")
+    parser.add_argument('--reader-threads', type=int, default=2,
+                        help="Threads parsing CSV files (default: 2)")
+    parser.add_argument('--chunk-size', type=int, default=50_000,
+                        help="Maximum rows per analysis chunk (default: 50000)")
+    parser.add_argument('--queue-size', type=int, default=4,
+                        help="Chunks buffered between stages (default: 4)")
+    parser.add_argument('--memory-limit', type=parse_size, default=None, metavar='SIZE',
+                        help="Approximate budget for rows held in flight, e.g. 2G; lowers the chunk size to fit")
+    parser.add_argument('--cache-dir', default='results/cache',
+                        help="Directory of the analysis result cache (default: results/cache)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always re-run the analysis instead of reusing cached results")
+    parser.add_argument('--samples-per-stratum', type=int, default=None, metavar='K',
+                        help="Write at most K sample cases per channel, remorse type and month")
+    parser.add_argument('--samples-seed', type=int, default=None,
+                        help="Seed of the stratified samples")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile every stage with cProfile and save the statistics to the output directory")
+    parser.add_argument('--profile-patterns', action='store_true',
+                        help="Rank every compiled pattern by evaluation time, with its hits and the share "
+                             "of comments it made positive")
+    parser.add_argument('--pattern-order', default=None, metavar='PATH',
+                        help="JSON file the learned pattern evaluation order is loaded from and saved to")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also record each stage's peak Python allocation with tracemalloc (slower)")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Logging level (default: INFO)")
+    return parser
+
+
+def find_csv_files(data_root: Path, channels: List[str]) -> List[Path]:
+    """
+    CSV files of the selected channels
+
+    Each channel is read from ``data_root/<channel>`` (recursively) when that
+    folder exists, otherwise from the files under ``data_root`` whose path
+    contains the channel name (case-insensitive).
+    """
+    if not data_root.exists():
+        raise FileNotFoundError(f"Data folder not found: {data_root}")
+    all_files = sorted(data_root.glob('**/*.csv'))
+    if any(channel.lower() == 'all' for channel in channels):
+        return all_files
+
+    selected: Dict[Path, None] = {}
+    for channel in channels:
+        folder = data_root / channel
+        if folder.is_dir():
+            files = sorted(folder.glob('**/*.csv'))
+        else:
+            files = [path for path in all_files if channel.lower() in str(path.relative_to(data_root)).lower()]
+        if not files:
+            logging.getLogger(__name__).warning(f"No CSV files found for channel {channel}")
+        selected.update(dict.fromkeys(files))
+    return list(selected)
+
+
+def fit_chunk_size(chunk_size: int, memory_limit: int, chunks_in_flight: int, sample_file: Path) -> int:
+    """Largest chunk size (at most ``chunk_size``) whose in-flight chunks fit in ``memory_limit``"""
+    with open(sample_file, 'rb') as f:
+        head = f.read(1 << 16)
+    line_bytes = len(head) / max(head.count(b'\n'), 1)
+    row_bytes = max(line_bytes * _ROW_MEMORY_FACTOR, 1)
+    return max(1, min(chunk_size, int(memory_limit // (chunks_in_flight * row_bytes))))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    output_dir = Path(args.output_dir)
+    logger = setup_logging(str(output_dir), level=getattr(logging, args.log_level))
+
+    csv_files = find_csv_files(Path(args.data_root), args.channels)
+    if not csv_files:
+        logger.error(f"No CSV files found in {args.data_root} for channels {args.channels}")
+        return 1
+    logger.info(f"Analyzing {len(csv_files)} CSV files")
+
+    chunk_size = args.chunk_size
+    if args.memory_limit:
+        # Chunks queued for and held by the workers, plus those queued for the sink
+        chunks_in_flight = 2 * args.queue_size + max(1, args.workers) * 2
+        chunk_size = fit_chunk_size(chunk_size, args.memory_limit, chunks_in_flight, csv_files[0])
+        logger.info(f"Chunk size {chunk_size:,} rows for a memory limit of {args.memory_limit:,} bytes")
+
+    from .pipeline import AnalysisPipeline
+
+    formats = set(args.formats)
+    pipeline = AnalysisPipeline(
+        str(args.data_root),
+        workers=args.workers,
+        reader_threads=args.reader_threads,
+        chunk_size=chunk_size,
+        queue_size=args.queue_size,
+        results_dir=str(output_dir),
+        samples_path=str(output_dir / 'remorse_samples.jsonl') if 'samples' in formats else None,
+        results_dataset=str(output_dir / 'comments') if 'dataset' in formats else None,
+        samples_per_stratum=args.samples_per_stratum,
+        samples_seed=args.samples_seed,
+        report_formats=formats & set(REPORT_FORMATS),
+        cache_dir=None if args.no_cache else args.cache_dir,
+        trace_memory=args.trace_memory,
+        cprofile_stages=args.profile,
+        profile_patterns=args.profile_patterns,
+        pattern_order_path=args.pattern_order
+    )
+
+    report = pipeline.run(csv_files)
+    print_summary(report, pipeline.metrics(), pipeline.profiler if args.profile else None)
+    if pipeline.pattern_profile is not None:
+        print(f"\nPattern profile (top {PATTERN_TABLE_ROWS} by time; all patterns in the metrics file):")
+        print(pipeline.pattern_profile.table(limit=PATTERN_TABLE_ROWS))
+    return 0
+
+
+def print_summary(report: Dict, metrics: Dict, profiler: Optional[StageProfiler] = None):
+    """Print the headline numbers, stage throughput, the step table and (when profiling) the slowest step's top functions"""
+    summary = report.get('summary')
+    print()
+    if summary:
+        print(f"Total comments analyzed: {summary['total_comments_analyzed']:,}")
+        print(f"Remorse cases identified: {summary['remorse_cases']:,}")
+        print(f"Remorse rate: {summary['remorse_rate']:.2f}%")
+    else:
+        print(report.get('error', "No report produced"))
+
+    print(f"\n{'stage':<10}{'chunks':>8}{'rows in':>12}{'rows out':>12}{'rows/s':>12}{'max queue':>11}")
+    for stage in metrics['stages']:
+        print(
+            f"{stage['stage']:<10}{stage['chunks']:>8,}{stage['rows_in']:>12,}{stage['rows_out']:>12,}"
+            f"{stage['rows_per_second']:>12,.0f}{stage['max_queue_depth']:>11}"
+        )
+    print(f"Elapsed: {metrics['elapsed_seconds']:.2f}s")
+
+    if metrics.get('profile'):
+        print()
+        print(stage_table(metrics['profile']))
+
+    if profiler and profiler.profiles:
+        slowest = max(profiler.profiles, key=lambda name: profiler.stages[name]['seconds'])
+        print(f"\nTop functions of the {slowest} step:")
+        profiler.profile_stats(slowest, stream=sys.stdout).sort_stats('cumulative').print_stats(20)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
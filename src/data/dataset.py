@@ -1,13 +1,19 @@
+import numpy as np
 import pandas as pd
 import csv
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
+from types import SimpleNamespace
 import re
 from typing import Dict, List, Optional, Tuple
 import logging
 import csv
 
+# Columns looked up by get_channel_data and get_video_data
+GROUP_COLUMNS = ('source_file', 'videoId')
+
 class VaccinationCommentDataset:
     def __init__(self, data_folder: str):
         """
@@ -19,12 +25,14 @@ class VaccinationCommentDataset:
         self.data_folder = Path(data_folder)
         self.raw_data: Optional[pd.DataFrame] = None
         self.processed_data: Optional[pd.DataFrame] = None
+        # (processed_data, processed_data sorted by publishedAt) for temporal splits
+        self._time_sorted: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None
+        # Group indexes over the time-sorted data, by column
+        self._group_indexes: Dict[str, '_GroupIndex'] = {}
+        # Optional stage profiler (utils.profiling.StageProfiler) timing the preprocessing steps
+        self.profiler = None
         
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        # Handlers are configured once by the entry point (utils.logging_config.setup_logging)
         self.logger = logging.getLogger(__name__)
         
         # Keywords for vaccination-related content filtering
@@ -108,16 +116,24 @@ class VaccinationCommentDataset:
         try:
             df = self.raw_data.copy()
             
-            # Convert timestamps to datetime
-            for col in ['publishedAt', 'updatedAt']:
-                df[col] = pd.to_datetime(df[col], format='ISO8601', errors='coerce')
-            
-            # Drop rows where datetime conversion failed
-            df = df.dropna(subset=['publishedAt', 'updatedAt'])
+            with self._stage('parse_timestamps', len(df)) as stage:
+                # Convert timestamps to datetime
+                for col in ['publishedAt', 'updatedAt']:
+                    df[col] = pd.to_datetime(df[col], format='ISO8601', errors='coerce')
+                
+                # Drop rows where datetime conversion failed
+                df = df.dropna(subset=['publishedAt', 'updatedAt'])
+                
+                # Keep comments in publication order so temporal splits are contiguous slices
+                df = df.sort_values('publishedAt', kind='stable')
+                stage.rows_out = len(df)
             
             # Clean text and identify vaccine-related comments
-            df['cleaned_text'] = df['text'].apply(self._clean_text)
-            df['is_vaccine_related'] = df['cleaned_text'].apply(self._is_vaccine_related)
+            with self._stage('clean_text', len(df)):
+                df['cleaned_text'] = df['text'].apply(self._clean_text)
+            with self._stage('vaccine_filter', len(df)) as stage:
+                df['is_vaccine_related'] = df['cleaned_text'].apply(self._is_vaccine_related)
+                stage.rows_out = int(df['is_vaccine_related'].sum())
             
             # Convert numeric columns
             df['likeCount'] = pd.to_numeric(df['likeCount'], errors='coerce')
@@ -126,12 +142,20 @@ class VaccinationCommentDataset:
             # Convert boolean columns
             df['isPublic'] = df['isPublic'].astype(bool)
             
+            # The data is in publication order already: index its groups for the lookups
+            self._index_groups(df)
             return df
 
         except Exception as e:
             self.logger.error(f"Error in preprocess_data: {str(e)}")
             raise
 
+    def _stage(self, name: str, rows_in: int):
+        """Profiler stage context (a no-op without a profiler); set ``rows_out`` on the yielded handle"""
+        if self.profiler is None:
+            return nullcontext(SimpleNamespace(rows_out=rows_in))
+        return self.profiler.stage(name, rows_in)
+
     def get_vaccination_comments(self) -> pd.DataFrame:
         """
         Return only vaccination-related comments
@@ -154,29 +178,96 @@ class VaccinationCommentDataset:
         if self.processed_data is None:
             raise ValueError("No processed data available. Call preprocess_data() first.")
         
+        # Each range is a contiguous slice of the time-sorted data (a copy-on-write view)
+        data = self._get_time_sorted()
+        published = data['publishedAt']
+        starts = published.searchsorted([start for start, _ in date_ranges], side='left')
+        ends = published.searchsorted([end for _, end in date_ranges], side='left')
+        
         splits = {}
-        for i, (start_date, end_date) in enumerate(date_ranges):
+        for i, (start, end) in enumerate(zip(starts, ends)):
             period_name = f"period_{i+1}"
-            mask = (
-                (self.processed_data['publishedAt'] >= start_date) & 
-                (self.processed_data['publishedAt'] < end_date)
-            )
-            splits[period_name] = self.processed_data[mask].copy()
+            splits[period_name] = data.iloc[start:max(start, end)]
             
         return splits
 
-    def get_channel_data(self, channel_name: str) -> pd.DataFrame:
+    def _get_time_sorted(self) -> pd.DataFrame:
+        """
+        Return processed_data ordered by publishedAt (missing timestamps last)
+        
+        The order is computed once per processed_data object; data produced by
+        preprocess_data is already sorted and is returned as is.
+        """
+        if self._time_sorted is None or self._time_sorted[0] is not self.processed_data:
+            data = self.processed_data
+            if not data['publishedAt'].is_monotonic_increasing:
+                data = data.sort_values('publishedAt', kind='stable', na_position='last')
+            self._time_sorted = (self.processed_data, data)
+            self._group_indexes = {}
+        return self._time_sorted[1]
+
+    def _index_groups(self, data: pd.DataFrame):
+        """Cache publication-ordered ``data`` as the time-sorted frame and index its GROUP_COLUMNS"""
+        self._time_sorted = (data, data)
+        self._group_indexes = {
+            column: _GroupIndex(data[column]) for column in GROUP_COLUMNS if column in data.columns
+        }
+
+    def _get_group_index(self, column: str) -> '_GroupIndex':
+        """
+        Return the group index of ``column`` over the time-sorted data
+        
+        Indexes built by preprocess_data are reused while processed_data is
+        the frame it returned; other data is indexed on first lookup.
+        """
+        data = self._get_time_sorted()
+        if column not in self._group_indexes:
+            self._group_indexes[column] = _GroupIndex(data[column])
+        return self._group_indexes[column]
+
+    def _take_groups(self, positions: np.ndarray, date_range: Optional[Tuple[str, str]]) -> pd.DataFrame:
+        """Rows at ``positions`` of the time-sorted data, optionally within ``[start, end)``"""
+        data = self._get_time_sorted()
+        if date_range is not None:
+            # Positions are ascending, so their timestamps are sorted as well
+            published = data['publishedAt'].iloc[positions].reset_index(drop=True)
+            start, end = published.searchsorted(list(date_range), side='left')
+            positions = positions[start:max(start, end)]
+        return data.iloc[positions]
+
+    def get_channel_data(self, channel_name: str, date_range: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
         """
         Get comments from a specific channel
+        
+        Parameters:
+        channel_name (str): Case-insensitive pattern matched against the source file names
+        date_range: Optional (start_date, end_date) tuple restricting the comments to that period
+        
+        Returns:
+        The channel's comments in publication order
         """
         if self.processed_data is None:
             raise ValueError("No processed data available. Call preprocess_data() first.")
             
-        # Extract channel name from source file or other metadata
-        # Adjust this based on how channel information is stored in your files
-        return self.processed_data[
-            self.processed_data['source_file'].str.contains(channel_name, case=False)
-        ].copy()
+        # Match the channel against each distinct source file once, then gather their rows
+        pattern = re.compile(channel_name, re.IGNORECASE)
+        positions = self._get_group_index('source_file').matching(lambda source: bool(pattern.search(str(source))))
+        return self._take_groups(positions, date_range)
+
+    def get_video_data(self, video_id: str, date_range: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+        """
+        Get comments on a specific video
+        
+        Parameters:
+        video_id (str): Value of the videoId column
+        date_range: Optional (start_date, end_date) tuple restricting the comments to that period
+        """
+        if self.processed_data is None:
+            raise ValueError("No processed data available. Call preprocess_data() first.")
+        if 'videoId' not in self.processed_data.columns:
+            raise ValueError("Processed data has no videoId column")
+        
+        return self._take_groups(self._get_group_index('videoId').positions(video_id), date_range)
 
     def _clean_text(self, text: str) -> str:
         """
@@ -243,10 +334,36 @@ class VaccinationCommentDataset:
             'days_between_edit',
             'likeCount',
             'totalReplyCount'
+        ] + [
+            # Identity columns kept (when present) for distinct video/commenter counts
+            column for column in ['videoId', 'authorChannelId', 'authorDisplayName', 'source_file']
+            if column in analysis_df.columns
         ]].copy()
         
         return final_df
 
+class _GroupIndex:
+    """Row positions of every distinct value of a column"""
+    
+    def __init__(self, values: pd.Series):
+        codes, keys = pd.factorize(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        # Missing values (code -1) sort first and are left out
+        order = np.argsort(codes, kind='stable')[len(codes) - int(counts.sum()):]
+        self.keys = list(keys)
+        self._positions = dict(zip(self.keys, np.split(order, np.cumsum(counts)[:-1]))) if self.keys else {}
+    
+    def positions(self, key) -> np.ndarray:
+        """Ascending row positions of ``key`` (empty if absent)"""
+        return self._positions.get(key, np.empty(0, dtype=np.intp))
+    
+    def matching(self, predicate) -> np.ndarray:
+        """Ascending row positions of all keys for which ``predicate(key)`` is true"""
+        groups = [self._positions[key] for key in self.keys if predicate(key)]
+        if not groups:
+            return np.empty(0, dtype=np.intp)
+        return groups[0] if len(groups) == 1 else np.sort(np.concatenate(groups))
+
 def create_dataset(data_folder: str) -> VaccinationCommentDataset:
     """
     Helper function to create and initialize dataset
@@ -0,0 +1,599 @@
+"""
+Staged analysis pipeline that overlaps CSV reading, preprocessing/analysis
+and aggregation.
+
+Reader threads parse CSV files into row chunks and push them onto a bounded
+queue, so at most ``queue_size + max_in_flight`` chunks are held in memory.
+A process pool runs ``preprocess_data`` plus comment analysis on each chunk,
+and a sink thread merges the per-chunk partial aggregates (``ReportState``)
+into the final report and writes the optional per-chunk outputs.
+"""
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from .analyzer.bias_remorse import VaccineBiasRemorseAnalyzer, save_formatted_results
+from .analyzer.case_writer import JsonlCaseWriter, iter_case_batch
+from .analyzer.match_spans import MatchSpanRecorder
+from .analyzer.pattern_order import AdaptivePatternOrder
+from .analyzer.pattern_profile import PatternProfile
+from .analyzer.report_export import export_report, parquet_available, require_parquet
+from .analyzer.report_state import ReportState
+from .analyzer.result_cache import ResultCache
+from .analyzer.results_dataset import write_results_dataset
+from .analyzer.sampling import StratifiedReservoir
+from .data import dataset as dataset_module
+from .data.dataset import VaccinationCommentDataset
+from .utils.profiling import StageProfiler
+
+_SENTINEL = object()
+
+# Files written for the report when a results directory is set
+REPORT_FORMATS = ('state', 'json', 'parquet', 'text')
+
+# Analyzer instance reused by every chunk handled in the same process
+_worker_analyzer: Optional[VaccineBiasRemorseAnalyzer] = None
+
+
+class StageMetrics:
+    """Throughput and queue-depth counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.chunks = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.busy_seconds = 0.0
+        self.queue_samples = 0
+        self.queue_depth_total = 0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def record(self, rows_in: int, rows_out: int, seconds: float):
+        """Record one processed chunk"""
+        with self._lock:
+            self.chunks += 1
+            self.rows_in += rows_in
+            self.rows_out += rows_out
+            self.busy_seconds += seconds
+
+    def sample_queue(self, depth: int):
+        """Record the depth of the stage's input queue"""
+        with self._lock:
+            self.queue_samples += 1
+            self.queue_depth_total += depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def as_dict(self) -> Dict:
+        """Return the metrics as a plain dictionary"""
+        return {
+            'stage': self.name,
+            'chunks': self.chunks,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'busy_seconds': self.busy_seconds,
+            'rows_per_second': self.rows_in / self.busy_seconds if self.busy_seconds > 0 else 0.0,
+            'avg_queue_depth': (
+                self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+            ),
+            'max_queue_depth': self.max_queue_depth
+        }
+
+
+def _get_worker_analyzer(pattern_order_path: Optional[str] = None) -> VaccineBiasRemorseAnalyzer:
+    """Return the analyzer of the current process, creating it on first use (or for a new order path)"""
+    global _worker_analyzer
+    order_path = Path(pattern_order_path) if pattern_order_path else None
+    if _worker_analyzer is None or _worker_analyzer.pattern_order.path != order_path:
+        _worker_analyzer = VaccineBiasRemorseAnalyzer(pattern_order_path=pattern_order_path)
+    return _worker_analyzer
+
+
+def process_chunk(
+    chunk: pd.DataFrame,
+    data_folder: str,
+    with_cases: bool = False,
+    results_dataset: Optional[str] = None,
+    samples_per_stratum: Optional[int] = None,
+    samples_seed: Optional[int] = None,
+    profile: Optional[Dict] = None,
+    profile_patterns: bool = False,
+    pattern_order_path: Optional[str] = None
+) -> Dict:
+    """
+    Preprocess and analyze one chunk of raw comment rows
+
+    Parameters:
+    chunk (pd.DataFrame): Raw rows as returned by ``load_data``
+    data_folder (str): Data folder the chunk was read from
+    with_cases (bool): Also return the records of the chunk's remorse cases
+        (see ``case_writer.iter_case_batch``)
+    results_dataset (str, optional): Root of the partitioned Parquet dataset
+        the chunk's per-comment results are appended to
+    samples_per_stratum (int, optional): With ``with_cases``, return a
+        ``StratifiedReservoir`` of the chunk's cases (``'reservoir'``)
+        instead of every case record
+    samples_seed (int, optional): Seed of the reservoir; must be the same for all chunks
+    profile (Dict, optional): ``StageProfiler`` options; the chunk's stage
+        measurements are returned as ``'profile'``
+    profile_patterns (bool): Also return the chunk's ``PatternProfile``
+        (``'pattern_profile'``)
+    pattern_order_path (str, optional): Saved pattern order the process's
+        analyzer starts from; the statistics recorded on the chunk are
+        returned as ``'pattern_order'``
+
+    Returns:
+    Dict with row counts and the chunk's partial report aggregates
+    """
+    profiler = StageProfiler(**(profile or {}))
+    dataset = VaccinationCommentDataset(data_folder)
+    dataset.profiler = profiler
+    dataset.raw_data = chunk
+    dataset.processed_data = dataset.preprocess_data()
+    with profiler.stage('prepare', len(dataset.processed_data)) as stage:
+        analysis_df = dataset.get_analysis_ready_data()
+        stage.rows_out = len(analysis_df)
+
+    spans = MatchSpanRecorder()
+    batch_analyzer = _get_worker_analyzer(pattern_order_path).batch_analyzer
+    pattern_profile = batch_analyzer.pattern_profile = PatternProfile() if profile_patterns else None
+    order_snapshot = batch_analyzer.pattern_order.snapshot() if pattern_order_path else None
+    with profiler.stage('pattern_scan', len(analysis_df)) as stage:
+        try:
+            results_table = batch_analyzer.analyze_frame(analysis_df, spans=spans)
+        finally:
+            # The analyzer is shared by every chunk of the process
+            batch_analyzer.pattern_profile = None
+        match_spans = spans.to_spans()
+        remorse_cases = int(results_table['has_remorse'].sum())
+        stage.rows_out = remorse_cases
+
+    with profiler.stage('aggregate', len(results_table)):
+        state = ReportState().update(results_table, analysis_df, match_spans)
+    chunk_result = {
+        'rows_in': len(chunk),
+        'rows_out': len(analysis_df),
+        'remorse_cases': remorse_cases,
+        'state': state,
+        'profile': profiler
+    }
+    if pattern_profile is not None:
+        chunk_result['pattern_profile'] = pattern_profile
+    if order_snapshot is not None:
+        chunk_result['pattern_order'] = batch_analyzer.pattern_order.since(order_snapshot)
+    if results_dataset:
+        write_results_dataset(results_table, results_dataset)
+    if with_cases and samples_per_stratum:
+        chunk_result['reservoir'] = StratifiedReservoir(samples_per_stratum, samples_seed).update(
+            results_table, analysis_df['cleaned_text'], match_spans
+        )
+    elif with_cases:
+        chunk_result['cases'] = list(iter_case_batch(results_table, analysis_df['cleaned_text'], match_spans))
+    return chunk_result
+
+
+class AnalysisPipeline:
+    """Runs loading, analysis and aggregation as concurrent bounded stages"""
+
+    def __init__(
+        self,
+        data_folder: str,
+        workers: int = 2,
+        reader_threads: int = 2,
+        chunk_size: int = 50_000,
+        queue_size: int = 4,
+        results_dir: Optional[str] = None,
+        samples_path: Optional[str] = None,
+        samples_compression: Optional[str] = 'gzip',
+        samples_max_bytes: Optional[int] = 64 << 20,
+        results_dataset: Optional[str] = None,
+        samples_per_stratum: Optional[int] = None,
+        samples_seed: Optional[int] = None,
+        report_formats: Optional[Iterable[str]] = None,
+        cache_dir: Optional[str] = None,
+        trace_memory: bool = False,
+        cprofile_stages: bool = False,
+        profile_patterns: bool = False,
+        pattern_order_path: Optional[str] = None
+    ):
+        """
+        Parameters:
+        data_folder (str): Folder searched recursively for CSV files
+        workers (int): Size of the analysis process pool; 0 analyzes chunks
+            in the calling thread
+        reader_threads (int): Number of threads parsing CSV files
+        chunk_size (int): Maximum number of rows per chunk
+        queue_size (int): Capacity of the reader and sink queues
+        results_dir (str, optional): Directory the formatted report is written to
+        samples_path (str, optional): Base path of the JSON Lines remorse
+            sample output (see ``JsonlCaseWriter``); no samples are written when omitted
+        samples_compression (str, optional): None, ``'gzip'`` or ``'zstd'``
+        samples_max_bytes (int, optional): Size at which sample files are rotated
+        results_dataset (str, optional): Root of the partitioned Parquet
+            dataset receiving every analyzed comment's results; requires pyarrow
+        samples_per_stratum (int, optional): Write a reservoir sample of at
+            most this many cases per channel × remorse type × month instead
+            of every case (see ``sampling.StratifiedReservoir``)
+        samples_seed (int, optional): Seed of the stratified sample
+        report_formats: Report files written to ``results_dir`` (see
+            ``REPORT_FORMATS``); by default the state, JSON and text files,
+            plus Parquet tables when pyarrow is installed
+        cache_dir (str, optional): Directory of a result cache keyed by the
+            input files' paths, sizes and modification times; a hit skips
+            reading and analysis. Not used when samples, a results dataset
+            or pattern profiling are requested, as those need the full pass.
+        trace_memory (bool): Also record each stage's peak traced Python
+            allocation with ``tracemalloc`` (slower)
+        cprofile_stages (bool): Record a cProfile of every stage; the
+            statistics are saved to ``results_dir/profile_<timestamp>/``
+        profile_patterns (bool): Record the evaluation time, hits and decided
+            comments of every compiled pattern (see ``PatternProfile``)
+        pattern_order_path (str, optional): JSON file the learned pattern
+            evaluation order is loaded from by every worker and saved to at
+            the end of each analyzed run (see ``AdaptivePatternOrder``)
+        """
+        self.data_folder = Path(data_folder)
+        self.workers = workers
+        self.reader_threads = max(1, reader_threads)
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.max_in_flight = max(1, workers) * 2
+        self.results_dir = results_dir
+        self.samples_path = samples_path
+        self.samples_compression = samples_compression
+        self.samples_max_bytes = samples_max_bytes
+        self.results_dataset = results_dataset
+        self.samples_per_stratum = samples_per_stratum
+        # One seed for every chunk so the chunk reservoirs merge into a single sample
+        self.samples_seed = StratifiedReservoir(seed=samples_seed).seed
+        self.sample_reservoir = None
+        if results_dataset:
+            require_parquet('The results dataset')
+        if report_formats is None:
+            report_formats = ['state', 'json', 'text'] + (['parquet'] if parquet_available() else [])
+        self.report_formats = set(report_formats)
+        unknown = self.report_formats - set(REPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown report formats: {sorted(unknown)}")
+        if 'parquet' in self.report_formats:
+            require_parquet()
+        self.result_cache = ResultCache(cache_dir) if cache_dir else None
+        self.logger = logging.getLogger(__name__)
+        self.stage_metrics = {
+            'read': StageMetrics('read'),
+            'analyze': StageMetrics('analyze'),
+            'sink': StageMetrics('sink')
+        }
+        self.trace_memory = trace_memory
+        self.cprofile_stages = cprofile_stages
+        self.profiler = StageProfiler(trace_memory, cprofile_stages)
+        self.profile_patterns = profile_patterns
+        self.pattern_profile = PatternProfile() if profile_patterns else None
+        self.pattern_order_path = pattern_order_path
+        self.pattern_order = None
+        self.started_at = None
+
+    def run(self, csv_files: Optional[Iterable[Path]] = None) -> Dict:
+        """
+        Run the pipeline over ``csv_files`` (default: every CSV in the data folder)
+
+        Returns:
+        Dict: Analysis report in the ``ReportGenerator`` format
+        """
+        if csv_files is None:
+            if not self.data_folder.exists():
+                raise FileNotFoundError(f"Data folder not found: {self.data_folder}")
+            csv_files = sorted(self.data_folder.glob('**/*.csv'))
+        csv_files = list(csv_files)
+        if not csv_files:
+            raise FileNotFoundError(f"No CSV files found in {self.data_folder} or its subdirectories")
+
+        start = time.perf_counter()
+        self.started_at = datetime.now()
+        self.profiler = StageProfiler(self.trace_memory, self.cprofile_stages)
+        self.pattern_profile = PatternProfile() if self.profile_patterns else None
+        self.pattern_order = AdaptivePatternOrder(self.pattern_order_path) if self.pattern_order_path else None
+        cache_key = None
+        if self.result_cache and not (self.samples_path or self.results_dataset or self.profile_patterns):
+            cache_key = self.result_cache.state_key(csv_files, [sys.modules[__name__], dataset_module])
+            cached_state = self.result_cache.load(cache_key)
+            if cached_state is not None:
+                self.logger.info("Using cached pipeline results")
+                report = self._finalize(cached_state)
+                self.elapsed_seconds = time.perf_counter() - start
+                self._save_metrics()
+                return report
+
+        chunk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        result_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        file_queue: queue.Queue = queue.Queue()
+        for csv_file in csv_files:
+            file_queue.put(csv_file)
+
+        stop = threading.Event()
+        readers = [
+            threading.Thread(target=self._read_files, args=(file_queue, chunk_queue, stop), daemon=True)
+            for _ in range(self.reader_threads)
+        ]
+        state = ReportState()
+        writer = (
+            JsonlCaseWriter(self.samples_path, self.samples_compression, self.samples_max_bytes)
+            if self.samples_path else None
+        )
+        if writer is not None and self.samples_per_stratum:
+            self.sample_reservoir = StratifiedReservoir(self.samples_per_stratum, self.samples_seed)
+        self._sink_error = None
+        sink = threading.Thread(target=self._sink, args=(result_queue, state, writer, stop), daemon=True)
+
+        for reader in readers:
+            reader.start()
+        sink.start()
+        try:
+            self._dispatch(chunk_queue, result_queue, len(readers), stop)
+        finally:
+            # Release readers blocked on a full queue if dispatching failed
+            stop.set()
+            # A failed sink no longer drains its queue
+            while sink.is_alive():
+                try:
+                    result_queue.put(_SENTINEL, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            sink.join()
+            for reader in readers:
+                reader.join()
+            if writer is not None:
+                if self.sample_reservoir is not None and self._sink_error is None:
+                    writer.write_many(self.sample_reservoir.iter_records())
+                writer.close()
+                self.logger.info(f"Saved {writer.records_written} remorse samples to {len(writer.paths)} file(s)")
+        if self._sink_error is not None:
+            raise self._sink_error
+
+        if cache_key:
+            self.result_cache.store(cache_key, state)
+        if self.pattern_order is not None:
+            self.pattern_order.save()
+        report = self._finalize(state)
+        self.elapsed_seconds = time.perf_counter() - start
+        self.logger.info(f"Pipeline finished in {self.elapsed_seconds:.2f}s")
+        for stage in self.metrics()['stages']:
+            self.logger.info(
+                f"Stage {stage['stage']}: {stage['rows_in']:,} rows in, "
+                f"{stage['rows_out']:,} rows out, {stage['rows_per_second']:,.0f} rows/s, "
+                f"max queue depth {stage['max_queue_depth']}"
+            )
+        self._save_metrics()
+        return report
+
+    def metrics(self) -> Dict:
+        """
+        Return the metrics of the last run: per-stage throughput and queue
+        depth of the pipeline stages (``'stages'``) and the finer-grained
+        step measurements of ``StageProfiler.to_dict`` (``'profile'``) and,
+        with pattern profiling, the ranked pattern records (``'patterns'``)
+        """
+        metrics = {
+            'elapsed_seconds': getattr(self, 'elapsed_seconds', 0.0),
+            'stages': [stage.as_dict() for stage in self.stage_metrics.values()],
+            'profile': self.profiler.to_dict()
+        }
+        if self.pattern_profile is not None:
+            metrics['patterns'] = self.pattern_profile.to_records()
+        return metrics
+
+    def _save_metrics(self):
+        """Log the step table and write the run's metrics (and stage profiles) to the results directory"""
+        self.logger.info(f"Step profile:\n{self.profiler.summary_table()}")
+        if self.pattern_profile is not None:
+            self.logger.info(f"Pattern profile:\n{self.pattern_profile.table()}")
+        if not self.results_dir:
+            return
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        Path(self.results_dir).mkdir(parents=True, exist_ok=True)
+        metrics_file = Path(self.results_dir) / f'metrics_{timestamp}.json'
+        with open(metrics_file, 'w', encoding='utf-8') as f:
+            json.dump(self.metrics(), f, indent=2)
+        self.logger.info(f"Saved run metrics to {metrics_file}")
+        if self.profiler.profiles:
+            profile_dir = Path(self.results_dir) / f'profile_{timestamp}'
+            self.profiler.dump_profiles(profile_dir)
+            self.logger.info(f"Saved stage profiles to {profile_dir}")
+
+    def _read_files(self, file_queue: queue.Queue, chunk_queue: queue.Queue, stop: threading.Event):
+        """Reader stage: parse CSV files and enqueue row chunks"""
+        loader = VaccinationCommentDataset(str(self.data_folder))
+        metrics = self.stage_metrics['read']
+        try:
+            while not stop.is_set():
+                try:
+                    csv_file = file_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                started = time.perf_counter()
+                try:
+                    with self.profiler.stage('csv_parse') as stage:
+                        df = loader.load_data(str(csv_file))
+                        stage.rows_in = stage.rows_out = len(df)
+                except Exception as e:
+                    self.logger.error(f"Failed to load {csv_file}: {str(e)}")
+                    continue
+                metrics.record(len(df), len(df), time.perf_counter() - started)
+
+                if df.empty:
+                    self.logger.warning(f"Empty dataframe from file: {csv_file}")
+                    continue
+                for offset in range(0, len(df), self.chunk_size):
+                    # Blocks while the queue is full, throttling the readers
+                    if not self._put(chunk_queue, df.iloc[offset:offset + self.chunk_size], stop):
+                        return
+                    metrics.sample_queue(chunk_queue.qsize())
+        finally:
+            self._put(chunk_queue, _SENTINEL, stop)
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """Put ``item`` on a bounded queue, giving up once ``stop`` is set"""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event):
+        """Take the next item from a queue, or None once ``stop`` is set"""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _dispatch(self, chunk_queue: queue.Queue, result_queue: queue.Queue, n_readers: int, stop: threading.Event):
+        """CPU stage: hand chunks to the process pool with a bounded number in flight; returns early on ``stop``"""
+        metrics = self.stage_metrics['analyze']
+        if self.workers <= 0:
+            finished_readers = 0
+            while finished_readers < n_readers:
+                chunk = self._get(chunk_queue, stop)
+                if chunk is None:
+                    return
+                metrics.sample_queue(chunk_queue.qsize())
+                if chunk is _SENTINEL:
+                    finished_readers += 1
+                    continue
+                started = time.perf_counter()
+                chunk_result = process_chunk(chunk, *self._chunk_args())
+                metrics.record(chunk_result['rows_in'], chunk_result['rows_out'], time.perf_counter() - started)
+                if not self._put(result_queue, chunk_result, stop):
+                    return
+            return
+
+        in_flight: Dict[Future, float] = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            finished_readers = 0
+            while finished_readers < n_readers or in_flight:
+                # Keep the pool busy, but never hold more than max_in_flight chunks
+                if finished_readers < n_readers and len(in_flight) < self.max_in_flight:
+                    chunk = self._get(chunk_queue, stop)
+                    if chunk is None:
+                        break
+                    metrics.sample_queue(chunk_queue.qsize())
+                    if chunk is _SENTINEL:
+                        finished_readers += 1
+                    else:
+                        future = executor.submit(process_chunk, chunk, *self._chunk_args())
+                        in_flight[future] = time.perf_counter()
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    submitted = in_flight.pop(future)
+                    chunk_result = future.result()
+                    metrics.record(
+                        chunk_result['rows_in'], chunk_result['rows_out'], time.perf_counter() - submitted
+                    )
+                    if not self._put(result_queue, chunk_result, stop):
+                        break
+                if stop.is_set():
+                    break
+            # Do not start chunks nobody will merge
+            for future in in_flight:
+                future.cancel()
+
+    def _chunk_args(self) -> tuple:
+        """Arguments of ``process_chunk`` following the chunk"""
+        return (
+            str(self.data_folder), bool(self.samples_path), self.results_dataset,
+            self.samples_per_stratum, self.samples_seed, self.profiler.options(), self.profile_patterns,
+            self.pattern_order_path
+        )
+
+    def _sink(
+        self,
+        result_queue: queue.Queue,
+        state: ReportState,
+        writer: Optional[JsonlCaseWriter] = None,
+        stop: Optional[threading.Event] = None
+    ):
+        """Sink stage: merge the partial aggregates of each chunk into the run state"""
+        try:
+            self._merge_results(result_queue, state, writer)
+        except BaseException as error:
+            # Stop the other stages; run() re-raises the error
+            self._sink_error = error
+            if stop is not None:
+                stop.set()
+
+    def _merge_results(self, result_queue: queue.Queue, state: ReportState, writer: Optional[JsonlCaseWriter]):
+        """Merge chunk results until the sentinel arrives"""
+        metrics = self.stage_metrics['sink']
+        while True:
+            chunk_result = result_queue.get()
+            metrics.sample_queue(result_queue.qsize())
+            if chunk_result is _SENTINEL:
+                break
+            started = time.perf_counter()
+            self.profiler.merge(chunk_result['profile'])
+            if 'pattern_profile' in chunk_result:
+                self.pattern_profile.merge(chunk_result['pattern_profile'])
+            if 'pattern_order' in chunk_result:
+                self.pattern_order.merge(chunk_result['pattern_order'])
+            with self.profiler.stage('merge', chunk_result['rows_out']):
+                state.merge(chunk_result['state'])
+                if 'reservoir' in chunk_result:
+                    self.sample_reservoir.merge(chunk_result['reservoir'])
+                elif writer is not None:
+                    writer.write_many(chunk_result['cases'])
+            metrics.record(chunk_result['rows_out'], chunk_result['remorse_cases'], time.perf_counter() - started)
+
+    def _finalize(self, state: ReportState) -> Dict:
+        """Build the report from the merged run state and write it"""
+        self.report_state = state
+        with self.profiler.stage('report', state.total_comments):
+            report = state.finalize()
+
+        if self.results_dir:
+            with self.profiler.stage('write_report', state.total_comments):
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                formats = self.report_formats
+                if 'state' in formats:
+                    state.save(Path(self.results_dir) / f'report_state_{timestamp}.json')
+                if 'json' in formats or 'parquet' in formats:
+                    # Typed export for downstream jobs
+                    export_report(
+                        report, Path(self.results_dir) / f'report_{timestamp}', tables='parquet' in formats,
+                        metadata={'stages': self.metrics()['stages']}
+                    )
+                if 'text' in formats and 'key_findings' in report:
+                    results_file = save_formatted_results(report, self.results_dir, self.started_at)
+                    self.logger.info(f"Saved formatted results to {results_file}")
+        return report
+
+
+def run_pipeline(data_folder: str, **kwargs) -> Dict:
+    """
+    Helper function to run the staged pipeline over a data folder
+
+    Parameters:
+    data_folder (str): Path to folder containing CSV files
+    **kwargs: Passed through to ``AnalysisPipeline``
+
+    Returns:
+    Dict: Analysis report
+    """
+    return AnalysisPipeline(data_folder, **kwargs).run()
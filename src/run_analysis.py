@@ -1,18 +1,21 @@
+import argparse
 import pandas as pd
-from analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+if __package__:
+    from .analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+    from .data.dataset import VaccinationCommentDataset
+    from .utils.logging_config import setup_logging as configure_logging
+else:
+    # Run as a script from the source folder
+    from analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+    from data.dataset import VaccinationCommentDataset
+    from utils.logging_config import setup_logging as configure_logging
 import logging
 from pathlib import Path
+from typing import List, Optional
 
 def setup_logging():
-    """Configure logging settings"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('analysis.log'),
-            logging.StreamHandler()
-        ]
-    )
+    """Configure logging settings (queued console and ``analysis.log`` output; safe to call repeatedly)"""
+    configure_logging(log_file='analysis.log')
     return logging.getLogger(__name__)
 
 def load_dataset(folder_path: Path) -> dict[str, pd.DataFrame]:
@@ -82,13 +85,24 @@ def load_dataset(folder_path: Path) -> dict[str, pd.DataFrame]:
         logger.error(f"Error loading datasets: {str(e)}")
         raise
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Vaccine bias remorse analysis")
+    parser.add_argument('--cache-dir', default='results/cache',
+                        help="Directory of the analysis result cache (default: results/cache)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always re-run the analysis instead of reusing cached results")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    
     # Setup logging
     logger = setup_logging()
     
     try:
         # Initialize analyzer
-        analyzer = VaccineBiasRemorseAnalyzer()
+        analyzer = VaccineBiasRemorseAnalyzer(cache_dir=None if args.no_cache else args.cache_dir)
         
         # Load datasets from each channel
         data_path = Path("DSCI789_data")
@@ -98,8 +112,18 @@ def main():
         for channel, df in channel_data.items():
             logger.info(f"Starting analysis for {channel}...")
             
-            df['channel'] = channel
-            results = analyzer.analyze_dataset(df)
+            # The analyzer expects analysis-ready comments (cleaned text, vaccine-related only)
+            dataset = VaccinationCommentDataset(str(data_path))
+            dataset.raw_data = df
+            dataset.processed_data = dataset.preprocess_data()
+            analysis_df = dataset.get_analysis_ready_data()
+            if analysis_df.empty:
+                logger.warning(f"No vaccine-related comments found for {channel}")
+                continue
+            
+            analysis_df['channel'] = channel
+            # Only the printed sections are computed
+            results = analyzer.analyze_dataset(analysis_df, sections=['summary', 'temporal_analysis', 'key_findings'])
             
             # Print ALL analysis results
             print(f"\nDetailed Analysis Results - {channel}")
@@ -115,11 +139,12 @@ def main():
             # Print temporal analysis
             print("\nTemporal Analysis:")
             print("-" * 20)
+            # Monthly remorse cases with their type and catalyst breakdown
             for period, stats in results['temporal_analysis'].items():
                 print(f"\nPeriod: {period}")
-                print(f"Total comments: {stats.get('total_comments', 'N/A'):,}")
-                print(f"Remorse cases: {stats.get('remorse_cases', 'N/A'):,}")
-                print(f"Remorse rate: {stats.get('remorse_rate', 'N/A'):.2f}%" if isinstance(stats.get('remorse_rate'), (int, float)) else "Remorse rate: N/A")
+                print(f"Remorse cases: {stats.get('count', 0):,}")
+                print(f"Remorse types: {dict(stats.get('types', {}))}")
+                print(f"Catalysts: {dict(stats.get('catalysts', {}))}")
             
             # Print sentiment analysis
             print("\nSentiment Analysis:")
@@ -1,47 +1,151 @@
+"""
+Central, idempotent logging setup.
+
+``setup_logging`` installs a single ``QueueHandler`` on the root logger; a
+``QueueListener`` thread formats records and writes them to the console and
+log file, so analysis threads only enqueue records and never block on I/O.
+Repeated calls reuse the same handler and listener (adding a log file if
+one is newly requested) instead of stacking handlers.
+
+Per-row warnings are rate limited: records logged with
+``extra={'rate_limit_key': key}`` pass at most ``burst`` times per
+``interval`` seconds for each key, and the next record that passes reports
+how many were suppressed. Suppressed records are dropped before they are
+queued or formatted.
+"""
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from pathlib import Path
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+FILE_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+_lock = threading.Lock()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_log_files: List[str] = []
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most ``burst`` records per ``rate_limit_key`` through every ``interval`` seconds"""
+
+    def __init__(self, burst: int = 5, interval: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        # key -> (window start, records passed in window, records suppressed)
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'rate_limit_key', None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            start, passed, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.interval:
+                start, passed = now, 0
+            if passed >= self.burst:
+                self._windows[key] = (start, passed, suppressed + 1)
+                return False
+            self._windows[key] = (start, passed + 1, 0)
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
 
-def setup_logging(results_dir: str = "results") -> logging.Logger:
+def setup_logging(
+    results_dir: Optional[str] = "results",
+    level: int = logging.INFO,
+    log_file: Optional[str] = None,
+    rate_limit_burst: int = 5,
+    rate_limit_interval: float = 60.0
+) -> logging.Logger:
     """
-    Configure logging to both console and file
-    
+    Configure queued logging to the console and a log file (idempotent)
+
     Parameters:
-    results_dir (str): Directory to store log files
-    
+    results_dir (str, optional): Directory receiving a timestamped
+        ``analysis_*.log`` when ``log_file`` is not given and no log file
+        is open yet; no file is written when both are None
+    level (int): Level of the root logger
+    log_file (str, optional): Explicit log file path
+    rate_limit_burst, rate_limit_interval: Limits of rate-limited records
+        (applied on the first call only)
+
     Returns:
-    logging.Logger: Configured logger instance
+    logging.Logger: The application logger ``vaccine_bias_remorse``
     """
-    # Create results directory if it doesn't exist
-    Path(results_dir).mkdir(exist_ok=True)
-    
-    # Create filename with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_file = f'{results_dir}/analysis_{timestamp}.log'
-    
-    # Configure logging
-    logger = logging.getLogger('vaccine_bias_remorse')
-    logger.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
\ No newline at end of file
+    global _queue_handler, _listener
+    root = logging.getLogger()
+    with _lock:
+        if _queue_handler is None:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+            _queue_handler.addFilter(RateLimitFilter(rate_limit_burst, rate_limit_interval))
+            _listener = logging.handlers.QueueListener(
+                _queue_handler.queue, console_handler, respect_handler_level=True
+            )
+            _listener.start()
+            root.addHandler(_queue_handler)
+            atexit.register(shutdown_logging)
+        root.setLevel(level)
+
+        if log_file is not None:
+            if log_file not in _log_files:
+                _add_file_handler(log_file)
+        elif results_dir is not None and not _log_files:
+            # One timestamped log per process, however often setup is called
+            Path(results_dir).mkdir(parents=True, exist_ok=True)
+            _add_file_handler(str(Path(results_dir) / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"))
+    return logging.getLogger('vaccine_bias_remorse')
+
+
+def _add_file_handler(log_file: str):
+    """Attach a file handler to the listener (called with ``_lock`` held)"""
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    _listener.stop()
+    _listener.handlers = (*_listener.handlers, file_handler)
+    _listener.start()
+    _log_files.append(log_file)
+
+
+def shutdown_logging():
+    """Flush queued records, stop the listener and remove the queue handler"""
+    global _queue_handler, _listener
+    with _lock:
+        if _queue_handler is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _queue_handler = _listener = None
+        _log_files.clear()
+
+
+def _restart_in_child():
+    """Forked workers inherit the queue handler but not the listener thread; give them their own"""
+    global _lock, _listener
+    _lock = threading.Lock()
+    if _queue_handler is None:
+        return
+    handlers = _listener.handlers
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
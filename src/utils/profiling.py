@@ -0,0 +1,239 @@
+"""
+Per-stage run instrumentation.
+
+``StageProfiler`` records, for each named stage (CSV parse, text cleaning,
+vaccine filter, pattern scan, aggregation, report building, ...), the
+number of calls, wall time, rows in and out, throughput and the peak
+resident set size reached during the stage. Optionally it also records the
+peak traced Python allocation (``tracemalloc``) and a cProfile of each stage.
+
+Profilers are plain data once a stage ends, so worker processes return
+theirs with each chunk and the run merges them with ``merge``. The
+measurements are exported with ``to_dict`` (JSON-ready), printed with
+``summary_table`` and, with cProfile enabled, saved as one ``.prof`` file
+per stage (``dump_profiles``).
+
+Peak RSS is measured by resetting the kernel's high-water mark at the start
+of each stage (Linux); elsewhere the process-lifetime peak is reported.
+Stages running concurrently in threads of one process share the mark, and
+only one stage per process is profiled with cProfile at a time: stages that
+start while another is being profiled are timed but not profiled.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGE_FIELDS = ('calls', 'seconds', 'rows_in', 'rows_out', 'peak_rss_bytes', 'peak_traced_bytes')
+
+# Held while a stage is profiled; cProfile cannot profile overlapping stages of one process
+_cprofile_lock = threading.Lock()
+
+
+def _reset_in_child():
+    """Forked workers may inherit the lock held by a parent thread's profiled stage"""
+    global _cprofile_lock
+    _cprofile_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_in_child)
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the process's peak RSS mark; False where the platform does not support it"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> int:
+    """Peak resident set size in bytes since the last reset (or process start)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageRun:
+    """Handle of a running stage; set ``rows_out`` before the stage ends"""
+
+    def __init__(self, rows_in: int):
+        self.rows_in = rows_in
+        self.rows_out = rows_in
+
+
+class StageProfiler:
+    """Mergeable per-stage timings, row counts and memory peaks"""
+
+    def __init__(self, trace_memory: bool = False, cprofile: bool = False):
+        """
+        Parameters:
+        trace_memory (bool): Record the peak traced Python allocation of each
+            stage with ``tracemalloc`` (slows allocation-heavy code noticeably)
+        cprofile (bool): Record a cProfile of each stage
+        """
+        self.trace_memory = trace_memory
+        self.cprofile = cprofile
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.profiles: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def options(self) -> Dict[str, bool]:
+        """Constructor arguments, for creating the profiler of a worker"""
+        return {'trace_memory': self.trace_memory, 'cprofile': self.cprofile}
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[StageRun]:
+        """
+        Measure one run of stage ``name``
+
+        Parameters:
+        name (str): Stage name
+        rows_in (int): Rows entering the stage (``rows_out`` defaults to it)
+        """
+        run = StageRun(rows_in)
+        _reset_peak_rss()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        profile = None
+        if self.cprofile and _cprofile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+            profile.enable()
+        started = time.perf_counter()
+        try:
+            yield run
+        finally:
+            seconds = time.perf_counter() - started
+            if profile:
+                profile.disable()
+                _cprofile_lock.release()
+            self._record(name, {
+                'calls': 1,
+                'seconds': seconds,
+                'rows_in': run.rows_in,
+                'rows_out': run.rows_out,
+                'peak_rss_bytes': _peak_rss(),
+                'peak_traced_bytes': tracemalloc.get_traced_memory()[1] if self.trace_memory else 0
+            })
+            if profile:
+                profile.create_stats()
+                self._add_profile(name, profile.stats)
+
+    def merge(self, other: 'StageProfiler') -> 'StageProfiler':
+        """Add the measurements of another profiler (e.g. of a worker process)"""
+        for name, stats in other.stages.items():
+            self._record(name, stats)
+        for name, stats in other.profiles.items():
+            self._add_profile(name, stats)
+        return self
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Per-stage measurements with derived throughput, in first-seen order"""
+        return {
+            name: {
+                **stats,
+                'rows_per_second': stats['rows_in'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+            }
+            for name, stats in self.stages.items()
+        }
+
+    def summary_table(self) -> str:
+        """Fixed-width table of the stages"""
+        return stage_table(self.to_dict())
+
+    def profile_stats(self, name: str, stream=None) -> pstats.Stats:
+        """cProfile statistics of stage ``name`` (printed to ``stream``)"""
+        return _as_pstats(self.profiles[name], stream)
+
+    def dump_profiles(self, directory: Union[str, Path], prefix: str = 'profile') -> List[Path]:
+        """Save each stage's cProfile as ``<prefix>_<stage>.prof`` (readable with ``pstats``)"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, stats in self.profiles.items():
+            path = directory / f'{prefix}_{name}.prof'
+            _as_pstats(stats).dump_stats(str(path))
+            paths.append(path)
+        return paths
+
+    def _record(self, name: str, stats: Dict):
+        with self._lock:
+            current = self.stages.setdefault(name, dict.fromkeys(STAGE_FIELDS, 0))
+            for field in ('calls', 'seconds', 'rows_in', 'rows_out'):
+                current[field] += stats.get(field, 0)
+            for field in ('peak_rss_bytes', 'peak_traced_bytes'):
+                current[field] = max(current[field], stats.get(field, 0))
+
+    def _add_profile(self, name: str, stats: Dict):
+        with self._lock:
+            if name not in self.profiles:
+                self.profiles[name] = dict(stats)
+                return
+            merged = _as_pstats(self.profiles[name])
+            merged.add(_as_pstats(stats))
+            self.profiles[name] = merged.stats
+
+
+def stage_table(stages: Dict[str, Dict]) -> str:
+    """
+    Fixed-width table of per-stage measurements
+
+    Parameters:
+    stages (Dict): Measurements as returned by ``StageProfiler.to_dict``;
+        the traced memory column is shown when any stage has one
+    """
+    traced = any(stats['peak_traced_bytes'] for stats in stages.values())
+    lines = [
+        f"{'stage':<18}{'calls':>7}{'seconds':>10}{'rows in':>12}{'rows out':>12}"
+        f"{'rows/s':>12}{'peak RSS MB':>13}" + (f"{'traced MB':>11}" if traced else '')
+    ]
+    for name, stats in stages.items():
+        lines.append(
+            f"{name:<18}{stats['calls']:>7,}{stats['seconds']:>10.3f}{stats['rows_in']:>12,}"
+            f"{stats['rows_out']:>12,}{stats['rows_per_second']:>12,.0f}"
+            f"{stats['peak_rss_bytes'] / 2**20:>13,.1f}"
+            + (f"{stats['peak_traced_bytes'] / 2**20:>11,.1f}" if traced else '')
+        )
+    return '\n'.join(lines)
+
+
+def _as_pstats(stats: Dict, stream=None) -> pstats.Stats:
+    """``pstats.Stats`` over a raw cProfile stats dict"""
+    result = pstats.Stats(stream=stream)
+    result.stats = dict(stats)
+    result.get_top_level_stats()
+    return result
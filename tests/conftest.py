@@ -0,0 +1,27 @@
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+
+@pytest.fixture
+def analyzed():
+    """Six analysis-ready comments (five with remorse) and their results table"""
+    df = pd.DataFrame({
+        'commentId': [str(i) for i in range(6)],
+        'cleaned_text': [
+            "i was wrong i got covid and trust the science",
+            "i regret it my friend died trump freedom",
+            "nothing here",
+            "i admit my doctor was right",
+            "changed my mind after i got sick",
+            "i realize the data was right biden"
+        ],
+        'publishedAt': [
+            datetime(2021, 1, 5), datetime(2021, 2, 1), datetime(2021, 2, 3),
+            datetime(2021, 1, 20), datetime(2021, 3, 1), datetime(2021, 2, 9)
+        ],
+        'channel': ['CNN', 'FOX', 'FOX', 'CNN', 'MSNBC', 'FOX'],
+        'engagement_score': [3, 0, 1, 7, 2, 5],
+        'has_edited': [True, False, False, False, True, False]
+    })
+    return df, BatchCommentAnalyzer().analyze_frame(df)
@@ -4,8 +4,8 @@ from datetime import datetime
 from src.analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
 
 @pytest.fixture
-def analyzer():
-    return VaccineBiasRemorseAnalyzer()
+def analyzer(tmp_path):
+    return VaccineBiasRemorseAnalyzer(results_dir=str(tmp_path))
 
 @pytest.fixture
 def sample_data():
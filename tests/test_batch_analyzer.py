@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer, RESULT_COLUMNS
+
+@pytest.fixture
+def batch_analyzer():
+    return BatchCommentAnalyzer()
+
+@pytest.fixture
+def sample_data():
+    return pd.DataFrame({
+        'commentId': ['1', '2', '3', '4'],
+        'cleaned_text': [
+            "i was wrong about vaccines i refused to get the vaccine but got covid and changed my mind",
+            "my family member got covid and was hospitalized",
+            "i regret listening to trump my friend died so i got the vaccine",
+            "i used to believe the science"
+        ],
+        'publishedAt': [datetime(2023, 1, day) for day in range(1, 5)],
+        'channel': ['CNN', 'FOX', 'CNN', 'MSNBC']
+    })
+
+def test_analyze_frame_columns(batch_analyzer, sample_data):
+    """The results table has one row per comment in the documented layout"""
+    table = batch_analyzer.analyze_frame(sample_data)
+
+    assert list(table.columns) == RESULT_COLUMNS
+    assert len(table) == 4
+    assert table['has_remorse'].tolist() == [True, False, True, True]
+
+def test_admission_cascade(batch_analyzer, sample_data):
+    """Secondary categories are only filled for admission candidates"""
+    table = batch_analyzer.analyze_frame(sample_data)
+    non_candidate = table.iloc[1]
+
+    assert non_candidate['catalyst'] is None
+    assert non_candidate['remorse_type'] is None
+    assert non_candidate['confidence_score'] == 0
+
+def test_secondary_categories(batch_analyzer, sample_data):
+    """Scores and first-match categories follow the row-by-row rules"""
+    table = batch_analyzer.analyze_frame(sample_data)
+    first, third, fourth = table.iloc[0], table.iloc[2], table.iloc[3]
+
+    # 2 admissions + 1 anti-vax + catalyst + 0 pro-vax
+    assert first['confidence_score'] == 4
+    assert first['previous_stance'] == 'anti_vax'
+    assert first['catalyst'] == 'got covid'
+    assert third['catalyst'] == 'friend died'
+    assert third['political_lean'] == 'conservative'
+    assert third['remorse_type'] == 'personal_experience'
+    assert fourth['remorse_type'] == 'scientific_evidence'
+    assert fourth['political_lean'] == 'progressive'
+
+def test_analyze_batch_missing_text(batch_analyzer):
+    """Missing texts are treated as empty comments"""
+    results = batch_analyzer.analyze_batch([None, float('nan'), "i admit it"])
+
+    assert results['has_remorse'].tolist() == [False, False, True]
+
+def test_analyze_texts_columnar():
+    """Plain strings and metadata lists give columnar results"""
+    from src.analyzer.comment_analyzer import CommentAnalyzer
+
+    results = CommentAnalyzer().analyze_texts(
+        (text for text in ["i admit i got sick", "hello"]),
+        channel=['CNN', 'FOX'],
+        engagement_score=[3, 4]
+    )
+
+    assert list(results) == RESULT_COLUMNS
+    assert results['has_remorse'].tolist() == [True, False]
+    assert results['catalyst'][0] == 'got sick'
+    assert results['channel'].tolist() == ['CNN', 'FOX']
+    assert results['comment_id'].tolist() == [None, None]
+    assert results['has_edit'].tolist() == [False, False]
+
+def test_analyze_texts_length_mismatch(batch_analyzer):
+    """Metadata arrays must align with the texts"""
+    with pytest.raises(ValueError):
+        batch_analyzer.analyze_texts(["a", "b"], channel=['CNN'])
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.case_writer import JsonlCaseWriter, iter_case_batch, iter_case_records, part_paths
+from src.analyzer.match_spans import MatchSpans
+
+@pytest.fixture
+def records():
+    """Records with timestamps and numpy scalars"""
+    return [
+        {
+            'comment_id': f'c{i}',
+            'timestamp': pd.Timestamp('2021-03-01', tz='UTC') + pd.Timedelta(days=i),
+            'confidence_score': np.float64(0.5 + i / 100),
+            'engagement_score': np.int64(i),
+            'text': f'I was wrong about the vaccine ({i})'
+        }
+        for i in range(200)
+    ]
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_round_trip(tmp_path, records, compression):
+    """Records read back equal the records written, in order"""
+    path = tmp_path / 'samples.jsonl'
+    with JsonlCaseWriter(path, compression=compression, buffer_size=256) as writer:
+        writer.write_many(records)
+
+    read = list(iter_case_records(path))
+    assert writer.records_written == len(records) == len(read)
+    assert read[0]['timestamp'] == '2021-03-01T00:00:00+00:00'
+    assert [record['engagement_score'] for record in read] == list(range(200))
+    assert writer.paths[0].name == ('samples.00000.jsonl.gz' if compression else 'samples.00000.jsonl')
+
+def test_rotation(tmp_path, records):
+    """Parts are rotated by size and read back as one stream"""
+    path = tmp_path / 'samples.jsonl'
+    with JsonlCaseWriter(path, max_bytes=2048, buffer_size=512) as writer:
+        writer.write_many(records)
+
+    assert len(writer.paths) > 1
+    assert part_paths(path) == writer.paths
+    assert [record['comment_id'] for record in iter_case_records(path)] == [r['comment_id'] for r in records]
+    assert len(list(iter_case_records(writer.paths[:1]))) < len(records)
+
+def test_rewrite_drops_stale_parts(tmp_path, records):
+    """A shorter rewrite removes the parts of an earlier, longer run"""
+    path = tmp_path / 'samples.jsonl'
+    with JsonlCaseWriter(path, max_bytes=2048, buffer_size=512) as writer:
+        writer.write_many(records)
+    with JsonlCaseWriter(path, compression='gzip', max_bytes=2048, buffer_size=512) as writer:
+        writer.write_many(records[:10])
+
+    assert part_paths(path) == writer.paths
+    assert [record['comment_id'] for record in iter_case_records(path)] == [r['comment_id'] for r in records[:10]]
+
+def test_unknown_compression(tmp_path):
+    """Unsupported compression names are rejected"""
+    with pytest.raises(ValueError):
+        JsonlCaseWriter(tmp_path / 'samples.jsonl', compression='lz4')
+
+def test_case_batch():
+    """Only remorse cases are emitted, with their text and matches"""
+    results = pd.DataFrame({
+        'comment_id': ['a', 'b', 'c'],
+        'has_remorse': [True, False, True],
+        'remorse_type': ['personal_experience', None, None],
+        'timestamp': pd.to_datetime(['2021-01-01', '2021-01-02', None]),
+        'channel': ['CNN', 'CNN', 'FOX']
+    })
+    texts = pd.Series(['i was wrong about it', 'nothing', 'i regret it'])
+    spans = MatchSpans(np.array([0, 2]), np.array([0, 0]), np.array([2, 2]), np.array([11, 8]))
+
+    cases = list(iter_case_batch(results, texts, spans))
+    assert [case['comment_id'] for case in cases] == ['a', 'c']
+    assert cases[1]['timestamp'] is None
+    assert cases[0]['text'] == 'i was wrong about it'
+    assert cases[0]['matches'][0]['match'] == 'was wrong'
@@ -0,0 +1,90 @@
+import argparse
+import json
+import pytest
+import pandas as pd
+from src.cli import REPORT_FORMATS, find_csv_files, fit_chunk_size, main, parse_size
+from src.pipeline import REPORT_FORMATS as PIPELINE_REPORT_FORMATS
+from src.utils.logging_config import shutdown_logging
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    yield
+    shutdown_logging()
+
+@pytest.fixture
+def data_root(tmp_path):
+    """Channel folders with one CSV file each"""
+    root = tmp_path / "data"
+    for channel, texts in [
+        ('CNN', ['I was wrong about the vaccine', 'This vaccine is effective']),
+        ('FoxNews', ['I regret refusing the vaccine shot', 'Normal comment'])
+    ]:
+        folder = root / channel / f"extracted_text_{channel}"
+        folder.mkdir(parents=True)
+        name = f"{channel.lower()}_video1.csv"
+        pd.DataFrame({
+            'commentId': [f'{channel}-{i}' for i in range(len(texts))],
+            'text': texts,
+            'publishedAt': ['2021-01-01T00:00:00Z'] * len(texts),
+            'updatedAt': ['2021-01-01T00:00:00Z'] * len(texts),
+            'likeCount': [1] * len(texts),
+            'totalReplyCount': [0] * len(texts),
+            'isPublic': [True] * len(texts),
+            'source_file': [name] * len(texts)
+        }).to_csv(folder / name, index=False)
+    return root
+
+def test_parse_size():
+    assert parse_size('512') == 512
+    assert parse_size('2G') == 2 << 30
+    assert parse_size('1.5mb') == int(1.5 * (1 << 20))
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_size('lots')
+
+def test_find_csv_files(data_root):
+    """Channels select their folders; unknown channels select nothing"""
+    assert [path.parent.parent.name for path in find_csv_files(data_root, ['FoxNews'])] == ['FoxNews']
+    assert len(find_csv_files(data_root, ['all'])) == 2
+    assert find_csv_files(data_root, ['MSNBC']) == []
+
+def test_fit_chunk_size(data_root):
+    sample = find_csv_files(data_root, ['CNN'])[0]
+    assert fit_chunk_size(50_000, 1 << 40, 8, sample) == 50_000
+    assert fit_chunk_size(50_000, 1 << 16, 8, sample) < 50_000
+
+def test_main_end_to_end(data_root, tmp_path, capsys):
+    """The CLI runs the pipeline and writes the requested outputs"""
+    output_dir = tmp_path / "out"
+    code = main([
+        str(data_root), '--channels', 'CNN', 'FoxNews', '--workers', '0', '--no-cache',
+        '--output-dir', str(output_dir), '--formats', 'json', 'samples'
+    ])
+
+    assert code == 0
+    assert "Remorse cases identified: 2" in capsys.readouterr().out
+    report_file, = output_dir.glob('report_*/report.json')
+    assert json.loads(report_file.read_text())['sections']['summary']['remorse_cases'] == 2
+    assert list(output_dir.glob('remorse_samples.*.jsonl.gz'))
+    assert not list(output_dir.glob('analysis_results_*.txt'))
+
+def test_main_profiling(data_root, tmp_path, capsys):
+    """Profiling flags print the step and pattern tables and save the stage profiles"""
+    output_dir = tmp_path / "out"
+    code = main([
+        str(data_root), '--workers', '0', '--no-cache', '--output-dir', str(output_dir),
+        '--profile', '--profile-patterns'
+    ])
+
+    assert code == 0
+    out = capsys.readouterr().out
+    assert "pattern_scan" in out
+    assert "Pattern profile (top 25 by time" in out
+    metrics_file, = output_dir.glob('metrics_*.json')
+    assert json.loads(metrics_file.read_text())['patterns']
+    assert list(output_dir.glob('profile_*/profile_pattern_scan.prof'))
+
+def test_report_formats_match_pipeline():
+    assert REPORT_FORMATS == PIPELINE_REPORT_FORMATS
+
+def test_main_without_files(data_root, tmp_path):
+    assert main([str(data_root), '--channels', 'MSNBC', '--output-dir', str(tmp_path)]) == 1
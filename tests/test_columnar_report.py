@@ -0,0 +1,49 @@
+import pytest
+from src.analyzer.columnar_report import ColumnarReportGenerator
+from src.analyzer.report_generator import ReportGenerator
+
+def test_matches_row_based_report(analyzed):
+    """The grouped backend reproduces the per-case report exactly"""
+    df, table = analyzed
+    cases = table[table['has_remorse']].to_dict('records')
+
+    expected = ReportGenerator().generate_analysis_report(cases, df)
+    report = ColumnarReportGenerator().generate_analysis_report(table, df)
+
+    assert report == expected
+    assert list(report['temporal_analysis']) == list(expected['temporal_analysis'])
+    assert list(report['channel_analysis']) == list(expected['channel_analysis'])
+
+def test_section_values(analyzed):
+    df, table = analyzed
+    report = ColumnarReportGenerator().generate_analysis_report(table, df)
+
+    assert report['summary']['remorse_cases'] == 5
+    assert report['channel_analysis']['FOX']['total_comments'] == 3
+    assert report['temporal_analysis']['2021-02']['count'] == 2
+    assert report['catalysts']['got covid']['confidence_scores'] == {3: 1}
+    assert report['catalysts']['got covid']['avg_confidence'] == 3
+    assert report['engagement_metrics']['by_channel']['CNN'] == {
+        'count': 2, 'mean': 5.0, 'p50': 3.0, 'p90': 7.0, 'p99': 7.0
+    }
+
+def test_no_cases(analyzed):
+    df, table = analyzed
+    report = ColumnarReportGenerator().generate_analysis_report(table.iloc[[2]], df)
+    assert report == {"error": "No bias remorse cases detected"}
+
+def test_requested_sections_only(analyzed):
+    """Only the requested sections and their dependencies are computed"""
+    df, table = analyzed
+    generator = ColumnarReportGenerator()
+    full = generator.generate_analysis_report(table, df)
+
+    report = generator.generate_analysis_report(table, df, sections=['temporal_analysis', 'key_findings'])
+    assert list(report) == ['temporal_analysis', 'key_findings']
+    assert report['key_findings'] == full['key_findings']
+
+    lazy = generator.lazy_report(table[table['has_remorse']].reset_index(drop=True), df)
+    lazy['key_findings']
+    assert lazy.computed() == ['summary', 'key_findings']
+    with pytest.raises(ValueError):
+        generator.generate_analysis_report(table, df, sections=['sentiment'])
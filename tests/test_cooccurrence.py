@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+from src.analyzer.cooccurrence import HitMatrix
+from src.analyzer.match_spans import MatchSpanRecorder
+from src.analyzer.statistical_analyzer import StatisticalAnalyzer
+
+@pytest.fixture
+def analyzed():
+    df = pd.DataFrame({
+        'commentId': ['1', '2', '3', '4'],
+        'cleaned_text': [
+            "i was wrong i got covid trump",
+            "i regret it my friend died",
+            "nothing here",
+            "i was wrong my doctor said so biden"
+        ],
+        'publishedAt': [datetime(2021, 1, 5)] * 4,
+        'channel': ['CNN', 'FOX', 'FOX', 'CNN']
+    })
+    spans = MatchSpanRecorder()
+    table = BatchCommentAnalyzer().analyze_frame(df, spans=spans)
+    return table, spans.to_spans()
+
+def test_matches_dense_product():
+    rng = np.random.default_rng(0)
+    dense = rng.random((500, 6)) < 0.3
+    rows, cols = np.nonzero(dense)
+    hits = HitMatrix(rows, cols, 500, [('f', i) for i in range(6)])
+
+    expected = dense.T.astype(int) @ dense.astype(int)
+    assert (hits.cooccurrence().to_numpy() == expected).all()
+    assert (hits.select(['f']).counts().to_numpy() == dense.sum(axis=0)).all()
+
+def test_cooccurrence_from_results(analyzed):
+    table, spans = analyzed
+    hits = HitMatrix.from_results(table, spans)
+    co = hits.cooccurrence()
+
+    assert co.loc[('category', 'admission'), ('category', 'admission')] == 3
+    assert co.loc[('channel', 'CNN'), ('category', 'catalyst')] == 1
+    assert co.loc[('channel', 'FOX'), ('channel', 'FOX')] == 2
+    assert co.loc[('political_lean', 'conservative'), ('channel', 'CNN')] == 1
+    # Symmetric, with per-feature comment counts on the diagonal
+    assert (co.to_numpy() == co.to_numpy().T).all()
+    assert (np.diag(co.to_numpy()) == hits.counts().to_numpy()).all()
+
+def test_remorse_type_cooccurrence(analyzed):
+    table, spans = analyzed
+    remorse = table[table['has_remorse']].reset_index(drop=True)
+    cases = remorse.assign(intensity=remorse['confidence_score'])
+    stats = StatisticalAnalyzer().analyze_remorse_types(cases, HitMatrix.from_results(cases, kinds=['channel']))
+    assert stats['co_occurrence']['personal_experience'][('channel', 'FOX')] == 1
+
+    secondary = StatisticalAnalyzer().analyze_remorse_types([
+        {'remorse_type': 'personal_experience', 'secondary_types': ['medical_authority']},
+        {'remorse_type': 'personal_experience', 'secondary_types': ['medical_authority', 'scientific_evidence']}
+    ])
+    assert secondary['co_occurrence']['personal_experience'] == {'medical_authority': 2, 'scientific_evidence': 1}
@@ -93,3 +93,42 @@ def test_invalid_data_folder():
     """Test handling of invalid data folder"""
     with pytest.raises(FileNotFoundError):
         create_dataset("nonexistent_folder")
+
+def test_get_temporal_splits(sample_data_folder):
+    """Test temporal splits over the time-sorted data"""
+    dataset = create_dataset(str(sample_data_folder))
+    splits = dataset.get_temporal_splits([
+        ('2021-01-01', '2021-01-02'),
+        ('2021-01-01', '2021-02-01'),
+        ('2021-02-01', '2021-01-01')
+    ])
+    
+    assert splits['period_1']['commentId'].tolist() == ['123']
+    assert splits['period_2']['commentId'].tolist() == ['123', '456']
+    assert splits['period_3'].empty
+
+def test_get_temporal_splits_unsorted(sample_data_folder):
+    """Test that externally assigned, unsorted data is split correctly"""
+    dataset = create_dataset(str(sample_data_folder))
+    dataset.processed_data = dataset.processed_data.iloc[::-1]
+    splits = dataset.get_temporal_splits([('2021-01-02', '2021-01-03')])
+    
+    assert splits['period_1']['commentId'].tolist() == ['456']
+
+def test_group_lookups(sample_data_folder):
+    """Test channel x period and video lookups through the group index"""
+    dataset = create_dataset(str(sample_data_folder))
+    dataset.processed_data['videoId'] = ['v1', 'v1']
+    
+    assert dataset.get_channel_data('FOX')['commentId'].tolist() == ['456']
+    assert dataset.get_channel_data('cnn', ('2021-01-02', '2021-02-01')).empty
+    assert dataset.get_video_data('v1', ('2021-01-02', '2021-02-01'))['commentId'].tolist() == ['456']
+    assert dataset.get_video_data('v2').empty
+
+def test_group_index_built_by_preprocess(sample_data_folder):
+    """Test that lookups reuse the group index built with the preprocessed data"""
+    dataset = create_dataset(str(sample_data_folder))
+    index = dataset._group_indexes['source_file']
+    
+    assert dataset.get_channel_data('FOX')['commentId'].tolist() == ['456']
+    assert dataset._group_indexes['source_file'] is index
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous bound on the cumulative import time of the light entry modules
+MAX_IMPORT_MICROSECONDS = 250_000
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+def _import_microseconds(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} was not imported")
+
+@pytest.mark.parametrize('module', ['src.analyzer', 'src.cli'])
+def test_import_is_light(module):
+    """Importing the package or the CLI loads neither pandas nor NumPy"""
+    result = _run(f"import sys, {module}; print('pandas' in sys.modules, 'numpy' in sys.modules)")
+    assert result.stdout.split() == ['False', 'False']
+    assert _import_microseconds(result.stderr, module) < MAX_IMPORT_MICROSECONDS
+
+def test_help_is_light():
+    """``--help`` exits before the pipeline is imported"""
+    result = _run(
+        "import sys\n"
+        "from src.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('pandas' in sys.modules)"
+    )
+    assert result.stdout.strip().endswith('False')
+
+def test_lazy_exports():
+    """Public classes resolve on first access"""
+    import src.analyzer as analyzer
+    from src.analyzer.report_generator import ReportGenerator
+
+    assert analyzer.ReportGenerator is ReportGenerator
+    assert 'VaccineBiasRemorseAnalyzer' in dir(analyzer)
+    with pytest.raises(AttributeError):
+        analyzer.NotAnAnalyzer
+
+def test_analyzer_import_is_lean():
+    """The analyzer loads caching, export and report modules only when used"""
+    result = _run(
+        "import sys, src.analyzer.bias_remorse\n"
+        "print(sorted(name for name in ['result_cache', 'report_export', 'cooccurrence', 'columnar_report'] "
+        "if f'src.analyzer.{name}' in sys.modules))"
+    )
+    assert result.stdout.strip() == '[]'
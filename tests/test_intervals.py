@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.intervals import (
+    bootstrap_mean_interval, bootstrap_rate_interval, remorse_rate_intervals, wilson_interval
+)
+
+@pytest.fixture
+def results():
+    return pd.DataFrame({
+        'has_remorse': [True, False, False, False, True, True, False],
+        'channel': ['CNN', 'CNN', 'CNN', 'CNN', 'FOX', 'FOX', 'FOX'],
+        'timestamp': pd.to_datetime([
+            '2021-01-05', '2021-01-06', '2021-02-01', '2021-02-02', '2021-01-07', '2021-01-08', '2021-02-03'
+        ])
+    })
+
+def test_wilson_interval():
+    low, high = wilson_interval([1, 0], [4, 0])
+    # Known value for 1 of 4 at 95%
+    assert low[0] == pytest.approx(0.0456, abs=1e-4)
+    assert high[0] == pytest.approx(0.6994, abs=1e-4)
+    assert np.isnan(low[1])
+
+def test_bootstrap_intervals_contain_estimate():
+    low, high = bootstrap_rate_interval([30, 0], [100, 5], seed=0)
+    assert low[0] < 0.3 < high[0]
+    assert low[1] == high[1] == 0
+
+    values = np.arange(20, dtype=float)
+    low, high = bootstrap_mean_interval(values, np.repeat([0, 1], 10), 2, seed=0)
+    assert low[0] < 4.5 < high[0] and low[1] < 14.5 < high[1]
+
+def test_remorse_rate_intervals(results):
+    table = remorse_rate_intervals(results, by=('channel', 'month'))
+
+    assert table[['channel', 'month']].values.tolist() == [
+        ['CNN', '2021-01'], ['CNN', '2021-02'], ['FOX', '2021-01'], ['FOX', '2021-02']
+    ]
+    assert table['comments'].tolist() == [2, 2, 2, 1]
+    assert table['remorse_rate'].tolist() == [50, 0, 100, 0]
+    assert (table['ci_low'] <= table['remorse_rate']).all() and (table['remorse_rate'] <= table['ci_high']).all()
+
+    bootstrap = remorse_rate_intervals(results, method='bootstrap', seed=0)
+    assert bootstrap['channel'].tolist() == ['CNN', 'FOX']
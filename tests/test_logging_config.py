@@ -0,0 +1,54 @@
+import logging
+import time
+import pytest
+from src.utils.logging_config import RateLimitFilter, setup_logging, shutdown_logging
+
+@pytest.fixture
+def configured(tmp_path):
+    shutdown_logging()
+    yield tmp_path
+    shutdown_logging()
+
+def _queue_handlers():
+    return [handler for handler in logging.getLogger().handlers if isinstance(handler, logging.handlers.QueueHandler)]
+
+def test_setup_is_idempotent(configured):
+    """Repeated setup keeps one queue handler and one log file"""
+    setup_logging(str(configured))
+    setup_logging(str(configured))
+    logging.getLogger('test.logging').info("queued message")
+    shutdown_logging()
+
+    assert _queue_handlers() == []
+    log_files = list(configured.glob('analysis_*.log'))
+    assert len(log_files) == 1
+    assert log_files[0].read_text().count("queued message") == 1
+
+def test_single_handler_while_configured(configured):
+    """Adding a log file does not add handlers to the root logger"""
+    setup_logging(None)
+    setup_logging(None, log_file=str(configured / 'run.log'))
+    setup_logging(None, log_file=str(configured / 'run.log'))
+    assert len(_queue_handlers()) == 1
+
+def test_rate_limit_filter():
+    """Keyed records pass ``burst`` times per interval, then report suppressions"""
+    rate_limit = RateLimitFilter(burst=2, interval=3600)
+
+    def record():
+        return logging.LogRecord('test', logging.WARNING, __file__, 1, "failed", None, None)
+
+    keyed = []
+    for _ in range(5):
+        r = record()
+        r.rate_limit_key = 'sentiment'
+        keyed.append(rate_limit.filter(r))
+    assert keyed == [True, True, False, False, False]
+    assert all(rate_limit.filter(record()) for _ in range(5))
+
+    # An expired window with suppressed records
+    rate_limit._windows['sentiment'] = (time.monotonic() - 7200, 2, 3)
+    r = record()
+    r.rate_limit_key = 'sentiment'
+    assert rate_limit.filter(r)
+    assert r.getMessage() == "failed (3 similar messages suppressed)"
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from src.analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+from src.analyzer.match_spans import MatchSpanRecorder, MatchSpans
+from src.analyzer.patterns import PATTERN_REGISTRY
+
+TEXTS = [
+    "nothing to see here",
+    "i was wrong and i regret it after i got covid",
+    "so i got the vaccine"
+]
+
+def _record(texts):
+    recorder = MatchSpanRecorder()
+    BatchCommentAnalyzer().analyze_batch(texts, spans=recorder)
+    return recorder.to_spans()
+
+def test_spans_recorded_for_candidates():
+    """Only remorse candidates get spans, and offsets point at the match"""
+    spans = _record(TEXTS)
+
+    assert set(spans.rows.tolist()) == {1}
+    for row, pattern_id, start, end in zip(spans.rows, spans.pattern_ids, spans.starts, spans.ends):
+        assert PATTERN_REGISTRY[pattern_id][0] in ('admission', 'catalyst')
+        assert TEXTS[row][start:end] in ('i was wrong', 'i regret', 'got covid')
+    assert len(spans.for_category('catalyst')) == 1
+
+def test_save_and_load(tmp_path):
+    """Spans round-trip through the compressed file format"""
+    spans = _record(TEXTS)
+    path = tmp_path / "spans.npz"
+    spans.save(path)
+    loaded = MatchSpans.load(path)
+
+    assert np.array_equal(loaded.rows, spans.rows)
+    assert np.array_equal(loaded.pattern_ids, spans.pattern_ids)
+    assert np.array_equal(loaded.starts, spans.starts)
+    assert np.array_equal(loaded.ends, spans.ends)
+
+def test_iter_snippets():
+    """Snippets are rebuilt from the corpus with the match highlighted"""
+    spans = _record(TEXTS).for_category('catalyst')
+    snippet = next(spans.iter_snippets(TEXTS, context=6))
+
+    assert snippet['row'] == 1
+    assert snippet['match'] == 'got covid'
+    assert snippet['snippet'] == '...ter i [got covid]'
+
+def test_analyzer_saves_spans_to_results_dir(tmp_path, monkeypatch):
+    """Spans go to the analyzer's results directory, and nowhere without one"""
+    comments = pd.DataFrame({
+        'commentId': ['1', '2'],
+        'cleaned_text': ["i was wrong about the vaccine", "nothing here"],
+        'publishedAt': [datetime(2021, 1, 5), datetime(2021, 2, 1)],
+        'channel': ['CNN', 'FOX']
+    })
+    monkeypatch.chdir(tmp_path)
+    VaccineBiasRemorseAnalyzer(results_dir=None).analyze_dataset(comments)
+    assert not list(tmp_path.iterdir())
+
+    results_dir = tmp_path / 'out'
+    VaccineBiasRemorseAnalyzer(results_dir=str(results_dir)).analyze_dataset(comments)
+    spans_file, = results_dir.glob('match_spans_*.npz')
+    assert len(MatchSpans.load(spans_file)) > 0
+    assert list(results_dir.glob('report_*/report.json'))
@@ -0,0 +1,56 @@
+import pytest
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+from src.analyzer.pattern_order import AdaptivePatternOrder
+
+PATTERNS = ['slow rare', 'cheap common', 'unseen']
+
+def _trained_order():
+    order = AdaptivePatternOrder(min_calls=10)
+    order.record('admission', 'slow rare', calls=100, hits=1, seconds=1.0)
+    order.record('admission', 'cheap common', calls=100, hits=50, seconds=0.1)
+    return order
+
+def test_learned_order():
+    """Cheap, frequently matching patterns move first; unseen ones keep their slot"""
+    assert _trained_order().order('admission', PATTERNS) == [1, 0, 2]
+
+def test_order_sensitive_categories_keep_definition_order():
+    """First-match categories are never reordered"""
+    order = _trained_order()
+    order.record('catalyst', 'slow rare', calls=100, hits=1, seconds=1.0)
+    order.record('catalyst', 'cheap common', calls=100, hits=50, seconds=0.1)
+
+    assert order.order('catalyst', PATTERNS) == [0, 1, 2]
+
+def test_save_and_load(tmp_path):
+    """Statistics persist between runs"""
+    path = tmp_path / "order.json"
+    _trained_order().save(path)
+    loaded = AdaptivePatternOrder(path, min_calls=10)
+
+    assert loaded.stats['admission']['cheap common']['hits'] == 50
+    assert loaded.order('admission', PATTERNS) == [1, 0, 2]
+
+def test_reordering_keeps_results():
+    """A reversed admission order gives identical analysis results"""
+    texts = ["i was wrong and now i understand", "i regret it", "nothing here", "i admit i realize"]
+    baseline = BatchCommentAnalyzer().analyze_batch(texts)
+
+    analyzer = BatchCommentAnalyzer(AdaptivePatternOrder(min_calls=1))
+    for i, pattern in enumerate(analyzer.category_patterns['admission']):
+        analyzer.pattern_order.record('admission', pattern.pattern, calls=10, hits=i, seconds=0.01)
+    reordered = analyzer.analyze_batch(texts)
+
+    for field, values in baseline.items():
+        assert values.tolist() == reordered[field].tolist()
+
+def test_since_and_merge():
+    """Statistics recorded after a snapshot merge back into another instance"""
+    order = _trained_order()
+    snapshot = order.snapshot()
+    order.record('admission', 'cheap common', calls=10, hits=5, seconds=0.01)
+
+    recorded = order.since(snapshot)
+    assert recorded.stats == {'admission': {'cheap common': {'calls': 10, 'hits': 5, 'seconds': pytest.approx(0.01)}}}
+    merged = _trained_order().merge(recorded)
+    assert merged.stats['admission']['cheap common']['calls'] == 110
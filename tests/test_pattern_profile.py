@@ -0,0 +1,93 @@
+import pytest
+
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+from src.analyzer.pattern_profile import PatternProfile
+
+TEXTS = [
+    'i was wrong about the vaccine, i used to think it was a hoax',
+    'i regret not getting the vaccine, was hospitalized',
+    'i was wrong and i regret it',
+    'the weather is nice today',
+    ''
+]
+
+
+def _profiled(texts=TEXTS):
+    profile = PatternProfile()
+    analyzer = BatchCommentAnalyzer(pattern_profile=profile)
+    results = analyzer.analyze_batch(texts)
+    return profile, results
+
+
+def test_every_evaluated_pattern_is_recorded():
+    """Calls and hits of admission patterns include the recount on the candidates"""
+    profile, results = _profiled()
+    assert profile.comments == len(TEXTS)
+
+    wrong = profile.stats[('admission', r'i (?:was|have been) wrong')]
+    candidates = int(results['has_remorse'].sum())
+    # Evaluated on the not yet matched texts, then again on every candidate
+    assert wrong['calls'] >= candidates
+    assert wrong['hits'] >= 2
+    assert wrong['seconds'] > 0
+    assert any(category == 'remorse_type' for category, _ in profile.stats)
+    assert any(category == 'catalyst' for category, _ in profile.stats)
+
+
+def test_positives_count_decided_comments():
+    """Each comment is made positive by at most one pattern per category"""
+    profile, results = _profiled()
+    positives = {}
+    for (category, _), stats in profile.stats.items():
+        positives[category] = positives.get(category, 0) + stats['positives']
+
+    assert positives['admission'] == int(results['has_remorse'].sum())
+    assert positives['catalyst'] == sum(catalyst is not None for catalyst in results['catalyst'])
+    assert positives['previous_anti_vax'] == sum(stance == 'anti_vax' for stance in results['previous_stance'])
+
+
+def test_profile_does_not_change_results():
+    """Profiling only observes the evaluation"""
+    _, profiled = _profiled()
+    plain = BatchCommentAnalyzer().analyze_batch(TEXTS)
+    for field, values in plain.items():
+        assert list(profiled[field]) == list(values)
+
+
+def test_merge():
+    """Profiles of separate batches merge into the profile of both"""
+    first, _ = _profiled(TEXTS[:2])
+    second, _ = _profiled(TEXTS[2:])
+    whole, _ = _profiled()
+    first.merge(second)
+
+    assert first.comments == whole.comments
+    for key, stats in whole.stats.items():
+        assert first.stats[key]['hits'] == stats['hits']
+        assert first.stats[key]['positives'] == stats['positives']
+
+
+def test_ranked_records_and_table(tmp_path):
+    """Records are ranked by the chosen key and rendered as a table"""
+    profile = PatternProfile()
+    profile.add_comments(100)
+    profile.record('admission', 'cheap', calls=100, seconds=0.1, hits=50, positives=40)
+    profile.record('admission', 'slow', calls=100, seconds=1.0, hits=1, positives=1)
+
+    records = profile.to_records()
+    assert [record['pattern'] for record in records] == ['slow', 'cheap']
+    assert records[0]['rank'] == 1
+    assert records[1]['positive_share'] == pytest.approx(0.4)
+    assert records[1]['hit_rate'] == pytest.approx(0.5)
+    assert records[0]['time_share'] == pytest.approx(1.0 / 1.1)
+    assert [record['pattern'] for record in profile.to_records('positives')] == ['cheap', 'slow']
+    with pytest.raises(ValueError):
+        profile.to_records('unknown')
+
+    lines = profile.table(limit=1).splitlines()
+    assert len(lines) == 3
+    assert 'slow' in lines[1]
+    assert lines[-1] == '100 comments analyzed'
+
+    profile.save(tmp_path / 'patterns.json')
+    assert (tmp_path / 'patterns.json').exists()
@@ -0,0 +1,179 @@
+import json
+import pytest
+import pandas as pd
+from src.pipeline import AnalysisPipeline, StageMetrics
+
+@pytest.fixture
+def sample_data_folder(tmp_path):
+    """Create a temporary folder with two sample CSV files"""
+    folder = tmp_path / "test_data"
+    folder.mkdir()
+
+    for name, texts in [
+        ('cnn_video1.csv', ['I was wrong about the vaccine', 'This vaccine is effective', 'Normal comment']),
+        ('fox_video1.csv', ['I regret refusing the vaccine shot', 'Booster dose today'])
+    ]:
+        pd.DataFrame({
+            'commentId': [f'{name}-{i}' for i in range(len(texts))],
+            'text': texts,
+            'publishedAt': ['2021-01-01T00:00:00Z'] * len(texts),
+            'updatedAt': ['2021-01-01T00:00:00Z'] * len(texts),
+            'likeCount': [1] * len(texts),
+            'totalReplyCount': [0] * len(texts),
+            'isPublic': [True] * len(texts),
+            'source_file': [name] * len(texts)
+        }).to_csv(folder / name, index=False)
+    return folder
+
+def test_pipeline_inline(sample_data_folder):
+    """Chunks analyzed in the calling thread reach the sink"""
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=0, chunk_size=2, queue_size=1)
+    pipeline.run()
+    metrics = {stage['stage']: stage for stage in pipeline.metrics()['stages']}
+
+    assert metrics['read']['rows_in'] == 5
+    assert metrics['read']['chunks'] == 2
+    assert metrics['analyze']['chunks'] == 3  # chunk_size=2 splits the 3-row file
+    assert metrics['analyze']['rows_out'] == 4  # vaccine-related rows only
+    assert metrics['sink']['rows_in'] == 4
+    assert metrics['read']['max_queue_depth'] <= 1
+
+def test_pipeline_process_pool(sample_data_folder):
+    """The process pool stage produces the same row counts"""
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=1, chunk_size=2)
+    pipeline.run()
+    metrics = {stage['stage']: stage for stage in pipeline.metrics()['stages']}
+
+    assert metrics['analyze']['rows_in'] == 5
+    assert metrics['analyze']['rows_out'] == 4
+
+def test_stage_metrics():
+    """Stage metrics report throughput and queue depth"""
+    metrics = StageMetrics('read')
+    metrics.record(100, 50, 0.5)
+    metrics.sample_queue(2)
+    metrics.sample_queue(4)
+
+    stats = metrics.as_dict()
+    assert stats['rows_per_second'] == 200
+    assert stats['avg_queue_depth'] == 3
+    assert stats['max_queue_depth'] == 4
+
+def test_pipeline_missing_folder():
+    """Missing data folders raise FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        AnalysisPipeline("nonexistent_folder").run()
+
+def test_pipeline_report(sample_data_folder, tmp_path):
+    """Merged chunk states produce the report and are saved with it"""
+    results_dir = tmp_path / "results"
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=0, chunk_size=2, results_dir=str(results_dir))
+    report = pipeline.run()
+
+    assert report['summary']['total_comments_analyzed'] == 4
+    assert report['summary']['remorse_cases'] == 2
+    assert len(list(results_dir.glob('report_state_*.json'))) == 1
+    results_file, = results_dir.glob('analysis_results_*.txt')
+    assert f"Analysis started at: {pipeline.started_at:%Y-%m-%d %H:%M:%S}" in results_file.read_text()
+
+def test_pipeline_samples(sample_data_folder, tmp_path):
+    """Remorse cases are streamed to JSON Lines by the sink"""
+    from src.analyzer.case_writer import iter_case_records
+    samples_path = tmp_path / "samples" / "remorse_samples.jsonl"
+    AnalysisPipeline(str(sample_data_folder), workers=0, chunk_size=2, samples_path=str(samples_path)).run()
+
+    cases = list(iter_case_records(samples_path))
+    assert len(cases) == 2
+    assert all(case['text'] and case['matches'] for case in cases)
+
+def test_pipeline_stratified_samples(sample_data_folder, tmp_path):
+    """Chunk reservoirs merge into one sample of at most k cases per stratum"""
+    from src.analyzer.case_writer import iter_case_records
+    samples_path = tmp_path / "remorse_samples.jsonl"
+    pipeline = AnalysisPipeline(
+        str(sample_data_folder), workers=0, chunk_size=1,
+        samples_path=str(samples_path), samples_per_stratum=1, samples_seed=3
+    )
+    pipeline.run()
+
+    cases = list(iter_case_records(samples_path))
+    assert len(cases) == len(pipeline.sample_reservoir) == 2
+    assert all(case['stratum']['month'] == '2021-01' for case in cases)
+
+def test_pipeline_cache(sample_data_folder, tmp_path):
+    """A second run over unchanged files reuses the cached state"""
+    cache_dir = str(tmp_path / "cache")
+    first = AnalysisPipeline(str(sample_data_folder), workers=0, cache_dir=cache_dir).run()
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=0, cache_dir=cache_dir)
+    second = pipeline.run()
+
+    assert second['summary'] == first['summary']
+    assert pipeline.stage_metrics['analyze'].chunks == 0
+
+def test_pipeline_step_profile(sample_data_folder, tmp_path):
+    """Worker step measurements are merged and written to the run's metrics file"""
+    results_dir = tmp_path / "results"
+    pipeline = AnalysisPipeline(
+        str(sample_data_folder), workers=1, chunk_size=2, results_dir=str(results_dir),
+        report_formats=['text'], cprofile_stages=True
+    )
+    pipeline.run()
+    profile = pipeline.metrics()['profile']
+
+    assert profile['csv_parse']['rows_in'] == 5
+    assert profile['clean_text']['calls'] == 3
+    assert profile['vaccine_filter']['rows_out'] == 4
+    assert profile['pattern_scan']['rows_in'] == 4
+    assert profile['report']['calls'] == 1
+
+    metrics_file, = results_dir.glob('metrics_*.json')
+    saved = json.loads(metrics_file.read_text())
+    assert saved['profile']['pattern_scan']['calls'] == 3
+    assert [stage['stage'] for stage in saved['stages']] == ['read', 'analyze', 'sink']
+    profile_dir, = results_dir.glob('profile_*')
+    assert (profile_dir / 'profile_pattern_scan.prof').exists()
+
+def test_pipeline_pattern_profile(sample_data_folder):
+    """Chunk pattern profiles are merged into a ranked profile of the run"""
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=1, chunk_size=2, profile_patterns=True)
+    report = pipeline.run()
+    records = pipeline.metrics()['patterns']
+
+    assert pipeline.pattern_profile.comments == 4
+    assert sum(record['positives'] for record in records if record['category'] == 'admission') == \
+        report['summary']['remorse_cases']
+    assert [record['rank'] for record in records] == list(range(1, len(records) + 1))
+    seconds = [record['seconds'] for record in records]
+    assert seconds == sorted(seconds, reverse=True)
+
+@pytest.mark.parametrize('workers', [0, 1])
+def test_pipeline_pattern_order(sample_data_folder, tmp_path, workers):
+    """Workers start from the saved pattern order and the run saves what they learned"""
+    path = tmp_path / "order.json"
+    AnalysisPipeline(str(sample_data_folder), workers=workers, chunk_size=2, pattern_order_path=str(path)).run()
+    first = json.loads(path.read_text())['categories']
+    admission_calls = sum(stats['calls'] for stats in first['admission'].values())
+    assert admission_calls > 0
+
+    AnalysisPipeline(str(sample_data_folder), workers=workers, chunk_size=2, pattern_order_path=str(path)).run()
+    second = json.loads(path.read_text())['categories']
+    assert sum(stats['calls'] for stats in second['admission'].values()) == 2 * admission_calls
+
+@pytest.mark.parametrize('workers', [0, 1])
+def test_pipeline_sink_failure(sample_data_folder, monkeypatch, workers):
+    """An error in the sink stops every stage and is re-raised by run()"""
+    import threading
+    from src.utils.profiling import StageProfiler
+
+    def fail(self, other):
+        raise RuntimeError("merge failed")
+    # Only the sink merges worker profiles
+    monkeypatch.setattr(StageProfiler, 'merge', fail)
+    pipeline = AnalysisPipeline(str(sample_data_folder), workers=workers, chunk_size=1, queue_size=1)
+    errors = []
+    runner = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, pipeline.run)), daemon=True)
+    runner.start()
+    runner.join(timeout=30)
+
+    assert not runner.is_alive()
+    assert len(errors) == 1 and 'merge failed' in str(errors[0].value)
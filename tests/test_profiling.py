@@ -0,0 +1,106 @@
+import pickle
+import pstats
+
+import pytest
+
+from src.utils.profiling import StageProfiler, stage_table
+
+
+def _busy(n=20_000):
+    return sum(i * i for i in range(n))
+
+
+def test_stage_records_rows_and_time():
+    """Stages accumulate calls, rows and time; rows_out defaults to rows_in"""
+    profiler = StageProfiler()
+    with profiler.stage('clean', 10) as stage:
+        _busy()
+        stage.rows_out = 4
+    with profiler.stage('clean', 6):
+        pass
+
+    stats = profiler.to_dict()['clean']
+    assert stats['calls'] == 2
+    assert stats['rows_in'] == 16
+    assert stats['rows_out'] == 10
+    assert stats['seconds'] > 0
+    assert stats['rows_per_second'] == pytest.approx(16 / stats['seconds'])
+    assert stats['peak_rss_bytes'] > 0
+    assert stats['peak_traced_bytes'] == 0
+
+
+def test_stage_records_on_error():
+    """A failing stage is still measured"""
+    profiler = StageProfiler()
+    with pytest.raises(RuntimeError):
+        with profiler.stage('parse', 3):
+            raise RuntimeError("bad file")
+    assert profiler.stages['parse']['calls'] == 1
+
+
+def test_trace_memory():
+    """With tracemalloc the peak Python allocation of each stage is recorded"""
+    profiler = StageProfiler(trace_memory=True)
+    with profiler.stage('allocate'):
+        block = [0] * 1_000_000
+        del block
+    with profiler.stage('small'):
+        pass
+
+    stages = profiler.to_dict()
+    assert stages['allocate']['peak_traced_bytes'] >= 8_000_000
+    assert stages['small']['peak_traced_bytes'] < stages['allocate']['peak_traced_bytes']
+    assert 'traced MB' in profiler.summary_table()
+
+
+def test_cprofile_per_stage(tmp_path):
+    """Each stage gets its own cProfile statistics, saved as .prof files"""
+    profiler = StageProfiler(cprofile=True)
+    with profiler.stage('busy'):
+        _busy()
+    with profiler.stage('idle'):
+        pass
+
+    assert set(profiler.profiles) == {'busy', 'idle'}
+    assert any(function == '<genexpr>' for _, _, function in profiler.profiles['busy'])
+    paths = profiler.dump_profiles(tmp_path)
+    assert sorted(path.name for path in paths) == ['profile_busy.prof', 'profile_idle.prof']
+    assert pstats.Stats(str(tmp_path / 'profile_busy.prof')).total_calls > 0
+
+
+def test_nested_stages_profile_outer_only():
+    """Only one stage of a process is profiled at a time; overlapping stages are just timed"""
+    profiler = StageProfiler(cprofile=True)
+    with profiler.stage('outer'):
+        with profiler.stage('inner'):
+            _busy()
+    assert set(profiler.profiles) == {'outer'}
+    assert profiler.stages['inner']['calls'] == 1
+
+
+def test_merge_and_pickle():
+    """Worker profilers survive pickling and merge into the run profiler"""
+    run = StageProfiler(cprofile=True)
+    for _ in range(3):
+        worker = StageProfiler(**run.options())
+        with worker.stage('scan', 5) as stage:
+            _busy(1000)
+            stage.rows_out = 2
+        run.merge(pickle.loads(pickle.dumps(worker)))
+
+    stats = run.to_dict()['scan']
+    assert (stats['calls'], stats['rows_in'], stats['rows_out']) == (3, 15, 6)
+    assert run.profile_stats('scan').total_calls > 0
+
+
+def test_stage_table():
+    """The summary table lists stages in first-seen order"""
+    profiler = StageProfiler()
+    for name in ('csv_parse', 'pattern_scan'):
+        with profiler.stage(name, 1000):
+            pass
+    lines = profiler.summary_table().splitlines()
+    assert lines[0].split()[:3] == ['stage', 'calls', 'seconds']
+    assert [line.split()[0] for line in lines[1:]] == ['csv_parse', 'pattern_scan']
+    assert 'traced MB' not in lines[0]
+    assert stage_table({}) == lines[0]
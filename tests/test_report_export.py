@@ -0,0 +1,52 @@
+import pytest
+import pandas as pd
+from src.analyzer.columnar_report import ColumnarReportGenerator
+from src.analyzer.report_export import (
+    REPORT_SCHEMA_VERSION, export_report, load_report, load_report_tables, report_tables
+)
+
+@pytest.fixture
+def report(analyzed):
+    df, table = analyzed
+    return ColumnarReportGenerator().generate_analysis_report(table, df)
+
+def test_json_round_trip(report, tmp_path):
+    """The exported JSON loads back to the same report, including None and tuple keys"""
+    report = {**report, 'pairs': {('catalyst', 'death'): 3, ('nested', ('a', 1)): 1}}
+    written = export_report(report, tmp_path / 'report', tables=False, metadata={'run': 'test'})
+    saved = load_report(tmp_path / 'report')
+
+    assert list(written) == ['report']
+    assert saved['schema_version'] == REPORT_SCHEMA_VERSION
+    assert saved['metadata'] == {'run': 'test'}
+    assert saved['sections'] == report
+    assert None in saved['sections']['political_distribution']['overall']
+    assert saved['sections']['pairs'][('catalyst', 'death')] == 3
+
+def test_unsupported_version(report, tmp_path):
+    """Reports of another schema version are rejected"""
+    export_report(report, tmp_path, tables=False)
+    path = tmp_path / 'report.json'
+    path.write_text(path.read_text().replace(f'"schema_version":{REPORT_SCHEMA_VERSION}', '"schema_version":99'))
+    with pytest.raises(ValueError):
+        load_report(tmp_path)
+
+def test_report_tables(report):
+    """Tabular sections become long-format tables"""
+    tables = report_tables(report)
+
+    channels = tables['channels'].set_index('channel')
+    assert channels.loc['FOX', 'total_comments'] == 3
+    assert channels['remorse_count'].dtype == 'int64'
+    assert tables['months']['count'].sum() == report['summary']['remorse_cases']
+    assert set(tables['catalyst_types'].columns) == {'catalyst', 'remorse_type', 'count'}
+    assert 'channels' not in report_tables({'temporal_analysis': report['temporal_analysis']})
+
+def test_parquet_tables(report, tmp_path):
+    """Tables are written to and read back from Parquet"""
+    pytest.importorskip('pyarrow')
+    written = export_report(report, tmp_path)
+    tables = load_report_tables(tmp_path, ['channels'])
+
+    assert 'months' in written
+    pd.testing.assert_frame_equal(tables['channels'], report_tables(report)['channels'])
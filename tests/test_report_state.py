@@ -0,0 +1,32 @@
+from src.analyzer.columnar_report import ColumnarReportGenerator
+from src.analyzer.report_state import ReportState
+
+def _without_findings(report):
+    return {key: value for key, value in report.items() if key != 'key_findings'}
+
+def test_chunked_states_match_full_report(analyzed):
+    """Merged chunk states finalize to the single-pass report"""
+    df, table = analyzed
+    expected = ColumnarReportGenerator().generate_analysis_report(table, df)
+
+    first = ReportState().update(table.iloc[:3], df.iloc[:3])
+    second = ReportState().update(table.iloc[3:], df.iloc[3:])
+    report = second.merge(first).finalize()
+
+    assert _without_findings(report) == _without_findings(expected)
+    # Engagement percentiles come from the sketches, not per-score tallies
+    assert set(second.tallies).isdisjoint({'engagement_by_type', 'engagement_by_channel'})
+
+def test_save_and_load(analyzed, tmp_path):
+    """States survive serialization, including None group keys"""
+    df, table = analyzed
+    state = ReportState().update(table, df)
+    path = tmp_path / "state.json"
+    state.save(path)
+
+    loaded = ReportState.load(path)
+    assert loaded.tallies == state.tallies
+    assert None in loaded.finalize()['political_distribution']['overall']
+
+def test_empty_state():
+    assert ReportState().finalize() == {"error": "No bias remorse cases detected"}
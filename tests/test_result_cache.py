@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+from datetime import datetime
+from src.analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+from src.analyzer.result_cache import ResultCache, fingerprint_frame
+
+@pytest.fixture
+def comments():
+    return pd.DataFrame({
+        'commentId': ['1', '2', '3'],
+        'cleaned_text': ["i was wrong i got covid", "nothing here", "i regret it my friend died"],
+        'publishedAt': [datetime(2021, 1, 5), datetime(2021, 2, 1), datetime(2021, 2, 3)],
+        'channel': ['CNN', 'FOX', 'FOX'],
+        'engagement_score': [3, 0, 1]
+    })
+
+def test_cached_analysis(comments, tmp_path, monkeypatch):
+    """A second run on the same data reuses the cached results and report"""
+    monkeypatch.chdir(tmp_path)
+    first = VaccineBiasRemorseAnalyzer(cache_dir='cache')
+    report = first.analyze_dataset(comments)
+
+    second = VaccineBiasRemorseAnalyzer(cache_dir='cache')
+    monkeypatch.setattr(second.batch_analyzer, 'analyze_frame', lambda *args, **kwargs: pytest.fail("not cached"))
+    assert second.analyze_dataset(comments) == report
+    pd.testing.assert_frame_equal(second.results_table, first.results_table)
+    assert len(second.match_spans) == len(first.match_spans)
+
+def test_fingerprint_changes_with_data(comments):
+    changed = comments.copy()
+    changed.loc[1, 'cleaned_text'] = "i was wrong"
+    assert fingerprint_frame(comments) == fingerprint_frame(comments.copy())
+    assert fingerprint_frame(comments) != fingerprint_frame(changed)
+
+def test_size_bounded_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2500)
+    for key in ['a', 'b', 'c']:
+        cache.store(key, b'x' * 1000)
+    assert cache.load('a') is None
+    assert cache.load('c') == b'x' * 1000
+    assert cache.size() <= 2500
+
+def test_state_key_covers_report_state_imports(tmp_path, monkeypatch):
+    """The pipeline cache key covers every analyzer module ReportState is built from"""
+    import inspect
+    from src.analyzer import report_state, result_cache
+
+    imported = {
+        inspect.getmodule(value).__name__.rsplit('.', 1)[1] for value in vars(report_state).values()
+        if getattr(inspect.getmodule(value), '__name__', '').startswith('src.analyzer.')
+    }
+    keyed = []
+    monkeypatch.setattr(result_cache, '_source_version', lambda modules: keyed.extend(modules) or '')
+    csv_file = tmp_path / 'comments.csv'
+    csv_file.write_text('commentId\n1\n')
+    ResultCache(tmp_path).state_key([csv_file])
+
+    assert imported - {'report_state'} and imported <= set(keyed)
+    assert 'report_state' in keyed
+
+def test_report_key_covers_report_builder_imports(monkeypatch):
+    """The report key covers every analyzer module the report builders use"""
+    import inspect
+    from src.analyzer import columnar_report, report_generator, result_cache
+
+    imported = {
+        inspect.getmodule(value).__name__.rsplit('.', 1)[1]
+        for module in (columnar_report, report_generator) for value in vars(module).values()
+        if getattr(inspect.getmodule(value), '__name__', '').startswith('src.analyzer.')
+    }
+    keyed = []
+    monkeypatch.setattr(result_cache, '_source_version', lambda modules: keyed.extend(modules) or '')
+    ResultCache('unused').report_key('results')
+
+    assert imported <= set(keyed)
+
+def test_source_versions_are_resolved_without_imports():
+    """Hashing sources by name neither imports the analyzer modules nor misses edits"""
+    import subprocess
+    import sys
+    from pathlib import Path
+    code = (
+        "import sys\n"
+        "from src.analyzer.result_cache import _REPORT_MODULES, _source_version\n"
+        "_source_version(_REPORT_MODULES)\n"
+        "print(any(name.startswith('src.analyzer.report') for name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=Path(__file__).resolve().parents[1],
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == 'False'
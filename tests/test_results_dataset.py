@@ -0,0 +1,96 @@
+import pytest
+import pandas as pd
+from pathlib import Path
+from src.analyzer.report_export import parquet_available
+from src.analyzer.results_dataset import partition_rows, read_results_dataset, write_results_dataset
+
+@pytest.fixture
+def results():
+    return pd.DataFrame({
+        'comment_id': ['a', 'b', 'c', 'd', 'e'],
+        'has_remorse': [True, False, True, True, False],
+        'has_edit': [False] * 5,
+        'confidence_score': [2, 0, 3, 1, 0],
+        'previous_stance': ['anti_vax', None, 'anti_vax', None, None],
+        'catalyst': [None, None, 'got covid', None, None],
+        'political_lean': ['conservative', None, None, 'progressive', None],
+        'remorse_type': ['general_remorse', None, 'scientific_evidence', 'general_remorse', None],
+        'timestamp': pd.to_datetime(['2021-07-03', '2021-07-09', '2021-08-01', '2021-10-02', None]),
+        'channel': ['FOX', 'FOX', 'FOX', 'CNN/US', 'CNN/US']
+    })
+
+def test_partition_rows(results):
+    """Rows are grouped by channel and month, missing months kept apart"""
+    partitions = {(channel, month): list(rows) for channel, month, rows in partition_rows(results)}
+    assert partitions == {
+        ('FOX', '2021-07'): [0, 1],
+        ('FOX', '2021-08'): [2],
+        ('CNN/US', '2021-10'): [3],
+        ('CNN/US', None): [4]
+    }
+
+def test_requires_parquet_engine(results, tmp_path):
+    """Without a Parquet engine the dataset cannot be written"""
+    if parquet_available():
+        pytest.skip("a Parquet engine is installed")
+    with pytest.raises(ImportError):
+        write_results_dataset(results, tmp_path)
+
+def test_partition_pruning(results, tmp_path):
+    """Reads return only the selected partitions, across appended writes"""
+    pytest.importorskip('pyarrow')
+    write_results_dataset(results, tmp_path)
+    write_results_dataset(results.iloc[:1], tmp_path)
+
+    quarter = read_results_dataset(tmp_path, channels=['FOX'], months=('2021-07', '2021-09'))
+    assert sorted(quarter['comment_id']) == ['a', 'a', 'b', 'c']
+    assert set(quarter['month']) == {'2021-07', '2021-08'}
+    assert len(read_results_dataset(tmp_path, channels=['CNN/US'])) == 2
+
+def test_rewrites_are_idempotent(results, tmp_path):
+    """Writing the same results twice leaves one copy of every comment"""
+    pytest.importorskip('pyarrow')
+    write_results_dataset(results, tmp_path)
+    first = write_results_dataset(results, tmp_path)
+
+    assert len(read_results_dataset(tmp_path)) == len(results)
+    assert sorted(tmp_path.glob('*/*/*.parquet')) == sorted(first)
+
+def test_part_names_follow_the_comments(results, tmp_path, monkeypatch):
+    """The same comments map to the same part files; other comments to new ones"""
+    from src.analyzer import results_dataset
+    monkeypatch.setattr(results_dataset, 'require_parquet', lambda feature=None: None)
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', lambda frame, path, index=True: Path(path).touch())
+
+    first = write_results_dataset(results, tmp_path)
+    assert write_results_dataset(results.copy(), tmp_path) == first
+    assert set(write_results_dataset(results.iloc[:1], tmp_path)).isdisjoint(first)
+    assert not list(tmp_path.glob('*/*/*.partial'))
+
+def test_analyzer_writes_dataset_on_cache_hits(tmp_path, monkeypatch):
+    """Cached analyses still write the dataset, which the cache key does not cover"""
+    from datetime import datetime
+    from src.analyzer import report_export, results_dataset
+    from src.analyzer.bias_remorse import VaccineBiasRemorseAnalyzer
+
+    written = []
+    monkeypatch.setattr(report_export, 'require_parquet', lambda feature=None: None)
+    monkeypatch.setattr(
+        results_dataset, 'write_results_dataset',
+        lambda table, root, time_index=None: written.append((root, len(table))) or []
+    )
+    comments = pd.DataFrame({
+        'commentId': ['1', '2'],
+        'cleaned_text': ["i was wrong about the vaccine", "nothing here"],
+        'publishedAt': [datetime(2021, 1, 5), datetime(2021, 2, 1)],
+        'channel': ['CNN', 'FOX']
+    })
+    cache_dir = str(tmp_path / 'cache')
+    VaccineBiasRemorseAnalyzer(cache_dir=cache_dir, results_dir=None).analyze_dataset(comments)
+    analyzer = VaccineBiasRemorseAnalyzer(
+        cache_dir=cache_dir, results_dir=None, results_dataset=str(tmp_path / 'comments')
+    )
+    monkeypatch.setattr(analyzer.batch_analyzer, 'analyze_frame', lambda *args, **kwargs: pytest.fail("not cached"))
+    analyzer.analyze_dataset(comments)
+
+    assert written == [(str(tmp_path / 'comments'), 2)]
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src import run_analysis
+from src.utils.logging_config import shutdown_logging
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    shutdown_logging()
+    yield
+    shutdown_logging()
+
+@pytest.fixture
+def raw_data_root(tmp_path):
+    """Raw comment exports laid out as run_analysis expects them"""
+    for channel, texts in [
+        ('CNN', ['I was wrong about the vaccine', 'This vaccine is effective', 'Normal comment']),
+        ('FoxNews', ['I regret refusing the vaccine shot', 'Nothing to see here'])
+    ]:
+        folder = tmp_path / 'DSCI789_data' / channel / f'extracted_text_{channel}'
+        folder.mkdir(parents=True)
+        pd.DataFrame({
+            'commentId': [f'{channel}-{i}' for i in range(len(texts))],
+            'text': texts,
+            'publishedAt': ['2021-01-01T00:00:00Z'] * len(texts),
+            'updatedAt': ['2021-01-02T00:00:00Z'] * len(texts),
+            'likeCount': [1] * len(texts),
+            'totalReplyCount': [0] * len(texts),
+            'isPublic': [True] * len(texts)
+        }).to_csv(folder / 'video1.csv', index=False)
+    return tmp_path
+
+def test_main_over_raw_csv(raw_data_root, monkeypatch, capsys):
+    """Raw CSV exports are preprocessed before analysis"""
+    monkeypatch.chdir(raw_data_root)
+    run_analysis.main(['--no-cache'])
+
+    out = capsys.readouterr().out
+    assert "Detailed Analysis Results - CNN" in out
+    assert "Detailed Analysis Results - FoxNews" in out
+    # Only the vaccine-related comments of each channel are analyzed
+    cnn, fox = out.split("Detailed Analysis Results - FoxNews")
+    assert "Total comments analyzed: 2" in cnn
+    assert "Remorse cases identified: 1" in cnn
+    assert "Total comments analyzed: 1" in fox
+    assert "Period: 2021-01" in fox
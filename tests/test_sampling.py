@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.sampling import StratifiedReservoir
+
+@pytest.fixture
+def results():
+    rng = np.random.default_rng(0)
+    n = 2000
+    return pd.DataFrame({
+        'comment_id': [f'c{i}' for i in range(n)],
+        'has_remorse': rng.random(n) < 0.5,
+        'channel': pd.Series(rng.choice(['CNN', 'FOX'], n), dtype=object),
+        'remorse_type': pd.Series(rng.choice(['general_remorse', None], n), dtype=object),
+        'timestamp': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 90, n), unit='D')
+    })
+
+def test_at_most_k_per_stratum(results):
+    """Every stratum keeps min(k, cases) records and counts all its cases"""
+    reservoir = StratifiedReservoir(k=3, seed=1).update(results)
+
+    assert len(reservoir.seen) == 2 * 2 * 3
+    assert sum(reservoir.seen.values()) == results['has_remorse'].sum()
+    assert all(len(records) == 3 for records in reservoir.samples().values())
+    record = next(reservoir.iter_records())
+    assert set(record['stratum']) == {'channel', 'remorse_type', 'month'}
+
+def test_merge_matches_single_pass(results):
+    """Chunked reservoirs merge into the sample of a single pass"""
+    single = StratifiedReservoir(k=2, seed=5).update(results)
+    merged = StratifiedReservoir(k=2, seed=5)
+    for start in range(0, len(results), 300):
+        merged.merge(StratifiedReservoir(k=2, seed=5).update(results.iloc[start:start + 300].reset_index(drop=True)))
+
+    def ids(reservoir):
+        return {key: [record['comment_id'] for record in records] for key, records in reservoir.samples().items()}
+    assert ids(merged) == ids(single)
+    assert ids(StratifiedReservoir(k=2, seed=6).update(results)) != ids(single)
+    with pytest.raises(ValueError):
+        single.merge(StratifiedReservoir(k=2, seed=6))
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.batch_analyzer import BatchCommentAnalyzer
+from src.analyzer.match_spans import MatchSpanRecorder
+from src.analyzer.report_state import ReportState
+from src.analyzer.sketches import DistinctCountSketch, HeavyHitterSketch, QuantileSketch
+
+@pytest.fixture
+def engagement():
+    return np.random.default_rng(0).lognormal(mean=2, sigma=1.5, size=20000).round()
+
+def test_quantiles_within_relative_error(engagement):
+    """Merged shards answer quantiles within the relative accuracy"""
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for shard in np.array_split(engagement, 4)[::-1]:
+        sketch.merge(QuantileSketch(relative_accuracy=0.01).update(shard))
+    sketch = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert sketch.count == len(engagement)
+    for q in (0.5, 0.9, 0.99):
+        true = np.quantile(engagement, q, method='inverted_cdf')
+        assert abs(sketch.quantile(q) - true) <= 0.01 * true + 1e-9
+
+def test_distinct_count_within_error():
+    values = np.random.default_rng(1).integers(0, 20000, size=50000)
+    sketch = DistinctCountSketch().update(values[:25000])
+    sketch.merge(DistinctCountSketch.from_dict(DistinctCountSketch().update(values[25000:]).to_dict()))
+
+    true = len(np.unique(values))
+    assert abs(sketch.estimate() - true) <= 3 * sketch.relative_error * true
+    assert round(DistinctCountSketch().update(['a', 'b', 'a', None]).estimate()) == 2
+
+def test_heavy_hitters_error_bound():
+    items = np.random.default_rng(2).zipf(1.5, size=20000) % 500
+    sketch = HeavyHitterSketch(k=10).update(items[:10000]).merge(HeavyHitterSketch(k=10).update(items[10000:]))
+    true = pd.Series(items).value_counts()
+
+    assert sketch.top(1)[0][0] == true.index[0]
+    for item, count in sketch.top(10):
+        assert true[item] - sketch.error_bound() <= count <= true[item]
+
+def test_report_state_sketch_summary():
+    df = pd.DataFrame({
+        'commentId': ['a', 'b', 'c', 'a'],
+        'videoId': ['v1', 'v1', 'v2', 'v1'],
+        'cleaned_text': [
+            "i was wrong i got covid", "i regret it my friend died",
+            "nothing here", "i was wrong my doctor said so"
+        ],
+        'publishedAt': pd.to_datetime(['2021-01-05', '2021-02-01', '2021-02-03', '2021-01-20']),
+        'channel': ['CNN', 'FOX', 'FOX', 'CNN'],
+        'engagement_score': [3, 0, 1, 7]
+    })
+    spans = MatchSpanRecorder()
+    table = BatchCommentAnalyzer().analyze_frame(df, spans=spans)
+    state = ReportState().update(table, df, spans.to_spans())
+
+    summary = state.sketch_summary()
+    assert round(summary['distinct_counts']['unique_comments']) == 3
+    assert round(summary['distinct_counts']['unique_videos']) == 2
+    assert summary['top_phrases']['items'][0] == ('i was wrong', 2)
+    assert summary['engagement_quantiles']['overall'][0.5] == pytest.approx(3, rel=0.01)
+
+def test_nearest_rank_quantiles():
+    """Upper percentiles of small groups are their largest values, not the smallest"""
+    sketch = QuantileSketch().update([3, 7])
+    assert sketch.quantile(0) == pytest.approx(3, rel=0.01)
+    assert sketch.quantile(0.5) == pytest.approx(3, rel=0.01)
+    assert sketch.quantile(0.9) == pytest.approx(7, rel=0.01)
+    assert QuantileSketch().update(range(1, 101)).quantile(0.99) == pytest.approx(99, rel=0.01)
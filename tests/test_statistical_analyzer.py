@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from src.analyzer.sketches import QuantileSketch
+from src.analyzer.statistical_analyzer import StatisticalAnalyzer, to_case_frame
+
+@pytest.fixture
+def cases():
+    return [
+        {
+            'channel': 'CNN', 'remorse_type': 'personal_experience', 'intensity': 2, 'political_lean': 'left',
+            'timestamp': pd.Timestamp('2021-01-05 10:00'), 'engagement_metrics': {'likes': 3, 'replies': 1},
+            'catalyst_details': {'type': 'death', 'severity': 3}
+        },
+        {
+            'channel': 'FOX', 'remorse_type': 'personal_experience', 'intensity': 1, 'political_lean': 'right',
+            'timestamp': pd.Timestamp('2021-01-06 10:30'), 'engagement_metrics': {'likes': 5, 'replies': 0},
+            'has_edit': True
+        },
+        {
+            'channel': 'FOX', 'remorse_type': 'medical_authority', 'intensity': 3, 'political_lean': 'right',
+            'timestamp': pd.Timestamp('2021-01-04 22:00'), 'engagement_metrics': {'likes': 0, 'replies': 2},
+            'catalyst_details': {'type': 'illness', 'severity': 1}
+        }
+    ]
+
+def test_grouped_outputs_are_bounded(cases):
+    analysis = StatisticalAnalyzer().analyze_patterns(cases)
+
+    engagement = analysis['political']['engagement_by_leaning']
+    assert isinstance(engagement['right'], QuantileSketch)
+    assert (engagement['right'].count, engagement['right'].mean) == (2, 3.5)
+    assert engagement['right'].quantile(1) == 5
+    assert analysis['political']['engagement_summary'].loc['right', 'mean'] == 3.5
+    assert analysis['catalysts']['impact_on_engagement']['death'].summary()['p50'] == pytest.approx(4, rel=0.01)
+    assert analysis['engagement']['temporal_engagement'][10].sum == 9
+    assert analysis['engagement']['edit_patterns'] == {'edited_count': 1, 'total_count': 3}
+    assert analysis['channel']['FOX']['avg_intensity'] == 2
+    # One row per day rather than per case
+    over_time = analysis['temporal']['intensity_over_time']
+    assert over_time['intensity'].tolist() == [3, 2, 1]
+    assert over_time['count'].tolist() == [1, 1, 1]
+    assert over_time['timestamp'].tolist() == list(pd.to_datetime(['2021-01-04', '2021-01-05', '2021-01-06']))
+
+def test_case_frame_input(cases):
+    """A prepared case frame gives the same results as the case dicts"""
+    analyzer = StatisticalAnalyzer()
+    expected = analyzer._analyze_catalysts(cases)
+    result = analyzer._analyze_catalysts(to_case_frame(cases))
+
+    assert result['types'] == expected['types'] == {'death': 1, 'illness': 1}
+    pd.testing.assert_frame_equal(result['engagement_summary'], expected['engagement_summary'])
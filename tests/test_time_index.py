@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer.statistical_analyzer import StatisticalAnalyzer
+from src.analyzer.time_index import TimeIndex
+
+@pytest.fixture
+def timestamps():
+    return pd.Series(pd.to_datetime([
+        '2021-01-04 10:00', '2021-01-10 23:59', '2021-01-11 00:00', None,
+        '2021-03-01 08:30', '1969-12-31 12:00'
+    ]))
+
+def test_bucket_labels(timestamps):
+    index = TimeIndex(timestamps)
+    assert index.labels('month').tolist() == ['2021-01', '2021-01', '2021-01', None, '2021-03', '1969-12']
+    assert index.labels('day').tolist()[5] == '1969-12-31'
+    # Weeks start on Monday
+    assert index.labels('week').tolist()[:3] == ['2021-01-04', '2021-01-04', '2021-01-11']
+    assert index.labels('weekday').tolist()[0] == 'Monday'
+    assert index.take(np.array([False, True, False, False, True, False])).labels('hour').tolist() == [23, 8]
+
+def test_rolling_rate(timestamps):
+    rates = TimeIndex(timestamps[:5]).rolling_rate([True, False, True, True, False], 'month', window=2)
+
+    assert rates['comments'].tolist() == [3, 0, 1]
+    assert rates['remorse_cases'].tolist() == [2, 0, 0]
+    assert np.isnan(rates['remorse_rate'].iloc[1])
+    assert rates['rolling_rate'].tolist() == pytest.approx([200 / 3, 200 / 3, 0])
+
+def test_temporal_patterns(timestamps):
+    results = [{'timestamp': ts if pd.notna(ts) else None, 'intensity': i} for i, ts in enumerate(timestamps)]
+    stats = StatisticalAnalyzer().analyze_temporal_patterns(results)
+
+    assert stats['monthly_distribution'] == {'January': 3, 'March': 1, 'December': 1}
+    assert stats['hourly_distribution'][0] == 1
+    assert stats['intensity_over_time']['intensity'].tolist() == [5, 0, 1, 2, 4]